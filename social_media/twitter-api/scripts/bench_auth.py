@@ -0,0 +1,74 @@
+"""
+Benchmark per-request overhead of the token_required decorator.
+
+Compares full JWT verification on every request with the verified-token
+cache. Runs against the testing config's in-memory SQLite database; the
+schema is created so the revoked-token sync can read ``revoked_tokens``.
+Run from the project root: python scripts/bench_auth.py --requests 20000
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from twitter_api.app import create_app  # noqa: E402
+from twitter_api.database import db  # noqa: E402
+from twitter_api.utils.decorators import token_required  # noqa: E402
+from twitter_api.utils.jwt import create_access_token  # noqa: E402
+from twitter_api.utils.local_state import reset_local  # noqa: E402
+
+
+@token_required
+def protected(current_user):
+    """Stand-in route doing no work of its own."""
+    return current_user["user_id"]
+
+
+def time_requests(app, token, requests):
+    """Microseconds per decorated call, including request context setup."""
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    for _ in range(requests):
+        with app.test_request_context(headers=headers):
+            protected()
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    """Time the decorator with the cache disabled and enabled."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        token = create_access_token(1, "benchmark")
+
+    # Baseline: request context alone, no decorator
+    headers = {"Authorization": f"Bearer {token}"}
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        with app.test_request_context(headers=headers):
+            pass
+    baseline = (time.perf_counter() - started) / args.requests * 1e6
+
+    results = {}
+    for label, size in (("uncached", 0), ("cached", 10000)):
+        app.config["JWT_CACHE_SIZE"] = size
+        reset_local(app)
+        results[label] = time_requests(app, token, args.requests)
+
+    print(f"requests: {args.requests}")
+    print(f"{'mode':>10} {'us/request':>12} {'decorator us':>14}")
+    print(f"{'baseline':>10} {baseline:>12.1f} {'-':>14}")
+    for label, per_request in results.items():
+        print(f"{label:>10} {per_request:>12.1f} {per_request - baseline:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark the follow-graph batch computations on a synthetic graph.
+
+The graph follows the same out-degree mix and activity-weighted targets as
+scripts/seed_data.py, scaled up to millions of edges. No database is needed.
+Run from the project root: python scripts/bench_graph.py --users 100000
+"""
+
+import argparse
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from twitter_api.utils.graph import (  # noqa: E402
+    FollowGraph,
+    friends_of_friends,
+    pagerank,
+)
+
+
+def generate_edges(num_users, rng):
+    """
+    Generate follow edges with seed_data.py's distribution.
+
+    10% influencers follow 0-5 accounts, 20% popular users 10-30, 40% average
+    users 15-40 and 30% casual users 5-20. Targets are drawn proportionally to
+    each user's tweet activity, as the seeder does.
+    """
+    kind = rng.random(num_users)
+    low = np.select([kind < 0.10, kind < 0.30, kind < 0.70], [0, 10, 15], 5)
+    high = np.select([kind < 0.10, kind < 0.30, kind < 0.70], [5, 30, 40], 20)
+    out_degree = rng.integers(low, high + 1)
+
+    activity = rng.random(num_users)
+    tweets = np.select(
+        [activity < 0.20, activity < 0.50, activity < 0.80],
+        [
+            rng.integers(20, 51, num_users),
+            rng.integers(10, 20, num_users),
+            rng.integers(3, 10, num_users),
+        ],
+        rng.integers(0, 3, num_users),
+    ).astype(np.float64)
+    weights = tweets / tweets.sum()
+
+    followers = np.repeat(np.arange(num_users), out_degree)
+    followed = rng.choice(num_users, size=len(followers), p=weights)
+
+    # Drop self-follows; duplicates collapse when the matrix is built
+    keep = followers != followed
+    return followers[keep], followed[keep]
+
+
+def bench_suggestions(graph, args):
+    """Time the friends-of-friends ranking over every user."""
+    started = time.perf_counter()
+    users_with_suggestions = 0
+    stored = 0
+    for _, candidates in friends_of_friends(graph, args.limit, args.block_size):
+        users_with_suggestions += 1
+        stored += len(candidates)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"suggestions: {elapsed:.2f}s for {users_with_suggestions} users, "
+        f"{stored} candidates ({graph.num_edges / elapsed:,.0f} edges/s)"
+    )
+
+
+def bench_pagerank(args):
+    """Report PageRank convergence time against edge count, cold and warm."""
+    print("pagerank convergence:")
+    print(
+        f"{'users':>10} {'edges':>10} {'cold iter':>10} {'cold s':>8} "
+        f"{'warm iter':>10} {'warm s':>8}"
+    )
+    for num_users in args.pagerank_users:
+        rng = np.random.default_rng(args.seed)
+        followers, followed = generate_edges(num_users, rng)
+        graph = FollowGraph.from_edges(np.arange(num_users), followers, followed)
+
+        started = time.perf_counter()
+        scores, cold_iterations = pagerank(graph)
+        cold = time.perf_counter() - started
+
+        # Warm start after 1% more edges, as the scheduled stage does
+        extra = max(1, len(followers) // 100)
+        grown = FollowGraph.from_edges(
+            np.arange(num_users),
+            np.concatenate([followers, rng.integers(0, num_users, extra)]),
+            np.concatenate([followed, rng.integers(0, num_users, extra)]),
+        )
+        started = time.perf_counter()
+        _, warm_iterations = pagerank(grown, initial=scores)
+        warm = time.perf_counter() - started
+
+        print(
+            f"{num_users:>10} {graph.num_edges:>10} {cold_iterations:>10} "
+            f"{cold:>8.3f} {warm_iterations:>10} {warm:>8.3f}"
+        )
+
+
+def main():
+    """Build the synthetic graph and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--block-size", type=int, default=4096)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--pagerank-users",
+        type=int,
+        nargs="+",
+        default=[10000, 50000, 100000, 200000],
+        help="Graph sizes (in users) for the PageRank convergence table",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    started = time.perf_counter()
+    followers, followed = generate_edges(args.users, rng)
+    graph = FollowGraph.from_edges(np.arange(args.users), followers, followed)
+    elapsed = time.perf_counter() - started
+    print(
+        f"graph: {args.users} users, {graph.num_edges} edges "
+        f"built in {elapsed:.2f}s"
+    )
+
+    bench_suggestions(graph, args)
+    bench_pagerank(args)
+
+
+if __name__ == "__main__":
+    main()
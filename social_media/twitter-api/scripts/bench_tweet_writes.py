@@ -0,0 +1,136 @@
+"""
+Benchmark tweet creation throughput: per-request commits vs. group commit.
+
+Concurrent writers create tweets through TweetService, first committing each
+tweet on its own, then through the batcher at several batch windows. Uses a
+throwaway SQLite file unless DATABASE_URL is set (point it at a scratch
+PostgreSQL database for realistic fsync costs; tables are created there).
+Run from the project root: python scripts/bench_tweet_writes.py --threads 32
+"""
+
+import argparse
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_scratch.name}")
+
+from twitter_api.app import create_app  # noqa: E402
+from twitter_api.database import db  # noqa: E402
+from twitter_api.models.user import User  # noqa: E402
+from twitter_api.services.tweet_service import TweetService  # noqa: E402
+from twitter_api.utils.load_shedding import BUSY_MESSAGE, ServerBusy  # noqa: E402
+from twitter_api.utils.local_state import local_stats, reset_local  # noqa: E402
+
+
+def run_writers(app, args, write):
+    """Run ``threads`` writers doing ``tweets`` writes each; return latencies."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def writer(index):
+        local = []
+        with app.app_context():
+            for i in range(args.tweets):
+                started = time.perf_counter()
+                try:
+                    _, error = write(index % args.users + 1, f"bench {index}-{i}")
+                except ServerBusy:
+                    error = BUSY_MESSAGE
+                local.append(time.perf_counter() - started)
+                if error:
+                    errors.append(error)
+            db.session.remove()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, sorted(latencies), errors
+
+
+def report(label, elapsed, latencies, errors, batch_size="-"):
+    """Print one row of the results table."""
+    count = len(latencies)
+    p50 = latencies[count // 2] * 1000
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000
+    print(
+        f"{label:>14} {count / elapsed:>10,.0f} {p50:>8.2f} {p99:>8.2f} "
+        f"{batch_size:>10} {len(errors):>7}"
+    )
+
+
+def main():
+    """Create scratch users, then time each write mode."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--tweets", type=int, default=50, help="Tweets per thread")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument(
+        "--windows",
+        type=float,
+        nargs="+",
+        default=[1, 2, 5, 10, 20],
+        help="Batch windows to try, in milliseconds",
+    )
+    args = parser.parse_args()
+
+    app = create_app("production")
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            User(username=f"bench{i}", email=f"bench{i}@example.com", password_hash="x")
+            for i in range(args.users)
+        )
+        db.session.commit()
+        print(f"{args.threads} writers x {args.tweets} tweets on {db.engine.url}")
+
+    print(
+        f"{'mode':>14} {'tweets/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'avg batch':>10} {'errors':>7}"
+    )
+
+    elapsed, latencies, errors = run_writers(
+        app, args, lambda user_id, content: TweetService.create_tweet(user_id, content)
+    )
+    report("direct", elapsed, latencies, errors)
+
+    for window in args.windows:
+        app.config["TWEET_BATCH_WINDOW_MS"] = window
+        with app.app_context():
+            reset_local(app)
+
+        elapsed, latencies, errors = run_writers(
+            app,
+            args,
+            lambda user_id, content: TweetService.submit_tweet(
+                user_id, f"bench{user_id - 1}", content
+            )[:2],
+        )
+        stats = local_stats(app)["tweet_batcher"]
+        report(
+            f"batch {window:g}ms",
+            elapsed,
+            latencies,
+            errors,
+            f"{stats['avg_batch_size']:.1f}",
+        )
+
+    with app.app_context():
+        reset_local(app)
+    os.unlink(_scratch.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Grant or revoke admin access for a user.
+
+Admins can call the /api/admin endpoints (e.g. bulk tweet import).
+Run from the project root: python scripts/grant_admin.py <username> [--revoke]
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from twitter_api.app import create_app  # noqa: E402
+from twitter_api.database import db  # noqa: E402
+from twitter_api.models import User  # noqa: E402
+
+
+def main():
+    """Set or clear the user's admin flag."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("username", help="User to update")
+    parser.add_argument(
+        "--revoke", action="store_true", help="Remove admin access instead"
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        user = User.query.filter_by(username=args.username).first()
+        if user is None:
+            print(f"✗ User '{args.username}' not found")
+            sys.exit(1)
+
+        user.is_admin = not args.revoke
+        db.session.commit()
+        state = "revoked from" if args.revoke else "granted to"
+        print(f"✓ Admin access {state} {user.username}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Run the periodic follow-graph batch jobs.
+
+Each stage loads the follow graph into sparse matrices and stores its results
+so API reads stay cheap. Schedule it (e.g. from cron) to keep results fresh.
+Run from the project root: python scripts/graph_jobs.py [stage ...]
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from twitter_api.app import create_app  # noqa: E402
+from twitter_api.services.influence_service import InfluenceService  # noqa: E402
+from twitter_api.services.similarity_service import SimilarityService  # noqa: E402
+from twitter_api.services.suggestion_service import SuggestionService  # noqa: E402
+
+
+def run_suggestions(args):
+    """Recompute "who to follow" suggestions for every user."""
+    stats = SuggestionService.refresh_suggestions(args.suggestions_per_user)
+    return (
+        f"{stats['suggestions']} suggestions for {stats['users']} users "
+        f"({stats['edges']} follow edges)"
+    )
+
+
+def run_influence(args):
+    """Recompute PageRank influence scores, warm-started from the stored ones."""
+    stats = InfluenceService.refresh_influence_scores(damping=args.damping)
+    return (
+        f"{stats['users']} users scored in {stats['iterations']} iterations "
+        f"({stats['edges']} follow edges)"
+    )
+
+
+def run_signatures(args):
+    """Rebuild follower-set MinHash signatures and LSH bands for every user."""
+    stats = SimilarityService.rebuild_all()
+    return f"{stats['signatures']} signatures for {stats['users']} users"
+
+
+def run_stale_signatures(args):
+    """Recompute signatures marked stale by unfollows since the last run."""
+    stats = SimilarityService.refresh_stale()
+    return f"{stats['refreshed']} stale signatures recomputed"
+
+
+# Influence runs first so suggestions are tie-broken by fresh scores
+STAGES = {
+    "influence": run_influence,
+    "suggestions": run_suggestions,
+    "signatures": run_signatures,
+    "stale-signatures": run_stale_signatures,
+}
+
+
+def main():
+    """Run the requested stages in order."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        choices=list(STAGES),
+        default=["influence", "suggestions", "signatures"],
+        help="Stages to run (default: influence, suggestions, signatures)",
+    )
+    parser.add_argument(
+        "--suggestions-per-user",
+        type=int,
+        default=20,
+        help="Suggestions stored per user (default: 20)",
+    )
+    parser.add_argument(
+        "--damping",
+        type=float,
+        default=0.85,
+        help="PageRank damping factor for the influence stage (default: 0.85)",
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+
+    with app.app_context():
+        for stage in args.stages:
+            print(f"Running {stage}...")
+            started = time.perf_counter()
+            summary = STAGES[stage](args)
+            elapsed = time.perf_counter() - started
+            print(f"✓ {stage}: {summary} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
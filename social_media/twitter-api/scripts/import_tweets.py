@@ -0,0 +1,70 @@
+"""
+Bulk-import tweets from an NDJSON file.
+
+Each line is a JSON object with user_id, content and an optional ISO 8601
+created_at. The file is streamed and written in committed batches (COPY on
+PostgreSQL); invalid rows are skipped and reported by line number.
+Run from the project root: python scripts/import_tweets.py tweets.ndjson
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from twitter_api.app import create_app  # noqa: E402
+from twitter_api.services.tweet_import import TweetImportService  # noqa: E402
+
+
+def main():
+    """Import the given file (or stdin) and print progress per batch."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="NDJSON file to import, or - for stdin")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Rows per transaction (default: TWEET_IMPORT_BATCH_SIZE)",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=100,
+        help="Row errors printed at the end (default: 100)",
+    )
+    args = parser.parse_args()
+
+    app = create_app()
+    batch_size = args.batch_size or app.config["TWEET_IMPORT_BATCH_SIZE"]
+    started = time.perf_counter()
+
+    def progress(report):
+        elapsed = time.perf_counter() - started
+        print(
+            f"  {report['processed']} rows: {report['imported']} imported, "
+            f"{report['failed']} failed ({report['imported'] / elapsed:.0f} rows/s)"
+        )
+
+    source = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    with app.app_context(), source:
+        print(f"Importing {args.path} in batches of {batch_size}...")
+        report = TweetImportService.import_ndjson(
+            source, batch_size, args.max_errors, on_batch=progress
+        )
+
+    for error in report["errors"]:
+        print(f"  line {error['line']}: {error['error']}")
+    if report["errors_truncated"]:
+        print(f"  ... {report['failed'] - len(report['errors'])} more errors")
+    elapsed = time.perf_counter() - started
+    print(
+        f"✓ Imported {report['imported']} of {report['processed']} rows "
+        f"in {elapsed:.2f}s ({report['failed']} failed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
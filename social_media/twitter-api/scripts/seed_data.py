@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from faker import Faker  # noqa: E402
+from flask import current_app  # noqa: E402
 from twitter_api.app import create_app  # noqa: E402
 from twitter_api.database import db  # noqa: E402
 from twitter_api.models.user import User  # noqa: E402
@@ -229,6 +230,11 @@ def seed_users(num_users=100):
     print(f"Creating {num_users} users...")
     users = []
 
+    # One hash at the configured cost (BCRYPT_ROUNDS=4 keeps seeding fast).
+    # Logins only upgrade it when the deployment's cost is higher; a hash
+    # seeded at a higher cost is kept as is
+    password_hash = hash_password("password123", current_app.config["BCRYPT_ROUNDS"])
+
     for i in range(num_users):
         first_name = fake.first_name()
         last_name = fake.last_name()
@@ -263,7 +269,7 @@ def seed_users(num_users=100):
             username=username,
             email=fake.email(),
             # All users have same password for testing
-            password_hash=hash_password("password123"),
+            password_hash=password_hash,
             display_name=display_name,
             bio=bio,
         )
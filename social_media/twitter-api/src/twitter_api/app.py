@@ -7,6 +7,12 @@ from flasgger import Swagger
 
 from twitter_api.config import config
 from twitter_api.database import init_db
+from twitter_api.services.user_loader import reset_request_users
+from twitter_api.utils.load_shedding import init_load_shedding
+from twitter_api.utils.micro_cache import init_micro_cache
+from twitter_api.utils.password import configure_password_hashing
+from twitter_api.utils.rate_limit import init_rate_limiting
+from twitter_api.utils.local_state import local_stats
 
 
 def create_app(config_name=None):
@@ -20,6 +26,7 @@ def create_app(config_name=None):
     # Initialize extensions
     CORS(app)
     init_db(app)
+    configure_password_hashing(app)
 
     # Configure Swagger/OpenAPI documentation
     swagger_config = {
@@ -70,14 +77,26 @@ def create_app(config_name=None):
 
     Swagger(app, config=swagger_config, template=swagger_template)
 
+    # Throttle before any other per-request work
+    init_rate_limiting(app)
+    # Saturated pools and queues answer 503 with Retry-After
+    init_load_shedding(app)
+
+    # Users loaded through load_user() are memoized per request
+    app.before_request(reset_request_users)
+
     # Register blueprints
-    from twitter_api.routes import auth, tweets, users, follows, feed
+    from twitter_api.routes import admin, auth, tweets, users, follows, feed
 
     app.register_blueprint(auth.bp)
     app.register_blueprint(tweets.bp)
     app.register_blueprint(users.bp)
     app.register_blueprint(follows.follows_bp)
     app.register_blueprint(feed.feed_bp)
+    app.register_blueprint(admin.admin_bp)
+
+    # Anonymous reads of public endpoints share briefly cached responses
+    init_micro_cache(app)
 
     # Health check endpoint
     @app.route("/health")
@@ -101,6 +120,21 @@ def create_app(config_name=None):
         """
         return jsonify({"status": "healthy", "message": "Twitter API is running"})
 
+    # Per-worker metrics endpoint
+    @app.route("/metrics")
+    def metrics():
+        """Per-worker cache and filter statistics.
+        ---
+        tags:
+          - Health
+        responses:
+          200:
+            description: Statistics for this worker process, keyed by component
+            schema:
+              type: object
+        """
+        return jsonify(local_stats(app))
+
     # Root endpoint
     @app.route("/")
     def index():
@@ -111,6 +145,7 @@ def create_app(config_name=None):
                 "version": "0.1.0",
                 "endpoints": {
                     "health": "/health",
+                    "metrics": "/metrics",
                     "auth": "/api/auth",
                     "tweets": "/api/tweets",
                     "users": "/api/users",
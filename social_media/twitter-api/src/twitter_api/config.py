@@ -17,12 +17,160 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_SORT_KEYS = False
 
+    # Set when one process serves every request (e.g. "flask run"). Per-worker
+    # Bloom filters then see every write and trust their negatives; otherwise
+    # a negative is confirmed against the database.
+    SINGLE_WORKER = os.getenv("SINGLE_WORKER", "false") == "true"
+    # Bloom filters are rebuilt from full table scans on a background thread
+    BLOOM_FILTER_BACKGROUND_REBUILD = True
+
+    # Per-worker Bloom filter answering "not following" checks without a query
+    FOLLOW_FILTER_ENABLED = os.getenv("FOLLOW_FILTER_ENABLED", "true") == "true"
+    FOLLOW_FILTER_ERROR_RATE = float(os.getenv("FOLLOW_FILTER_ERROR_RATE", "0.01"))
+    FOLLOW_FILTER_REFRESH_SECONDS = int(
+        os.getenv("FOLLOW_FILTER_REFRESH_SECONDS", "300")
+    )
+
+    # Per-worker Bloom filter over taken usernames/emails for availability checks
+    AVAILABILITY_FILTER_ERROR_RATE = float(
+        os.getenv("AVAILABILITY_FILTER_ERROR_RATE", "0.01")
+    )
+    AVAILABILITY_FILTER_REFRESH_SECONDS = int(
+        os.getenv("AVAILABILITY_FILTER_REFRESH_SECONDS", "60")
+    )
+
+    # Per-worker LRU of follower/following bitmaps for relationship intersections
+    FOLLOW_SET_CACHE_SIZE = int(os.getenv("FOLLOW_SET_CACHE_SIZE", "1024"))
+    FOLLOW_SET_CACHE_TTL = int(os.getenv("FOLLOW_SET_CACHE_TTL", "300"))
+
+    # bcrypt cost factor, or "auto" to pick the highest cost that hashes within
+    # BCRYPT_TARGET_MS on this hardware at startup. Stored hashes at another
+    # cost are upgraded on the next successful login.
+    BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS", "12")
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+
+    # Bounded bcrypt pool; requests beyond workers + queue get a 503
+    PASSWORD_HASH_WORKERS = int(
+        os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2))
+    )
+    PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "16"))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "5"))
+
+    # Per-worker LRU of verified JWT claims; 0 disables it
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+
+    # Revoked token IDs: "database" shares them between workers (each worker
+    # pulls new ones every TOKEN_REVOCATION_SYNC_SECONDS), "memory" keeps them
+    # in this process only
+    TOKEN_REVOCATION_BACKEND = os.getenv("TOKEN_REVOCATION_BACKEND", "database")
+    TOKEN_REVOCATION_SYNC_SECONDS = float(
+        os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "5")
+    )
+
+    # Entity cache of user and tweet rows (and username -> ID) behind
+    # load_user() and get_tweet_by_id(). The per-worker tier's short TTLs
+    # bound staleness from other workers' writes; ENTITY_CACHE_URL adds a
+    # shared tier ("redis://..." or "memory://"; empty disables it) that
+    # writes invalidate directly. Missing rows are cached for
+    # ENTITY_CACHE_NEGATIVE_TTL seconds.
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "30"))
+    TWEET_CACHE_SIZE = int(os.getenv("TWEET_CACHE_SIZE", "10000"))
+    TWEET_CACHE_TTL = int(os.getenv("TWEET_CACHE_TTL", "30"))
+    ENTITY_CACHE_URL = os.getenv("ENTITY_CACHE_URL", "")
+    ENTITY_CACHE_SHARED_TTL = float(os.getenv("ENTITY_CACHE_SHARED_TTL", "300"))
+    ENTITY_CACHE_NEGATIVE_TTL = float(os.getenv("ENTITY_CACHE_NEGATIVE_TTL", "5"))
+
+    # Worker bits (0-1023) of Snowflake tweet IDs; must differ between
+    # concurrently running workers. Empty derives it from the process ID,
+    # which is only unique within one host.
+    SNOWFLAKE_WORKER_ID = os.getenv("SNOWFLAKE_WORKER_ID", "")
+    # Worker bits reserved for IDs of imported historical tweets; no live
+    # worker may use them
+    SNOWFLAKE_BACKFILL_WORKER_ID = int(
+        os.getenv("SNOWFLAKE_BACKFILL_WORKER_ID", "1023")
+    )
+
+    # Hot read caches (per worker). Concurrent misses for one key are computed
+    # once while the other requests wait up to CACHE_LOAD_TIMEOUT seconds, and
+    # hits refresh the entry early with a probability that rises toward expiry
+    # (scaled by CACHE_EARLY_REFRESH_BETA; 0 disables early refresh). A TTL of
+    # 0 turns the cache off but keeps the coalescing.
+    CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+    CACHE_LOAD_TIMEOUT = float(os.getenv("CACHE_LOAD_TIMEOUT", "5"))
+    GLOBAL_FEED_CACHE_SIZE = int(os.getenv("GLOBAL_FEED_CACHE_SIZE", "256"))
+    GLOBAL_FEED_CACHE_TTL = float(os.getenv("GLOBAL_FEED_CACHE_TTL", "5"))
+    PROFILE_COUNTS_CACHE_SIZE = int(os.getenv("PROFILE_COUNTS_CACHE_SIZE", "10000"))
+    PROFILE_COUNTS_CACHE_TTL = float(os.getenv("PROFILE_COUNTS_CACHE_TTL", "10"))
+
+    # Cross-worker cache invalidation. Keys a worker invalidates after a
+    # commit (users, tweets, profile counts, follow sets) are batched for
+    # INVALIDATION_BUS_WINDOW_MS and sent to the other workers, which drop
+    # them from their caches; new follow edges and signups are added to
+    # their Bloom filters, whose negatives are then trusted.
+    # "unix:///run/twitter-api/bus" uses datagram sockets in that directory
+    # (workers on one host); "local://<name>" connects buses in one process;
+    # empty disables it. A gap in a sender's
+    # sequence numbers flushes the namespace; idle senders repeat theirs
+    # every INVALIDATION_BUS_HEARTBEAT seconds.
+    INVALIDATION_BUS_URL = os.getenv("INVALIDATION_BUS_URL", "")
+    INVALIDATION_BUS_WINDOW_MS = float(os.getenv("INVALIDATION_BUS_WINDOW_MS", "5"))
+    INVALIDATION_BUS_HEARTBEAT = float(os.getenv("INVALIDATION_BUS_HEARTBEAT", "5"))
+
+    # Read-your-writes: each user's committed tweet creates, edits and deletes
+    # are kept for WRITE_OVERLAY_TTL seconds (0 disables) and merged into
+    # cached global feed pages they request; shared between workers through
+    # ENTITY_CACHE_URL when set, otherwise per worker; should cover
+    # GLOBAL_FEED_CACHE_TTL
+    WRITE_OVERLAY_TTL = float(os.getenv("WRITE_OVERLAY_TTL", "10"))
+    WRITE_OVERLAY_MAX_USERS = int(os.getenv("WRITE_OVERLAY_MAX_USERS", "10000"))
+
+    # Micro-cache of anonymous GET responses from public read endpoints (per
+    # worker, keyed by path and sorted query). Within each TTL a route renders
+    # a given URL at most once; concurrent misses wait for that render.
+    # Requests with an Authorization header are never cached.
+    MICRO_CACHE_ENABLED = os.getenv("MICRO_CACHE_ENABLED", "true") == "true"
+    MICRO_CACHE_SIZE = int(os.getenv("MICRO_CACHE_SIZE", "1024"))
+    MICRO_CACHE_TTL_GLOBAL_FEED = float(os.getenv("MICRO_CACHE_TTL_GLOBAL_FEED", "1"))
+    MICRO_CACHE_TTL_TWEETS = float(os.getenv("MICRO_CACHE_TTL_TWEETS", "1"))
+    MICRO_CACHE_TTL_TWEET = float(os.getenv("MICRO_CACHE_TTL_TWEET", "1"))
+    MICRO_CACHE_TTL_USERS = float(os.getenv("MICRO_CACHE_TTL_USERS", "1"))
+
+    # Tweet creation: "direct" commits each tweet on its own; "batch" groups
+    # tweets arriving within TWEET_BATCH_WINDOW_MS into one INSERT and commit
+    # and answers 201 after the commit (202 with the ID if that takes over
+    # TWEET_BATCH_TIMEOUT); "async" answers 202 with the tweet's
+    # pre-assigned ID as soon as it is queued
+    TWEET_WRITE_MODE = os.getenv("TWEET_WRITE_MODE", "direct")
+    TWEET_BATCH_WINDOW_MS = float(os.getenv("TWEET_BATCH_WINDOW_MS", "5"))
+    TWEET_BATCH_MAX_SIZE = int(os.getenv("TWEET_BATCH_MAX_SIZE", "500"))
+    TWEET_BATCH_QUEUE_SIZE = int(os.getenv("TWEET_BATCH_QUEUE_SIZE", "10000"))
+    TWEET_BATCH_TIMEOUT = float(os.getenv("TWEET_BATCH_TIMEOUT", "5"))
+
+    # Admin NDJSON tweet import: rows validated and committed per batch, and
+    # row errors listed in the response (later ones are only counted)
+    TWEET_IMPORT_BATCH_SIZE = int(os.getenv("TWEET_IMPORT_BATCH_SIZE", "5000"))
+    TWEET_IMPORT_MAX_ERRORS = int(os.getenv("TWEET_IMPORT_MAX_ERRORS", "1000"))
+
+    # Sliding-window rate limits ("<count>/<second|minute|hour|day>"), keyed by
+    # JWT user ID or client IP; login is always keyed by IP. An empty value
+    # disables that policy. RATE_LIMIT_STORAGE_URL may be redis://... (needs
+    # the redis package) to share counters between workers.
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true") == "true"
+    RATE_LIMIT_STORAGE_URL = os.getenv("RATE_LIMIT_STORAGE_URL", "memory://")
+    RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "300/minute")
+    RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/minute")
+    RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "5/minute")
+    RATE_LIMIT_AVAILABILITY = os.getenv("RATE_LIMIT_AVAILABILITY", "120/minute")
+    RATE_LIMIT_FEED = os.getenv("RATE_LIMIT_FEED", "60/minute")
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
 
     DEBUG = True
     TESTING = False
+    SINGLE_WORKER = os.getenv("SINGLE_WORKER", "true") == "true"
 
 
 class TestingConfig(Config):
@@ -30,6 +178,14 @@ class TestingConfig(Config):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    BCRYPT_ROUNDS = 4
+    RATE_LIMIT_ENABLED = False
+    GLOBAL_FEED_CACHE_TTL = 0
+    PROFILE_COUNTS_CACHE_TTL = 0
+    ENTITY_CACHE_URL = "memory://"
+    MICRO_CACHE_ENABLED = False
+    SINGLE_WORKER = True
+    BLOOM_FILTER_BACKGROUND_REBUILD = False
 
 
 class ProductionConfig(Config):
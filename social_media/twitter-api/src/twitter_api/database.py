@@ -1,13 +1,97 @@
 """Database setup and initialization."""
 
+import re
+import sqlite3
+from typing import Iterable, Optional
+
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy import event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 
 db = SQLAlchemy()
 migrate = Migrate()
 
+UNIQUE_VIOLATION = "unique"
+FOREIGN_KEY_VIOLATION = "foreign_key"
+
+# SQLSTATE codes reported by PostgreSQL drivers
+_SQLSTATES = {"23505": UNIQUE_VIOLATION, "23503": FOREIGN_KEY_VIOLATION}
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores foreign keys unless asked; write paths rely on them."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
 
 def init_db(app):
     """Initialize the database with the Flask app."""
     db.init_app(app)
     migrate.init_app(app, db)
+
+
+def insert_ignore(model, rows):
+    """
+    Build a multi-row INSERT that skips rows conflicting with existing keys.
+
+    Uses ``ON CONFLICT DO NOTHING`` on PostgreSQL and SQLite so duplicate
+    rows are dropped by the database instead of failing the whole statement.
+
+    Args:
+        model: Model class whose table receives the rows
+        rows: List of column-value dicts
+
+    Returns:
+        An executable INSERT statement
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).values(rows).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).values(rows).on_conflict_do_nothing()
+    return insert(model).prefix_with("IGNORE").values(rows)
+
+
+def constraint_violation(error: IntegrityError) -> Optional[str]:
+    """
+    Classify an IntegrityError so write paths can map it to a user error.
+
+    Returns:
+        UNIQUE_VIOLATION, FOREIGN_KEY_VIOLATION, or None for anything else
+    """
+    code = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+    if code in _SQLSTATES:
+        return _SQLSTATES[code]
+
+    message = str(error.orig).lower()
+    if "unique" in message or "duplicate" in message:
+        return UNIQUE_VIOLATION
+    if "foreign key" in message:
+        return FOREIGN_KEY_VIOLATION
+    return None
+
+
+def violated_column(error: IntegrityError, columns: Iterable[str]) -> Optional[str]:
+    """
+    First of ``columns`` covered by the constraint behind an IntegrityError.
+
+    Uses the constraint name when the driver reports one (PostgreSQL, e.g.
+    "ix_users_email"), otherwise the message (SQLite, e.g. "UNIQUE constraint
+    failed: users.email"), which never contains the offending values.
+    """
+    diag = getattr(error.orig, "diag", None)
+    constraint_name = getattr(diag, "constraint_name", None)
+    for column in columns:
+        if constraint_name:
+            pattern = rf"(?:^|_){re.escape(column)}(?:_|$)"
+            if re.search(pattern, constraint_name):
+                return column
+        elif re.search(rf"\b{re.escape(column)}\b", str(error.orig)):
+            return column
+    return None
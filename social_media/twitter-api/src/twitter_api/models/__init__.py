@@ -3,5 +3,16 @@
 from twitter_api.models.user import User
 from twitter_api.models.tweet import Tweet
 from twitter_api.models.follow import Follow
+from twitter_api.models.suggestion import FollowSuggestion
+from twitter_api.models.signature import FollowerSignature, SignatureBand
+from twitter_api.models.revoked_token import RevokedToken
 
-__all__ = ["User", "Tweet", "Follow"]
+__all__ = [
+    "User",
+    "Tweet",
+    "Follow",
+    "FollowSuggestion",
+    "FollowerSignature",
+    "SignatureBand",
+    "RevokedToken",
+]
@@ -4,6 +4,11 @@ from twitter_api.database import db
 
 class Follow(db.Model):
     __tablename__ = "follows"
+    # The primary key serves lookups by follower; this index serves the
+    # reverse direction (followers of a user, "follows me" checks).
+    __table_args__ = (
+        db.Index("ix_follows_followed_follower", "followed_id", "follower_id"),
+    )
 
     follower_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
     followed_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
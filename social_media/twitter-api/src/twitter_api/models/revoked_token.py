@@ -0,0 +1,22 @@
+"""Revoked token model."""
+
+from datetime import datetime
+from twitter_api.database import db
+
+
+class RevokedToken(db.Model):
+    """Access token revoked before its expiry (e.g. by logout)."""
+
+    __tablename__ = "revoked_tokens"
+
+    # The token's "jti" claim
+    jti = db.Column(db.String(64), primary_key=True)
+    # Token expiry; the row can be deleted once this passes
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(
+        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+    def __repr__(self):
+        """String representation of RevokedToken."""
+        return f"<RevokedToken {self.jti}>"
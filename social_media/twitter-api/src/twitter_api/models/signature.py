@@ -0,0 +1,39 @@
+"""Follower-set MinHash signature models."""
+
+from datetime import datetime
+from twitter_api.database import db
+
+
+class FollowerSignature(db.Model):
+    """MinHash signature of a user's follower set."""
+
+    __tablename__ = "follower_signatures"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+    # Set when a follower is removed; MinHash cannot drop a member in place
+    stale = db.Column(db.Boolean, default=False, nullable=False)
+    # Moved by every write; SimilarityService checks it as the row version
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        """String representation of FollowerSignature."""
+        return f"<FollowerSignature for user {self.user_id}>"
+
+
+class SignatureBand(db.Model):
+    """LSH bucket of one signature band, used to find similar users."""
+
+    __tablename__ = "signature_bands"
+
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    user_id = db.Column(
+        db.Integer, db.ForeignKey("users.id"), primary_key=True, index=True
+    )
+
+    def __repr__(self):
+        """String representation of SignatureBand."""
+        return f"<SignatureBand {self.band}:{self.bucket} user {self.user_id}>"
@@ -0,0 +1,20 @@
+"""Follow suggestion model."""
+
+from datetime import datetime
+from twitter_api.database import db
+
+
+class FollowSuggestion(db.Model):
+    """Precomputed "who to follow" candidate for a user."""
+
+    __tablename__ = "follow_suggestions"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    # Number of accounts the user follows that follow the candidate
+    score = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        """String representation of FollowSuggestion."""
+        return f"<FollowSuggestion {self.candidate_id} for user {self.user_id}>"
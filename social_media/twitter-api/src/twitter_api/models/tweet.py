@@ -2,21 +2,24 @@
 
 from datetime import datetime
 from twitter_api.database import db
+from twitter_api.utils.snowflake import next_tweet_id
 
 
 class Tweet(db.Model):
     """Tweet model representing a user's tweet."""
 
     __tablename__ = "tweets"
+    # Serves per-author timelines newest first, and the user_id foreign key
+    __table_args__ = (db.Index("ix_tweets_user_id_id", "user_id", "id"),)
 
-    id = db.Column(db.Integer, primary_key=True)
-    content = db.Column(db.String(280), nullable=False)
-    user_id = db.Column(
-        db.Integer, db.ForeignKey("users.id"), nullable=False, index=True
-    )
-    created_at = db.Column(
-        db.DateTime, default=datetime.utcnow, nullable=False, index=True
+    # Time-ordered Snowflake ID assigned in Python before the INSERT, so
+    # ordering by ID is ordering by creation time
+    id = db.Column(
+        db.BigInteger, primary_key=True, autoincrement=False, default=next_tweet_id
     )
+    content = db.Column(db.String(280), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
@@ -28,6 +31,8 @@ class Tweet(db.Model):
         """Convert tweet to dictionary."""
         return {
             "id": self.id,
+            # IDs exceed 2**53, so JavaScript clients should use the string
+            "id_str": str(self.id) if self.id is not None else None,
             "content": self.content,
             "user_id": self.user_id,
             "username": self.user.username if self.user else None,
@@ -15,6 +15,15 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     display_name = db.Column(db.String(100))
     bio = db.Column(db.Text)
+    # PageRank over the follow graph, scaled so the average user scores 1.0;
+    # refreshed by the "influence" stage of scripts/graph_jobs.py
+    influence_score = db.Column(
+        db.Float, default=0.0, server_default="0", nullable=False, index=True
+    )
+    # Grants the /api/admin endpoints; set with scripts/grant_admin.py
+    is_admin = db.Column(
+        db.Boolean, default=False, server_default=db.false(), nullable=False
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
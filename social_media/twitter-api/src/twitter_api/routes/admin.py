@@ -0,0 +1,68 @@
+"""Admin routes."""
+
+from flask import Blueprint, current_app, jsonify, request
+from twitter_api.services.tweet_import import TweetImportService
+from twitter_api.utils.decorators import admin_required
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
+
+
+@admin_bp.route("/tweets/import", methods=["POST"])
+@admin_required
+def import_tweets(current_user):
+    """Bulk-import tweets from an NDJSON body.
+    ---
+    tags:
+      - Admin
+    security:
+      - Bearer: []
+    consumes:
+      - application/x-ndjson
+    parameters:
+      - in: body
+        name: body
+        required: true
+        description: >
+          One JSON object per line with user_id, content and an optional ISO
+          8601 created_at. The body is read as a stream and written in batches
+          of TWEET_IMPORT_BATCH_SIZE rows.
+        schema:
+          type: string
+          example: '{"user_id": 1, "content": "Hello"}'
+    responses:
+      200:
+        description: Import report; invalid rows are skipped and listed
+        schema:
+          type: object
+          properties:
+            processed:
+              type: integer
+            imported:
+              type: integer
+            failed:
+              type: integer
+            batches:
+              type: integer
+            errors:
+              type: array
+              items:
+                type: object
+                properties:
+                  line:
+                    type: integer
+                  error:
+                    type: string
+                    example: User not found
+            errors_truncated:
+              type: boolean
+      401:
+        description: Unauthorized
+      403:
+        description: Not an admin
+    """
+    report = TweetImportService.import_ndjson(
+        request.stream,
+        batch_size=current_app.config["TWEET_IMPORT_BATCH_SIZE"],
+        max_errors=current_app.config["TWEET_IMPORT_MAX_ERRORS"],
+    )
+    return jsonify(report), 200
@@ -1,8 +1,10 @@
 """Authentication routes."""
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, g, jsonify, request
+from twitter_api.services.token_revocation import revoke_token
 from twitter_api.services.user_service import UserService
 from twitter_api.utils.decorators import token_required
+from twitter_api.utils.jwt import invalidate_cached_token
 
 bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
@@ -71,6 +73,12 @@ def register():
             error:
               type: string
               example: Username already exists
+      503:
+        description: Password hashing is saturated; retry after the given delay
+        headers:
+          Retry-After:
+            type: integer
+            description: Seconds to wait before retrying
     """
     data = request.get_json()
 
@@ -101,6 +109,53 @@ def register():
     return jsonify(user.to_dict()), 201
 
 
+@bp.route("/availability", methods=["GET"])
+def availability():
+    """Check whether a username and/or email can be registered.
+    ---
+    tags:
+      - Authentication
+    parameters:
+      - in: query
+        name: username
+        type: string
+        required: false
+      - in: query
+        name: email
+        type: string
+        required: false
+    responses:
+      200:
+        description: Availability of each value checked
+        schema:
+          type: object
+          properties:
+            username:
+              type: object
+              properties:
+                available:
+                  type: boolean
+                error:
+                  type: string
+                  example: Username already exists
+            email:
+              type: object
+              properties:
+                available:
+                  type: boolean
+                error:
+                  type: string
+      400:
+        description: Neither username nor email given
+    """
+    username = request.args.get("username")
+    email = request.args.get("email")
+    if username is None and email is None:
+        return jsonify({"error": "Provide a username and/or email"}), 400
+
+    return jsonify(UserService.check_availability(username, email)), 200
+
+
 @bp.route("/login", methods=["POST"])
 def login():
     """Login a user and receive JWT token.
@@ -154,6 +209,12 @@ def login():
             error:
               type: string
               example: Invalid username or password
+      503:
+        description: Password hashing is saturated; retry after the given delay
+        headers:
+          Retry-After:
+            type: integer
+            description: Seconds to wait before retrying
     """
     data = request.get_json()
 
@@ -186,7 +247,7 @@ def login():
 @bp.route("/logout", methods=["POST"])
 @token_required
 def logout(current_user):
-    """Logout a user.
+    """Logout a user by revoking the access token used for this request.
     ---
     tags:
       - Authentication
@@ -210,4 +271,6 @@ def logout(current_user):
               type: string
               example: Token is invalid or expired
     """
+    revoke_token(current_user)
+    invalidate_cached_token(g.access_token)
     return jsonify({"message": "Successfully logged out"}), 200
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from twitter_api.services.feed_service import FeedService
-from twitter_api.utils.decorators import token_required
+from twitter_api.utils.conditional import conditional, make_etag
+from twitter_api.services.write_overlay import get_write_overlay
+from twitter_api.utils.decorators import optional_token, token_required
 
 feed_bp = Blueprint("feed", __name__, url_prefix="/api")
 
@@ -40,6 +42,8 @@ def get_feed(current_user):
                 properties:
                   id:
                     type: integer
+                  id_str:
+                    type: string
                   user_id:
                     type: integer
                   username:
@@ -88,8 +92,12 @@ def get_feed(current_user):
 
 
 @feed_bp.route("/feed/global", methods=["GET"])
-def get_global_feed():
+@optional_token
+def get_global_feed(current_user):
     """Get global feed of all tweets (public endpoint).
+
+    With a token, the caller's own tweets from the last few seconds are
+    merged into the cached page, so they see their writes immediately.
     ---
     tags:
       - Feed
@@ -119,6 +127,8 @@ def get_global_feed():
                 properties:
                   id:
                     type: integer
+                  id_str:
+                    type: string
                   user_id:
                     type: integer
                   username:
@@ -139,6 +149,8 @@ def get_global_feed():
                   type: integer
                 pages:
                   type: integer
+      304:
+        description: Not modified; the client's ETag matches
       400:
         description: Invalid parameters
         schema:
@@ -155,5 +167,19 @@ def get_global_feed():
     if per_page < 1:
         return jsonify({"error": "Per page must be >= 1"}), 400
 
-    result = FeedService.get_global_feed(page, per_page)
-    return jsonify(result), 200
+    result = dict(FeedService.get_global_feed(page, per_page))
+    loaded_at = result.pop("loaded_at")
+    if current_user is not None:
+        # The cached page may predate the caller's own recent tweets
+        result = get_write_overlay().merge_page(
+            current_user["user_id"], result, loaded_at, page, min(per_page, 100)
+        )
+
+    # Pages are cached, so the tag comes from the page itself rather than a
+    # separate version query
+    etag = make_etag(
+        "feed/global",
+        [(tweet["id"], tweet["updated_at"]) for tweet in result["tweets"]],
+        sorted(result["pagination"].items()),
+    )
+    return conditional(etag, lambda: jsonify(result))
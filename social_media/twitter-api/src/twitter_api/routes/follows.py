@@ -1,6 +1,12 @@
 from flask import Blueprint, jsonify, request
-from twitter_api.services.follow_service import FollowService
-from twitter_api.utils.decorators import token_required
+from twitter_api.services.follow_service import (
+    FollowService,
+    MAX_RELATIONSHIP_LOOKUP,
+)
+from twitter_api.services.suggestion_service import SuggestionService
+from twitter_api.services.user_service import UserService
+from twitter_api.utils.decorators import optional_token, token_required
+from twitter_api.utils.params import MAX_ID, parse_id_list
 
 follows_bp = Blueprint("follows", __name__, url_prefix="/api")
 
@@ -103,8 +109,513 @@ def unfollow_user(current_user, user_id):
     return "", 204
 
 
+def _bulk_user_ids():
+    """Extract the list of target user IDs from a bulk follow request body."""
+    data = request.get_json(silent=True)
+    if not data:
+        return None, "No data provided"
+
+    user_ids = data.get("user_ids")
+    if not isinstance(user_ids, list) or not all(
+        isinstance(user_id, int)
+        and not isinstance(user_id, bool)
+        and 0 < user_id <= MAX_ID
+        for user_id in user_ids
+    ):
+        return None, "user_ids must be a list of integers"
+
+    return user_ids, None
+
+
+@follows_bp.route("/users/follow", methods=["POST"])
+@token_required
+def follow_users(current_user):
+    """Follow several users in one request.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - user_ids
+          properties:
+            user_ids:
+              type: array
+              maxItems: 100
+              items:
+                type: integer
+              example: [2, 3, 5]
+    responses:
+      200:
+        description: Per-target follow status
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  user_id:
+                    type: integer
+                  status:
+                    type: string
+                    enum:
+                      - followed
+                      - already_following
+                      - cannot_follow_self
+                      - not_found
+      400:
+        description: Invalid or oversized list of user IDs
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    user_ids, error = _bulk_user_ids()
+    if error:
+        return jsonify({"error": error}), 400
+
+    results, error = FollowService.follow_users(current_user["user_id"], user_ids)
+
+    if error:
+        status_code = 404 if error == "User not found" else 400
+        return jsonify({"error": error}), status_code
+
+    return jsonify({"results": results}), 200
+
+
+@follows_bp.route("/users/follow", methods=["DELETE"])
+@token_required
+def unfollow_users(current_user):
+    """Unfollow several users in one request.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - user_ids
+          properties:
+            user_ids:
+              type: array
+              maxItems: 100
+              items:
+                type: integer
+              example: [2, 3, 5]
+    responses:
+      200:
+        description: Per-target unfollow status
+        schema:
+          type: object
+          properties:
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  user_id:
+                    type: integer
+                  status:
+                    type: string
+                    enum:
+                      - unfollowed
+                      - not_following
+      400:
+        description: Invalid or oversized list of user IDs
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    user_ids, error = _bulk_user_ids()
+    if error:
+        return jsonify({"error": error}), 400
+
+    results, error = FollowService.unfollow_users(current_user["user_id"], user_ids)
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    return jsonify({"results": results}), 200
+
+
+@follows_bp.route("/users/relationships", methods=["GET"])
+@token_required
+def get_relationships(current_user):
+    """Get follow relationships between the current user and a list of users.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - name: ids
+        in: query
+        type: string
+        required: true
+        description: Comma-separated user IDs (at most 500)
+        example: 2,3,5
+    responses:
+      200:
+        description: Relationship flags in request order
+        schema:
+          type: object
+          properties:
+            relationships:
+              type: array
+              items:
+                type: object
+                properties:
+                  user_id:
+                    type: integer
+                  following:
+                    type: boolean
+                    description: The current user follows this user
+                  followed_by:
+                    type: boolean
+                    description: This user follows the current user
+      400:
+        description: Missing or invalid ids
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    user_ids, error = parse_id_list(request.args.get("ids"), MAX_RELATIONSHIP_LOOKUP)
+    if error:
+        return jsonify({"error": error}), 400
+
+    relationships = FollowService.get_relationships(current_user["user_id"], user_ids)
+
+    return (
+        jsonify(
+            {
+                "relationships": [
+                    {"user_id": user_id, **relationships[user_id]}
+                    for user_id in user_ids
+                ]
+            }
+        ),
+        200,
+    )
+
+
+@follows_bp.route("/users/suggestions", methods=["GET"])
+@token_required
+def get_suggestions(current_user):
+    """Get "who to follow" suggestions for the current user.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Maximum number of suggestions
+    responses:
+      200:
+        description: Suggested users, ranked by how many accounts you follow follow them
+        schema:
+          type: object
+          properties:
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  username:
+                    type: string
+                  display_name:
+                    type: string
+                  mutual_count:
+                    type: integer
+                    description: Accounts you follow that follow this user
+      400:
+        description: Invalid parameters
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    limit = request.args.get("limit", 20, type=int)
+    if limit < 1:
+        return jsonify({"error": "Limit must be >= 1"}), 400
+
+    users = SuggestionService.get_suggestions(current_user["user_id"], limit)
+    return jsonify({"users": users}), 200
+
+
+def _relationship_intersection(current_user, user_id, intersect):
+    """Run one of the FollowService intersections for the current user."""
+    limit = request.args.get("limit", 20, type=int)
+    if limit < 1:
+        return jsonify({"error": "Limit must be >= 1"}), 400
+
+    if not UserService.get_user_by_id(user_id):
+        return jsonify({"error": "User not found"}), 404
+
+    result = intersect(current_user["user_id"], user_id, limit)
+    return jsonify(result), 200
+
+
+@follows_bp.route("/users/<int:user_id>/mutual-followers", methods=["GET"])
+@token_required
+def get_mutual_followers(current_user, user_id):
+    """Get users who follow both you and this user.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: Profile user ID
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Maximum number of users returned
+    responses:
+      200:
+        description: Users following both you and the profile
+        schema:
+          type: object
+          properties:
+            count:
+              type: integer
+              description: Total size of the intersection
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  username:
+                    type: string
+                  display_name:
+                    type: string
+      400:
+        description: Invalid parameters
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return _relationship_intersection(
+        current_user, user_id, FollowService.get_mutual_followers
+    )
+
+
+@follows_bp.route("/users/<int:user_id>/common-following", methods=["GET"])
+@token_required
+def get_common_following(current_user, user_id):
+    """Get users that both you and this user follow.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: Profile user ID
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Maximum number of users returned
+    responses:
+      200:
+        description: Users followed by both you and the profile
+        schema:
+          type: object
+          properties:
+            count:
+              type: integer
+              description: Total size of the intersection
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  username:
+                    type: string
+                  display_name:
+                    type: string
+      400:
+        description: Invalid parameters
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return _relationship_intersection(
+        current_user, user_id, FollowService.get_common_following
+    )
+
+
+@follows_bp.route("/users/<int:user_id>/followers-you-follow", methods=["GET"])
+@token_required
+def get_followers_you_follow(current_user, user_id):
+    """Get this user's followers that you follow.
+    ---
+    tags:
+      - Follows
+    security:
+      - Bearer: []
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: Profile user ID
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Maximum number of users returned
+    responses:
+      200:
+        description: Followers of the profile that you follow
+        schema:
+          type: object
+          properties:
+            count:
+              type: integer
+              description: Total size of the intersection
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  username:
+                    type: string
+                  display_name:
+                    type: string
+      400:
+        description: Invalid parameters
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Unauthorized
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return _relationship_intersection(
+        current_user, user_id, FollowService.get_followers_you_follow
+    )
+
+
 @follows_bp.route("/users/<int:user_id>/followers", methods=["GET"])
-def get_followers(user_id):
+@optional_token
+def get_followers(current_user, user_id):
     """Get a user's followers.
     ---
     tags:
@@ -146,6 +657,12 @@ def get_followers(user_id):
                     type: string
                   bio:
                     type: string
+                  following:
+                    type: boolean
+                    description: Only present for authenticated requests
+                  followed_by:
+                    type: boolean
+                    description: Only present for authenticated requests
             pagination:
               type: object
               properties:
@@ -161,12 +678,15 @@ def get_followers(user_id):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
 
-    result = FollowService.get_followers(user_id, page, per_page)
+    viewer_id = current_user["user_id"] if current_user else None
+
+    result = FollowService.get_followers(user_id, page, per_page, viewer_id)
     return jsonify(result), 200
 
 
 @follows_bp.route("/users/<int:user_id>/following", methods=["GET"])
-def get_following(user_id):
+@optional_token
+def get_following(current_user, user_id):
     """Get users this user is following.
     ---
     tags:
@@ -208,6 +728,12 @@ def get_following(user_id):
                     type: string
                   bio:
                     type: string
+                  following:
+                    type: boolean
+                    description: Only present for authenticated requests
+                  followed_by:
+                    type: boolean
+                    description: Only present for authenticated requests
             pagination:
               type: object
               properties:
@@ -223,5 +749,7 @@ def get_following(user_id):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
 
-    result = FollowService.get_following(user_id, page, per_page)
+    viewer_id = current_user["user_id"] if current_user else None
+
+    result = FollowService.get_following(user_id, page, per_page, viewer_id)
     return jsonify(result), 200
@@ -1,19 +1,30 @@
 """Tweet routes."""
 
-from flask import Blueprint, jsonify, request
-from twitter_api.services.tweet_service import TweetService
+from flask import Blueprint, current_app, jsonify, request
+from twitter_api.services.tweet_service import MAX_TWEET_LOOKUP, TweetService
+from twitter_api.utils.conditional import conditional, make_etag
 from twitter_api.utils.decorators import token_required
+from twitter_api.utils.params import parse_id_list
 
 bp = Blueprint("tweets", __name__, url_prefix="/api/tweets")
 
 
 @bp.route("", methods=["GET"])
 def get_tweets():
-    """Get all tweets with pagination.
+    """Get all tweets with pagination, or specific tweets by ID.
     ---
     tags:
       - Tweets
     parameters:
+      - name: ids
+        in: query
+        type: string
+        required: false
+        description: >
+          Comma-separated tweet IDs (at most 100). Returns those tweets in
+          request order, with {"id", "not_found": true} for missing ones,
+          and ignores the pagination parameters.
+        example: 2,3,5
       - name: page
         in: query
         type: integer
@@ -45,6 +56,8 @@ def get_tweets():
                 properties:
                   id:
                     type: integer
+                  id_str:
+                    type: string
                   user_id:
                     type: integer
                   username:
@@ -68,6 +81,8 @@ def get_tweets():
                   type: integer
                 pages:
                   type: integer
+      304:
+        description: Not modified; the client's ETag matches
       400:
         description: Invalid parameters
         schema:
@@ -76,6 +91,29 @@ def get_tweets():
             error:
               type: string
     """
+    # Multi-get: one query for every requested tweet
+    if "ids" in request.args:
+        tweet_ids, error = parse_id_list(request.args.get("ids"), MAX_TWEET_LOOKUP)
+        if error:
+            return jsonify({"error": error}), 400
+
+        tweets = TweetService.get_tweets_by_ids(tweet_ids)
+        return (
+            jsonify(
+                {
+                    "tweets": [
+                        (
+                            tweets[tweet_id].to_dict()
+                            if tweets[tweet_id]
+                            else {"id": tweet_id, "not_found": True}
+                        )
+                        for tweet_id in tweet_ids
+                    ]
+                }
+            ),
+            200,
+        )
+
     # Get pagination parameters from query string
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
@@ -91,18 +129,17 @@ def get_tweets():
     if sort not in ["newest", "oldest"]:
         return jsonify({"error": "Sort must be 'newest' or 'oldest'"}), 400
 
-    # Get tweets
-    tweets, pagination_info = TweetService.get_all_tweets(page, per_page, sort)
-
-    return (
-        jsonify(
+    def render():
+        tweets, pagination_info = TweetService.get_all_tweets(page, per_page, sort)
+        return jsonify(
             {
                 "tweets": [tweet.to_dict() for tweet in tweets],
                 "pagination": pagination_info,
             }
-        ),
-        200,
-    )
+        )
+
+    # Unchanged pages are answered with 304 before the tweets are loaded
+    return conditional(TweetService.get_all_tweets_etag(page, per_page, sort), render)
 
 
 @bp.route("/<int:tweet_id>", methods=["GET"])
@@ -125,6 +162,8 @@ def get_tweet(tweet_id):
           properties:
             id:
               type: integer
+            id_str:
+              type: string
             user_id:
               type: integer
             username:
@@ -137,6 +176,8 @@ def get_tweet(tweet_id):
             updated_at:
               type: string
               format: date-time
+      304:
+        description: Not modified; the client's ETag or date matches
       404:
         description: Tweet not found
         schema:
@@ -151,7 +192,11 @@ def get_tweet(tweet_id):
     if not tweet:
         return jsonify({"error": "Tweet not found"}), 404
 
-    return jsonify(tweet.to_dict()), 200
+    return conditional(
+        make_etag("tweet", tweet.id, tweet.updated_at),
+        lambda: jsonify(tweet.to_dict()),
+        tweet.updated_at,
+    )
 
 
 @bp.route("", methods=["POST"])
@@ -185,6 +230,8 @@ def create_tweet(current_user):
           properties:
             id:
               type: integer
+            id_str:
+              type: string
             user_id:
               type: integer
             username:
@@ -194,6 +241,11 @@ def create_tweet(current_user):
             created_at:
               type: string
               format: date-time
+      202:
+        description: >
+          Tweet queued with its pre-assigned ID (TWEET_WRITE_MODE=async, or a
+          batch that did not commit within TWEET_BATCH_TIMEOUT); the write is
+          still in flight, so do not resubmit
       400:
         description: Validation error
         schema:
@@ -208,6 +260,10 @@ def create_tweet(current_user):
           properties:
             error:
               type: string
+      503:
+        description: >
+          Write queue full (batch/async modes); the tweet was not queued, so
+          retry after Retry-After
     """
     data = request.get_json()
 
@@ -220,6 +276,18 @@ def create_tweet(current_user):
     if content is None:
         return jsonify({"error": "Content is required"}), 400
 
+    mode = current_app.config["TWEET_WRITE_MODE"]
+    if mode in ("batch", "async"):
+        tweet, error, committed = TweetService.submit_tweet(
+            user_id=current_user["user_id"],
+            username=current_user["username"],
+            content=content,
+            wait_for_commit=mode == "batch",
+        )
+        if error:
+            return jsonify({"error": error}), 400
+        return jsonify(tweet), 201 if committed else 202
+
     # Create tweet
     tweet, error = TweetService.create_tweet(
         user_id=current_user["user_id"], content=content
@@ -267,6 +335,8 @@ def update_tweet(current_user, tweet_id):
           properties:
             id:
               type: integer
+            id_str:
+              type: string
             user_id:
               type: integer
             username:
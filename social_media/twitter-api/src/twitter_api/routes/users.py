@@ -1,20 +1,35 @@
 """User routes."""
 
+import time
+
 from flask import Blueprint, jsonify, request
-from twitter_api.services.user_service import UserService
+from twitter_api.services.similarity_service import SimilarityService
+from twitter_api.services.user_service import MAX_USER_LOOKUP, UserService
 from twitter_api.models.tweet import Tweet
-from twitter_api.utils.decorators import token_required
+from twitter_api.utils.conditional import conditional, make_etag, page_etag
+from twitter_api.services.write_overlay import get_write_overlay
+from twitter_api.utils.decorators import optional_token, token_required
+from twitter_api.utils.params import parse_id_list
 
 bp = Blueprint("users", __name__, url_prefix="/api/users")
 
 
 @bp.route("", methods=["GET"])
 def get_users():
-    """Get all users with pagination.
+    """Get all users with pagination, or specific users by ID.
     ---
     tags:
       - Users
     parameters:
+      - name: ids
+        in: query
+        type: string
+        required: false
+        description: >
+          Comma-separated user IDs (at most 100). Returns those users in
+          request order, with {"id", "not_found": true} for missing ones,
+          and ignores the pagination parameters.
+        example: 2,3,5
       - name: page
         in: query
         type: integer
@@ -27,6 +42,12 @@ def get_users():
         default: 20
         maximum: 100
         description: Number of users per page
+      - name: sort
+        in: query
+        type: string
+        enum: [newest, influence]
+        default: newest
+        description: Sort order for users (influence ranks by follow-graph PageRank)
     responses:
       200:
         description: List of users with pagination info
@@ -62,6 +83,8 @@ def get_users():
                   type: integer
                 pages:
                   type: integer
+      304:
+        description: Not modified; the client's ETag matches
       400:
         description: Invalid parameters
         schema:
@@ -70,9 +93,33 @@ def get_users():
             error:
               type: string
     """
+    # Multi-get: cached users plus at most one query for the rest
+    if "ids" in request.args:
+        user_ids, error = parse_id_list(request.args.get("ids"), MAX_USER_LOOKUP)
+        if error:
+            return jsonify({"error": error}), 400
+
+        users = UserService.get_users_by_ids(user_ids)
+        return (
+            jsonify(
+                {
+                    "users": [
+                        (
+                            users[user_id].to_dict()
+                            if users[user_id]
+                            else {"id": user_id, "not_found": True}
+                        )
+                        for user_id in user_ids
+                    ]
+                }
+            ),
+            200,
+        )
+
     # Get pagination parameters from query string
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 20, type=int)
+    sort = request.args.get("sort", "newest", type=str)
 
     # Validate pagination parameters
     if page < 1:
@@ -80,15 +127,18 @@ def get_users():
     if per_page < 1:
         return jsonify({"error": "Per page must be >= 1"}), 400
 
-    # Get users
-    users, pagination_info = UserService.get_all_users(page, per_page)
+    # Validate sort parameter
+    if sort not in ["newest", "influence"]:
+        return jsonify({"error": "Sort must be 'newest' or 'influence'"}), 400
 
-    return (
-        jsonify(
+    def render():
+        users, pagination_info = UserService.get_all_users(page, per_page, sort)
+        return jsonify(
             {"users": [user.to_dict() for user in users], "pagination": pagination_info}
-        ),
-        200,
-    )
+        )
+
+    # Unchanged pages are answered with 304 before the users are loaded
+    return conditional(UserService.get_all_users_etag(page, per_page, sort), render)
 
 
 @bp.route("/<int:user_id>", methods=["GET"])
@@ -131,6 +181,8 @@ def get_user(user_id):
             following_count:
               type: integer
               description: Number of users being followed
+      304:
+        description: Not modified; the client's ETag matches
       404:
         description: User not found
         schema:
@@ -140,23 +192,23 @@ def get_user(user_id):
               type: string
               example: User not found
     """
-    from twitter_api.services.follow_service import FollowService
-
     user = UserService.get_user_by_id(user_id)
 
     if not user:
         return jsonify({"error": "User not found"}), 404
 
     # Get additional stats
-    tweet_count = Tweet.query.filter_by(user_id=user_id).count()
-    follow_counts = FollowService.get_follow_counts(user_id)
+    counts = UserService.get_profile_counts(user_id)
 
-    user_data = user.to_dict()
-    user_data["tweet_count"] = tweet_count
-    user_data["followers_count"] = follow_counts["followers_count"]
-    user_data["following_count"] = follow_counts["following_count"]
+    def render():
+        user_data = user.to_dict()
+        user_data.update(counts)
+        return jsonify(user_data)
 
-    return jsonify(user_data), 200
+    # Counts change without touching updated_at, so there is no Last-Modified
+    return conditional(
+        make_etag("user", user.id, user.updated_at, sorted(counts.items())), render
+    )
 
 
 @bp.route("/<int:user_id>", methods=["PUT"])
@@ -253,9 +305,77 @@ def update_user(current_user, user_id):
     return jsonify(user.to_dict()), 200
 
 
+@bp.route("/<int:user_id>/similar", methods=["GET"])
+def get_similar_users(user_id):
+    """Get accounts with a similar audience (overlapping followers).
+    ---
+    tags:
+      - Users
+    parameters:
+      - name: user_id
+        in: path
+        type: integer
+        required: true
+        description: User ID
+      - name: limit
+        in: query
+        type: integer
+        default: 20
+        maximum: 100
+        description: Maximum number of accounts
+    responses:
+      200:
+        description: Similar accounts, most similar first
+        schema:
+          type: object
+          properties:
+            users:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  username:
+                    type: string
+                  display_name:
+                    type: string
+                  similarity:
+                    type: number
+                    description: Estimated Jaccard similarity of follower sets
+      400:
+        description: Invalid parameters
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      404:
+        description: User not found
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    limit = request.args.get("limit", 20, type=int)
+    if limit < 1:
+        return jsonify({"error": "Limit must be >= 1"}), 400
+
+    if not UserService.get_user_by_id(user_id):
+        return jsonify({"error": "User not found"}), 404
+
+    users = SimilarityService.get_similar_accounts(user_id, limit)
+    return jsonify({"users": users}), 200
+
+
 @bp.route("/<int:user_id>/tweets", methods=["GET"])
-def get_user_tweets(user_id):
+@optional_token
+def get_user_tweets(current_user, user_id):
     """Get all tweets by a specific user with pagination.
+
+    With the author's own token, their tweets from the last few seconds are
+    merged into the page, so they see their writes immediately.
     ---
     tags:
       - Users
@@ -319,6 +439,8 @@ def get_user_tweets(user_id):
                   type: integer
                 total_items:
                   type: integer
+      304:
+        description: Not modified; the client's ETag matches
       400:
         description: Invalid parameters
         schema:
@@ -353,28 +475,58 @@ def get_user_tweets(user_id):
     per_page = min(per_page, 100)
 
     # Get tweets
-    pagination = (
-        Tweet.query.filter_by(user_id=user_id)
-        .order_by(Tweet.created_at.desc())
-        .paginate(page=page, per_page=per_page, error_out=False)
+    query = Tweet.query.filter_by(user_id=user_id).order_by(Tweet.id.desc())
+
+    own = current_user is not None and current_user["user_id"] == user_id
+    overlay = get_write_overlay()
+    # The author's page also depends on their writes the read may not see yet
+    writes = (
+        sorted(
+            (tweet_id, op, tweet.get("updated_at"))
+            for tweet_id, (op, tweet) in overlay.recent(user_id).items()
+        )
+        if own
+        else []
     )
 
-    return (
-        jsonify(
-            {
-                "user": {
-                    "id": user.id,
-                    "username": user.username,
-                    "display_name": user.display_name,
-                },
-                "tweets": [tweet.to_dict() for tweet in pagination.items],
-                "pagination": {
-                    "page": pagination.page,
-                    "per_page": pagination.per_page,
-                    "total_pages": pagination.pages,
-                    "total_items": pagination.total,
-                },
-            }
-        ),
-        200,
+    def render():
+        loaded_at = time.time()
+        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = {
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "display_name": user.display_name,
+            },
+            "tweets": [tweet.to_dict() for tweet in pagination.items],
+            "pagination": {
+                "page": pagination.page,
+                "per_page": pagination.per_page,
+                "total_pages": pagination.pages,
+                "total_items": pagination.total,
+            },
+        }
+        if own:
+            result = overlay.merge_page(
+                user_id,
+                result,
+                loaded_at,
+                page,
+                per_page,
+                total_key="total_items",
+                pages_key="total_pages",
+            )
+        return jsonify(result)
+
+    # Unchanged pages are answered with 304 before the tweets are loaded
+    etag = page_etag(
+        f"user-tweets:{user_id}",
+        query,
+        Tweet.id,
+        Tweet.updated_at,
+        page,
+        per_page,
+        user.updated_at,
+        writes,
     )
+    return conditional(etag, render)
@@ -0,0 +1,424 @@
+"""Two-tier cache of user and tweet rows: a per-worker LRU over a shared store."""
+
+import json
+import secrets
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import DateTime
+from sqlalchemy.orm import make_transient_to_detached
+
+from twitter_api.database import db
+from twitter_api.models import Tweet, User
+from twitter_api.services.invalidation_bus import InvalidationBus, get_invalidation_bus
+from twitter_api.utils.cache import MISSING, LoadingCache
+from twitter_api.utils.local_state import get_local
+
+USER = "user"
+TWEET = "tweet"
+# Username -> user ID, so lookups by name reuse the cached user row
+USER_ID_BY_NAME = "username"
+
+MODELS = {USER: User, TWEET: Tweet}
+
+# How long a miss may take to load and still be shared; slower loads are
+# served but not stored
+LEASE_SECONDS = 10
+
+# Only store a value if the key's lease is still ours, then drop the lease.
+# KEYS alternate lease key, value key; ARGV is the TTL in ms, then
+# alternating token, value
+SET_LEASED_SCRIPT = """
+local stored = 0
+for i = 1, #KEYS, 2 do
+    local n = (i - 1) / 2
+    if redis.call('GET', KEYS[i]) == ARGV[2 + n * 2] then
+        redis.call('SET', KEYS[i + 1], ARGV[3 + n * 2], 'PX', ARGV[1])
+        redis.call('DEL', KEYS[i])
+        stored = stored + 1
+    end
+end
+return stored
+"""
+
+
+def snapshot(obj, exclude: Iterable[str] = ()) -> Dict:
+    """Column values of a row as a plain dict."""
+    return {
+        column.key: getattr(obj, column.key)
+        for column in obj.__table__.columns
+        if column.key not in exclude
+    }
+
+
+def attach(model, values: Dict):
+    """Turn a snapshot into a session-bound instance without a query."""
+    obj = model(**values)
+    make_transient_to_detached(obj)
+    return db.session.merge(obj, load=False)
+
+
+def _lease_key(key: str) -> str:
+    return f"{key}:lease"
+
+
+def _new_token() -> str:
+    return secrets.token_hex(8)
+
+
+class MemoryEntityStore:
+    """
+    In-process stand-in for the shared store (tests, single-process runs).
+
+    Holds serialized entries with an expiry, like Redis ``SETEX``.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        # key -> (expires_at, token) of the reader allowed to fill it
+        self._leases: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        with self._lock:
+            values = []
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and now >= entry[0]:
+                    del self._entries[key]
+                    entry = None
+                values.append(entry[1] if entry is not None else None)
+            return values
+
+    def set_many(self, items: Dict[str, str], ttl: float) -> None:
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+
+    def lease(self, keys: List[str]) -> Dict[str, str]:
+        tokens = {key: _new_token() for key in keys}
+        expires_at = time.monotonic() + LEASE_SECONDS
+        with self._lock:
+            for key, token in tokens.items():
+                self._leases[key] = (expires_at, token)
+        return tokens
+
+    def set_leased(self, items: Dict[str, Tuple[str, str]], ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for key, (value, token) in items.items():
+                lease = self._leases.get(key)
+                if lease is None or now >= lease[0] or lease[1] != token:
+                    continue
+                del self._leases[key]
+                self._entries[key] = (now + ttl, value)
+
+    def delete(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._leases.pop(key, None)
+
+
+class RedisEntityStore:
+    """Entries shared by every worker through Redis; needs ``redis``."""
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "ENTITY_CACHE_URL points at Redis; pip install redis"
+            ) from e
+        self._redis = redis.Redis.from_url(url)
+        self._set_leased = self._redis.register_script(SET_LEASED_SCRIPT)
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        return [
+            value.decode() if value is not None else None
+            for value in self._redis.mget(keys)
+        ]
+
+    def set_many(self, items: Dict[str, str], ttl: float) -> None:
+        pipe = self._redis.pipeline()
+        for key, value in items.items():
+            pipe.set(key, value, px=max(int(ttl * 1000), 1))
+        pipe.execute()
+
+    def lease(self, keys: List[str]) -> Dict[str, str]:
+        tokens = {key: _new_token() for key in keys}
+        pipe = self._redis.pipeline()
+        for key, token in tokens.items():
+            pipe.set(_lease_key(key), token, ex=LEASE_SECONDS)
+        pipe.execute()
+        return tokens
+
+    def set_leased(self, items: Dict[str, Tuple[str, str]], ttl: float) -> None:
+        keys: List[str] = []
+        args: List[object] = [max(int(ttl * 1000), 1)]
+        for key, (value, token) in items.items():
+            keys.extend([_lease_key(key), key])
+            args.extend([token, value])
+        self._set_leased(keys=keys, args=args)
+
+    def delete(self, keys: List[str]) -> None:
+        self._redis.delete(*keys, *[_lease_key(key) for key in keys])
+
+
+class EntityCache:
+    """
+    Users, tweets and username -> ID mappings cached in two tiers.
+
+    The first tier is a per-worker ``LoadingCache`` per entity type, so
+    concurrent misses are coalesced and hot rows refreshed early. Misses fall
+    through to the optional shared store, then to the database. Rows that do
+    not exist are cached as well, for ``negative_ttl`` seconds.
+
+    Writes must call ``invalidate`` after committing. With an invalidation
+    bus, other workers drop the keys from their first tier too; otherwise
+    they keep a stale row until its TTL passes. A miss takes a lease on the
+    shared key before loading and ``invalidate`` clears it, so a row read
+    before a write committed is never stored after that write's
+    invalidation.
+    """
+
+    def __init__(
+        self,
+        layers: Dict[str, LoadingCache],
+        store=None,
+        shared_ttl: float = 60,
+        negative_ttl: float = 5,
+        bus: Optional[InvalidationBus] = None,
+    ):
+        self.layers = layers
+        self.store = store
+        self.shared_ttl = shared_ttl
+        self.negative_ttl = negative_ttl
+        self.bus = bus
+        if bus is not None:
+            # Other workers already cleared the shared tier
+            for kind, layer in layers.items():
+                bus.subscribe(f"entity:{kind}", layer.delete, layer.clear)
+        self.shared_hits = {kind: 0 for kind in layers}
+        self.loads = {kind: 0 for kind in layers}
+        self.not_found = {kind: 0 for kind in layers}
+
+    @staticmethod
+    def _store_key(kind: str, key: Hashable) -> str:
+        return f"entity:{kind}:{key}"
+
+    @staticmethod
+    def _encode(value) -> str:
+        if value is MISSING:
+            return "null"
+        if isinstance(value, dict):
+            value = {
+                k: v.isoformat() if isinstance(v, datetime) else v
+                for k, v in value.items()
+            }
+        return json.dumps(value)
+
+    @staticmethod
+    def _decode(kind: str, raw: str):
+        value = json.loads(raw)
+        if value is None:
+            return MISSING
+        model = MODELS.get(kind)
+        if model is not None:
+            for column in model.__table__.columns:
+                if isinstance(column.type, DateTime) and value.get(column.key):
+                    value[column.key] = datetime.fromisoformat(value[column.key])
+        return value
+
+    def _share(
+        self, kind: str, values: Dict[Hashable, object], leases: Dict[str, str]
+    ) -> None:
+        """Store loaded values whose lease no write has cleared since."""
+        if self.store is None or not values:
+            return
+        positive = {}
+        negative = {}
+        for key, value in values.items():
+            store_key = self._store_key(kind, key)
+            target = negative if value is MISSING else positive
+            target[store_key] = (self._encode(value), leases[store_key])
+        if positive:
+            self.store.set_leased(positive, self.shared_ttl)
+        if negative:
+            self.store.set_leased(negative, self.negative_ttl)
+
+    def _load(self, kind: str, key: Hashable, loader: Callable):
+        leases: Dict[str, str] = {}
+        if self.store is not None:
+            store_key = self._store_key(kind, key)
+            raw = self.store.get_many([store_key])[0]
+            if raw is not None:
+                self.shared_hits[kind] += 1
+                return self._decode(kind, raw)
+            leases = self.store.lease([store_key])
+
+        value = loader()
+        self.loads[kind] += 1
+        value = MISSING if value is None else value
+        self._share(kind, {key: value}, leases)
+        return value
+
+    def get(self, kind: str, key: Hashable, loader: Callable):
+        """
+        Cached value for ``key``, loading it with ``loader`` on a miss.
+
+        Args:
+            kind: USER, TWEET or USER_ID_BY_NAME
+            key: Entity ID (or username)
+            loader: Zero-argument callable returning the value, or None if
+                the entity does not exist
+
+        Returns:
+            The value, or None if the entity does not exist
+        """
+        value = self.layers[kind].get_or_load(
+            key, lambda: self._load(kind, key, loader)
+        )
+        if value is MISSING:
+            self.not_found[kind] += 1
+            return None
+        return value
+
+    def get_many(
+        self,
+        kind: str,
+        keys: List[Hashable],
+        loader: Callable[[List[Hashable]], Dict[Hashable, object]],
+    ) -> Dict[Hashable, object]:
+        """
+        Cached values for many keys with one store round trip and one load.
+
+        Args:
+            kind: USER, TWEET or USER_ID_BY_NAME
+            keys: Keys to look up
+            loader: Called with the keys missing from both tiers; returns a
+                dict of the ones that exist
+
+        Returns:
+            Dict mapping each key to its value, or None if it does not exist
+        """
+        layer = self.layers[kind]
+        values = {}
+        missing = []
+        for key in keys:
+            value = layer.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+
+        leases: Dict[str, str] = {}
+        if missing and self.store is not None:
+            raws = self.store.get_many([self._store_key(kind, k) for k in missing])
+            still_missing = []
+            for key, raw in zip(missing, raws):
+                if raw is None:
+                    still_missing.append(key)
+                    continue
+                self.shared_hits[kind] += 1
+                values[key] = self._decode(kind, raw)
+                layer.set(
+                    key,
+                    values[key],
+                    ttl=self.negative_ttl if values[key] is MISSING else None,
+                )
+            missing = still_missing
+            if missing:
+                leases = self.store.lease([self._store_key(kind, k) for k in missing])
+
+        if missing:
+            found = loader(missing)
+            self.loads[kind] += len(missing)
+            loaded = {key: found.get(key, MISSING) for key in missing}
+            for key, value in loaded.items():
+                layer.set(
+                    key, value, ttl=self.negative_ttl if value is MISSING else None
+                )
+            self._share(kind, loaded, leases)
+            values.update(loaded)
+
+        result = {}
+        for key in keys:
+            if values[key] is MISSING:
+                self.not_found[kind] += 1
+                result[key] = None
+            else:
+                result[key] = values[key]
+        return result
+
+    def invalidate(self, kind: str, keys: Iterable[Hashable]) -> None:
+        """Drop entries from both tiers after a committed write."""
+        keys = list(keys)
+        for key in keys:
+            self.layers[kind].delete(key)
+        if self.store is not None and keys:
+            self.store.delete([self._store_key(kind, key) for key in keys])
+        if self.bus is not None:
+            self.bus.publish(f"entity:{kind}", keys)
+
+    def stats(self) -> Dict:
+        """Per-entity-type hit ratios for the metrics endpoint."""
+        stats = {"shared_store": type(self.store).__name__ if self.store else None}
+        for kind, layer in self.layers.items():
+            layer_stats = layer.stats()
+            lookups = layer_stats["hits"] + layer_stats["misses"]
+            hits = layer_stats["hits"] + self.shared_hits[kind]
+            stats[kind] = {
+                "entries": layer_stats["entries"],
+                "local_hits": layer_stats["hits"],
+                "shared_hits": self.shared_hits[kind],
+                "loads": self.loads[kind],
+                "not_found": self.not_found[kind],
+                "coalesced": layer_stats["coalesced"],
+                "early_refreshes": layer_stats["early_refreshes"],
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            }
+        return stats
+
+
+def get_entity_cache() -> EntityCache:
+    """Get this worker's entity cache."""
+    config = current_app.config
+
+    def layer(size_key: str, ttl_key: str) -> LoadingCache:
+        return LoadingCache(
+            config[size_key],
+            config[ttl_key],
+            config["CACHE_EARLY_REFRESH_BETA"],
+            config["CACHE_LOAD_TIMEOUT"],
+            config["ENTITY_CACHE_NEGATIVE_TTL"],
+        )
+
+    bus = get_invalidation_bus()
+
+    def build() -> EntityCache:
+        url = config["ENTITY_CACHE_URL"]
+        if url.startswith(("redis://", "rediss://")):
+            store = RedisEntityStore(url)
+        elif url.startswith("memory://"):
+            store = MemoryEntityStore()
+        else:
+            store = None
+        return EntityCache(
+            {
+                USER: layer("USER_CACHE_SIZE", "USER_CACHE_TTL"),
+                USER_ID_BY_NAME: layer("USER_CACHE_SIZE", "USER_CACHE_TTL"),
+                TWEET: layer("TWEET_CACHE_SIZE", "TWEET_CACHE_TTL"),
+            },
+            store,
+            config["ENTITY_CACHE_SHARED_TTL"],
+            config["ENTITY_CACHE_NEGATIVE_TTL"],
+            bus,
+        )
+
+    return get_local("entity_cache", build)
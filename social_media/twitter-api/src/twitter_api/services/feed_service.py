@@ -1,5 +1,25 @@
+import time
+
+from flask import current_app
+
 from twitter_api.database import db
 from twitter_api.models import Tweet, Follow
+from twitter_api.utils.cache import LoadingCache
+from twitter_api.utils.local_state import get_local
+
+
+def get_global_feed_cache() -> LoadingCache:
+    """Get this worker's cache of global feed pages."""
+    config = current_app.config
+    return get_local(
+        "global_feed",
+        lambda: LoadingCache(
+            config["GLOBAL_FEED_CACHE_SIZE"],
+            config["GLOBAL_FEED_CACHE_TTL"],
+            config["CACHE_EARLY_REFRESH_BETA"],
+            config["CACHE_LOAD_TIMEOUT"],
+        ),
+    )
 
 
 class FeedService:
@@ -19,7 +39,7 @@ class FeedService:
         # Get tweets from followed users
         tweets_query = (
             Tweet.query.filter(Tweet.user_id.in_(following_ids))
-            .order_by(Tweet.created_at.desc())
+            .order_by(Tweet.id.desc())
         )
 
         pagination = tweets_query.paginate(
@@ -41,10 +61,21 @@ class FeedService:
         """
         Get global feed of all tweets.
         Useful for discovery or when user follows no one.
+
+        Pages are cached per worker for GLOBAL_FEED_CACHE_TTL seconds; when
+        one expires, concurrent requests share a single recomputation.
+        ``loaded_at`` (a ``time.time()``) tells how old the page is.
         """
         per_page = min(per_page, 100)
 
-        pagination = Tweet.query.order_by(Tweet.created_at.desc()).paginate(
+        return get_global_feed_cache().get_or_load(
+            (page, per_page), lambda: FeedService._load_global_feed(page, per_page)
+        )
+
+    @staticmethod
+    def _load_global_feed(page, per_page):
+        loaded_at = time.time()
+        pagination = Tweet.query.order_by(Tweet.id.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
@@ -56,4 +87,5 @@ class FeedService:
                 "total": pagination.total,
                 "pages": pagination.pages,
             },
+            "loaded_at": loaded_at,
         }
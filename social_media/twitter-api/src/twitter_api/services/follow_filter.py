@@ -0,0 +1,81 @@
+"""Per-worker Bloom filter over follow edges."""
+
+import struct
+from typing import Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from twitter_api.database import db
+from twitter_api.models import Follow
+from twitter_api.services.invalidation_bus import get_invalidation_bus
+from twitter_api.utils.bloom import RebuildingBloomFilter
+from twitter_api.utils.local_state import get_local
+
+# Smallest filter built, so a young table does not rebuild on every follow
+MIN_CAPACITY = 10000
+
+# Invalidation bus namespace; keys are hex-encoded edge keys to add
+NAMESPACE = "follow_filter"
+
+
+def _edge_key(follower_id: int, followed_id: int) -> bytes:
+    return struct.pack(">qq", follower_id, followed_id)
+
+
+def _load_edges() -> Tuple[int, Iterable[bytes]]:
+    edges = db.session.query(Follow.follower_id, Follow.followed_id)
+    return Follow.query.count() * 2, (
+        _edge_key(follower_id, followed_id)
+        for follower_id, followed_id in edges.yield_per(50000)
+    )
+
+
+class FollowEdgeFilter(RebuildingBloomFilter):
+    """
+    Answers "definitely not following" without touching the database.
+
+    The filter is built from the ``follows`` table in the background, updated
+    by follows made in this worker and, through the invalidation bus, in the
+    others, and rebuilt after ``refresh_seconds`` (to drop unfollowed edges)
+    or once it holds more edges than it was sized for.
+    """
+
+    def might_follow(self, follower_id: int, followed_id: int) -> bool:
+        """False means the edge definitely does not exist."""
+        return self.might_contain(_edge_key(follower_id, followed_id))
+
+
+def get_follow_filter() -> Optional[FollowEdgeFilter]:
+    """Get this worker's follow filter, or None when it is disabled."""
+    config = current_app.config
+    if not config["FOLLOW_FILTER_ENABLED"]:
+        return None
+
+    app = current_app._get_current_object()
+    bus = get_invalidation_bus()
+
+    def build() -> FollowEdgeFilter:
+        edge_filter = FollowEdgeFilter(
+            app,
+            _load_edges,
+            config["FOLLOW_FILTER_ERROR_RATE"],
+            config["FOLLOW_FILTER_REFRESH_SECONDS"],
+            MIN_CAPACITY,
+            synced=config["SINGLE_WORKER"] or bus.transport is not None,
+            background=config["BLOOM_FILTER_BACKGROUND_REBUILD"],
+        )
+        edge_filter.subscribe(bus, NAMESPACE)
+        return edge_filter
+
+    return get_local("follow_filter", build)
+
+
+def record_follow_edges(follower_id: int, followed_ids: List[int]) -> None:
+    """Add committed follows to this worker's filter and the other workers'."""
+    edge_filter = get_follow_filter()
+    if edge_filter is None:
+        return
+    keys = [_edge_key(follower_id, followed_id) for followed_id in followed_ids]
+    for key in keys:
+        edge_filter.add(key)
+    get_invalidation_bus().publish(NAMESPACE, [key.hex() for key in keys])
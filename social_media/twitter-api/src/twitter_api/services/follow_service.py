@@ -1,5 +1,25 @@
-from twitter_api.database import db
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from twitter_api.database import (
+    FOREIGN_KEY_VIOLATION,
+    constraint_violation,
+    db,
+    insert_ignore,
+)
 from twitter_api.models import User, Follow
+from twitter_api.services.follow_filter import get_follow_filter, record_follow_edges
+from twitter_api.services.follow_sets import get_follow_sets, publish_follow_changes
+from twitter_api.services.profile_counts import invalidate_profile_counts
+from twitter_api.services.similarity_service import SimilarityService
+from twitter_api.services.user_loader import load_user
+
+# Upper bound on targets accepted by a single bulk follow/unfollow request
+MAX_BULK_FOLLOW = 100
+
+# Upper bound on targets accepted by a single relationship lookup
+MAX_RELATIONSHIP_LOOKUP = 500
 
 
 class FollowService:
@@ -9,23 +29,23 @@ class FollowService:
         if follower_id == followed_id:
             return None, "Cannot follow yourself"
 
-        follower = User.query.get(follower_id)
-        followed = User.query.get(followed_id)
-
-        if not follower or not followed:
-            return None, "User not found"
-
-        existing = Follow.query.filter_by(
-            follower_id=follower_id, followed_id=followed_id
-        ).first()
-
-        if existing:
-            return None, "Already following this user"
-
+        # One INSERT: the primary key rejects duplicate follows and the
+        # foreign keys reject unknown users
         follow = Follow(follower_id=follower_id, followed_id=followed_id)
         db.session.add(follow)
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            if constraint_violation(e) == FOREIGN_KEY_VIOLATION:
+                return None, "User not found"
+            return None, "Already following this user"
+
+        SimilarityService.add_follower(follower_id, [followed_id])
         db.session.commit()
 
+        FollowService._record_follows(follower_id, [followed_id])
+
         return follow, None
 
     @staticmethod
@@ -39,11 +59,145 @@ class FollowService:
             return False, "Not following this user"
 
         db.session.delete(follow)
+        SimilarityService.mark_stale([followed_id])
         db.session.commit()
+
+        FollowService._record_unfollows(follower_id, [followed_id])
         return True, None
 
     @staticmethod
-    def get_followers(user_id, page=1, per_page=20):
+    def follow_users(follower_id, followed_ids):
+        """
+        Follow several users at once.
+
+        Targets are validated with one query and the new edges are written
+        with a single multi-row insert that skips existing follows, so the
+        whole batch costs one commit.
+
+        Returns:
+            Tuple of (results, error_message) where results is a list of
+            {"user_id", "status"} dicts in request order
+        """
+        followed_ids = list(dict.fromkeys(followed_ids))
+        if not followed_ids:
+            return None, "No user IDs provided"
+        if len(followed_ids) > MAX_BULK_FOLLOW:
+            return None, f"Cannot follow more than {MAX_BULK_FOLLOW} users"
+
+        if not load_user(follower_id):
+            return None, "User not found"
+
+        existing_users = {
+            row[0]
+            for row in db.session.query(User.id).filter(User.id.in_(followed_ids))
+        }
+        already_following = {
+            row[0]
+            for row in db.session.query(Follow.followed_id).filter(
+                Follow.follower_id == follower_id,
+                Follow.followed_id.in_(followed_ids),
+            )
+        }
+
+        results = []
+        now = datetime.utcnow()
+        rows = []
+        for followed_id in followed_ids:
+            if followed_id == follower_id:
+                status = "cannot_follow_self"
+            elif followed_id not in existing_users:
+                status = "not_found"
+            elif followed_id in already_following:
+                status = "already_following"
+            else:
+                status = "followed"
+                rows.append(
+                    {
+                        "follower_id": follower_id,
+                        "followed_id": followed_id,
+                        "created_at": now,
+                    }
+                )
+            results.append({"user_id": followed_id, "status": status})
+
+        if rows:
+            db.session.execute(insert_ignore(Follow, rows))
+            SimilarityService.add_follower(
+                follower_id, [row["followed_id"] for row in rows]
+            )
+            db.session.commit()
+
+            FollowService._record_follows(
+                follower_id, [row["followed_id"] for row in rows]
+            )
+
+        return results, None
+
+    @staticmethod
+    def unfollow_users(follower_id, followed_ids):
+        """
+        Unfollow several users with a single DELETE and commit.
+
+        Returns:
+            Tuple of (results, error_message) where results is a list of
+            {"user_id", "status"} dicts in request order
+        """
+        followed_ids = list(dict.fromkeys(followed_ids))
+        if not followed_ids:
+            return None, "No user IDs provided"
+        if len(followed_ids) > MAX_BULK_FOLLOW:
+            return None, f"Cannot unfollow more than {MAX_BULK_FOLLOW} users"
+
+        following = {
+            row[0]
+            for row in db.session.query(Follow.followed_id).filter(
+                Follow.follower_id == follower_id,
+                Follow.followed_id.in_(followed_ids),
+            )
+        }
+
+        if following:
+            Follow.query.filter(
+                Follow.follower_id == follower_id,
+                Follow.followed_id.in_(following),
+            ).delete(synchronize_session=False)
+            SimilarityService.mark_stale(following)
+            db.session.commit()
+
+            FollowService._record_unfollows(follower_id, following)
+
+        results = [
+            {
+                "user_id": followed_id,
+                "status": (
+                    "unfollowed" if followed_id in following else "not_following"
+                ),
+            }
+            for followed_id in followed_ids
+        ]
+        return results, None
+
+    @staticmethod
+    def _record_follows(follower_id, followed_ids):
+        """Apply committed follows to cached filter, sets and counts."""
+        record_follow_edges(follower_id, followed_ids)
+        follow_sets = get_follow_sets()
+        for followed_id in followed_ids:
+            follow_sets.record_follow(follower_id, followed_id)
+        publish_follow_changes(follower_id, followed_ids)
+        invalidate_profile_counts([follower_id, *followed_ids])
+
+    @staticmethod
+    def _record_unfollows(follower_id, followed_ids):
+        """Apply committed unfollows to cached follow sets and counts."""
+        follow_sets = get_follow_sets()
+        for followed_id in followed_ids:
+            follow_sets.record_unfollow(follower_id, followed_id)
+        publish_follow_changes(follower_id, followed_ids)
+        invalidate_profile_counts([follower_id, *followed_ids])
+
+    @staticmethod
+    def get_followers(user_id, page=1, per_page=20, viewer_id=None):
         """Get users following this user."""
         per_page = min(per_page, 100)
 
@@ -57,7 +211,7 @@ class FollowService:
         users = User.query.filter(User.id.in_(follower_ids)).all()
 
         return {
-            "users": [u.to_dict() for u in users],
+            "users": FollowService._with_relationships(users, viewer_id),
             "pagination": {
                 "page": follows.page,
                 "per_page": follows.per_page,
@@ -67,7 +221,7 @@ class FollowService:
         }
 
     @staticmethod
-    def get_following(user_id, page=1, per_page=20):
+    def get_following(user_id, page=1, per_page=20, viewer_id=None):
         """Get users this user is following."""
         per_page = min(per_page, 100)
 
@@ -81,7 +235,7 @@ class FollowService:
         users = User.query.filter(User.id.in_(followed_ids)).all()
 
         return {
-            "users": [u.to_dict() for u in users],
+            "users": FollowService._with_relationships(users, viewer_id),
             "pagination": {
                 "page": follows.page,
                 "per_page": follows.per_page,
@@ -90,9 +244,106 @@ class FollowService:
             },
         }
 
+    @staticmethod
+    def get_relationships(viewer_id, user_ids):
+        """
+        Get the follow relationship between a viewer and many users.
+
+        Both directions are answered with a single query that uses the
+        follows primary key and its reverse index.
+
+        Returns:
+            Dict mapping each user ID to {"following", "followed_by"} flags
+        """
+        following = set()
+        followed_by = set()
+
+        if user_ids:
+            rows = db.session.query(Follow.follower_id, Follow.followed_id).filter(
+                or_(
+                    and_(
+                        Follow.follower_id == viewer_id,
+                        Follow.followed_id.in_(user_ids),
+                    ),
+                    and_(
+                        Follow.followed_id == viewer_id,
+                        Follow.follower_id.in_(user_ids),
+                    ),
+                )
+            )
+            for follower_id, followed_id in rows:
+                if follower_id == viewer_id:
+                    following.add(followed_id)
+                if followed_id == viewer_id:
+                    followed_by.add(follower_id)
+
+        return {
+            user_id: {
+                "following": user_id in following,
+                "followed_by": user_id in followed_by,
+            }
+            for user_id in user_ids
+        }
+
+    @staticmethod
+    def _with_relationships(users, viewer_id):
+        """Serialize users, embedding relationship flags when a viewer is known."""
+        user_dicts = [u.to_dict() for u in users]
+        if viewer_id is None:
+            return user_dicts
+
+        relationships = FollowService.get_relationships(
+            viewer_id, [u["id"] for u in user_dicts]
+        )
+        for user_dict in user_dicts:
+            user_dict.update(relationships[user_dict["id"]])
+        return user_dicts
+
+    @staticmethod
+    def _intersection(left, right, limit):
+        """Count an ID-set intersection and load the first ``limit`` users."""
+        shared = left & right
+        user_ids = list(islice(shared, min(limit, 100)))
+        users = User.query.filter(User.id.in_(user_ids)).order_by(User.id).all()
+
+        return {
+            "count": len(shared),
+            "users": [u.to_dict() for u in users],
+        }
+
+    @staticmethod
+    def get_mutual_followers(viewer_id, user_id, limit=20):
+        """Users who follow both the viewer and ``user_id``."""
+        follow_sets = get_follow_sets()
+        return FollowService._intersection(
+            follow_sets.followers(viewer_id), follow_sets.followers(user_id), limit
+        )
+
+    @staticmethod
+    def get_common_following(viewer_id, user_id, limit=20):
+        """Users followed by both the viewer and ``user_id``."""
+        follow_sets = get_follow_sets()
+        return FollowService._intersection(
+            follow_sets.following(viewer_id), follow_sets.following(user_id), limit
+        )
+
+    @staticmethod
+    def get_followers_you_follow(viewer_id, user_id, limit=20):
+        """Followers of ``user_id`` that the viewer follows."""
+        follow_sets = get_follow_sets()
+        return FollowService._intersection(
+            follow_sets.following(viewer_id), follow_sets.followers(user_id), limit
+        )
+
     @staticmethod
     def is_following(follower_id, followed_id):
         """Check if follower_id is following followed_id."""
+        edge_filter = get_follow_filter()
+        if edge_filter is not None and not edge_filter.might_follow(
+            follower_id, followed_id
+        ):
+            return False
+
         return (
             Follow.query.filter_by(
                 follower_id=follower_id, followed_id=followed_id
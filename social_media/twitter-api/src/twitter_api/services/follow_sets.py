@@ -0,0 +1,185 @@
+"""Per-worker cache of follower/following ID sets as compressed bitmaps."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import current_app
+
+from twitter_api.database import db
+from twitter_api.models import Follow
+from twitter_api.services.invalidation_bus import get_invalidation_bus
+from twitter_api.utils.bitmap import IdBitmap
+from twitter_api.utils.local_state import get_local
+
+FOLLOWERS = "followers"
+FOLLOWING = "following"
+
+
+class FollowSetCache:
+    """
+    LRU of follower and following sets for recently viewed users.
+
+    Sets are loaded lazily with one indexed query, kept in sync with follows
+    made in this worker, and dropped when the invalidation bus reports
+    follows from other workers (or after ``ttl`` seconds without a bus).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.discarded_loads = 0
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, IdBitmap]]" = (
+            OrderedDict()
+        )
+        # Edits per key while a load of it is in flight, and every clear
+        self._generations: Dict[Tuple[str, int], int] = {}
+        self._loading: Dict[Tuple[str, int], int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _bump(self, key: Tuple[str, int]) -> None:
+        if key in self._loading:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _get(self, kind: str, user_id: int) -> IdBitmap:
+        key = (kind, user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            self._loading[key] = self._loading.get(key, 0) + 1
+            generation = (self._epoch, self._generations.get(key, 0))
+
+        if kind == FOLLOWERS:
+            query = db.session.query(Follow.follower_id).filter(
+                Follow.followed_id == user_id
+            )
+        else:
+            query = db.session.query(Follow.followed_id).filter(
+                Follow.follower_id == user_id
+            )
+        try:
+            bitmap = IdBitmap.from_ids(row[0] for row in query.yield_per(50000))
+        except BaseException:
+            with self._lock:
+                self._finish_load(key)
+            raise
+
+        with self._lock:
+            current = (self._epoch, self._generations.get(key, 0))
+            self._finish_load(key)
+            if current != generation:
+                # Edited or invalidated while loading: the rows may predate
+                # it, so serve them to this caller only and reload next time
+                self.discarded_loads += 1
+                return bitmap
+            self._entries[key] = (time.monotonic(), bitmap)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bitmap
+
+    def _finish_load(self, key: Tuple[str, int]) -> None:
+        remaining = self._loading[key] - 1
+        if remaining:
+            self._loading[key] = remaining
+        else:
+            del self._loading[key]
+            self._generations.pop(key, None)
+
+    def followers(self, user_id: int) -> IdBitmap:
+        """IDs of users following ``user_id``."""
+        return self._get(FOLLOWERS, user_id)
+
+    def following(self, user_id: int) -> IdBitmap:
+        """IDs of users ``user_id`` follows."""
+        return self._get(FOLLOWING, user_id)
+
+    def _cached(self, kind: str, user_id: int) -> Optional[IdBitmap]:
+        entry = self._entries.get((kind, user_id))
+        return entry[1] if entry is not None else None
+
+    def record_follow(self, follower_id: int, followed_id: int) -> None:
+        """Apply a committed follow to any cached sets."""
+        with self._lock:
+            self._bump((FOLLOWING, follower_id))
+            self._bump((FOLLOWERS, followed_id))
+            following = self._cached(FOLLOWING, follower_id)
+            if following is not None:
+                following.add(followed_id)
+            followers = self._cached(FOLLOWERS, followed_id)
+            if followers is not None:
+                followers.add(follower_id)
+
+    def record_unfollow(self, follower_id: int, followed_id: int) -> None:
+        """Apply a committed unfollow to any cached sets."""
+        with self._lock:
+            self._bump((FOLLOWING, follower_id))
+            self._bump((FOLLOWERS, followed_id))
+            following = self._cached(FOLLOWING, follower_id)
+            if following is not None:
+                following.discard(followed_id)
+            followers = self._cached(FOLLOWERS, followed_id)
+            if followers is not None:
+                followers.discard(follower_id)
+
+    def invalidate(self, kind: str, user_id: int) -> None:
+        """Drop a cached set; it is reloaded on next use."""
+        with self._lock:
+            self._bump((kind, user_id))
+            self._entries.pop((kind, user_id), None)
+
+    def clear(self) -> None:
+        """Drop every cached set."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Entry count, memory and hit ratio for the metrics endpoint."""
+        with self._lock:
+            bitmaps = [entry[1] for entry in self._entries.values()]
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(bitmaps),
+            "max_entries": self.max_entries,
+            "memory_bytes": sum(bitmap.memory_bytes for bitmap in bitmaps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded_loads": self.discarded_loads,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def get_follow_sets() -> FollowSetCache:
+    """Get this worker's follow set cache."""
+    config = current_app.config
+    bus = get_invalidation_bus()
+
+    def build() -> FollowSetCache:
+        cache = FollowSetCache(
+            config["FOLLOW_SET_CACHE_SIZE"], config["FOLLOW_SET_CACHE_TTL"]
+        )
+        for kind in (FOLLOWERS, FOLLOWING):
+            bus.subscribe(
+                f"follow_sets:{kind}",
+                lambda user_id, kind=kind: cache.invalidate(kind, user_id),
+                cache.clear,
+            )
+        return cache
+
+    return get_local("follow_sets", build)
+
+
+def publish_follow_changes(follower_id: int, followed_ids: Iterable[int]) -> None:
+    """Have other workers reload the sets changed by committed (un)follows."""
+    bus = get_invalidation_bus()
+    bus.publish(f"follow_sets:{FOLLOWING}", [follower_id])
+    bus.publish(f"follow_sets:{FOLLOWERS}", followed_ids)
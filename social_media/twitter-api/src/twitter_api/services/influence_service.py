@@ -0,0 +1,74 @@
+"""Influence service layer - PageRank scores over the follow graph."""
+
+from typing import Dict
+
+import numpy as np
+from sqlalchemy import bindparam, update
+
+from twitter_api.database import db
+from twitter_api.models import User
+from twitter_api.utils.graph import load_follow_graph, pagerank
+
+# Rows written per bulk UPDATE while storing scores
+WRITE_BATCH_SIZE = 10000
+
+
+class InfluenceService:
+    """Service class for user influence scores."""
+
+    @staticmethod
+    def refresh_influence_scores(
+        damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100
+    ) -> Dict:
+        """
+        Recompute every user's influence score.
+
+        The stored scores warm-start the power iteration, so a run after a
+        small change to the graph converges in a few iterations.
+
+        Args:
+            damping: PageRank damping factor
+            tol: L1 convergence tolerance
+            max_iter: Iteration cap
+
+        Returns:
+            Dict with users, edges, and iterations counts
+        """
+        graph = load_follow_graph()
+        size = len(graph.user_ids)
+
+        previous = np.zeros(size)
+        for user_id, score in db.session.query(User.id, User.influence_score):
+            position = graph.index.get(user_id)
+            if position is not None:
+                previous[position] = score or 0.0
+
+        scores, iterations = pagerank(graph, damping, tol, max_iter, previous)
+        # Store scaled so the average user scores 1.0
+        scaled = scores * size
+
+        users = User.__table__
+        statement = (
+            update(users)
+            .where(users.c.id == bindparam("user_id"))
+            # Keep updated_at: a score refresh is not a profile edit
+            .values(influence_score=bindparam("score"), updated_at=users.c.updated_at)
+        )
+        for start in range(0, size, WRITE_BATCH_SIZE):
+            stop = start + WRITE_BATCH_SIZE
+            db.session.execute(
+                statement,
+                [
+                    {"user_id": int(user_id), "score": float(score)}
+                    for user_id, score in zip(
+                        graph.user_ids[start:stop], scaled[start:stop]
+                    )
+                ],
+            )
+        db.session.commit()
+
+        return {
+            "users": size,
+            "edges": graph.num_edges,
+            "iterations": iterations,
+        }
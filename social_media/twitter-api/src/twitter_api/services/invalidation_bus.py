@@ -0,0 +1,344 @@
+"""Cross-worker cache invalidation: batched, sequenced messages between workers."""
+
+import json
+import os
+import socket
+import threading
+import uuid
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from flask import current_app
+
+from twitter_api.utils.local_state import get_local
+
+# Bumped when the message format changes; a worker receiving another version
+# cannot trust the keys and flushes everything it subscribed to instead
+PROTOCOL_VERSION = 1
+
+# Keys per namespace per message; keeps datagrams well under socket limits
+MAX_KEYS_PER_MESSAGE = 1000
+
+MAX_DATAGRAM = 1 << 20
+
+
+class LocalTransport:
+    """
+    Delivers messages to the other buses on the same channel in this process.
+
+    Stand-in for a real transport in tests and single-process setups.
+    """
+
+    _channels: Dict[str, List["LocalTransport"]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._on_message: Optional[Callable[[bytes], None]] = None
+
+    def start(self, on_message: Callable[[bytes], None]) -> None:
+        self._on_message = on_message
+        with self._lock:
+            self._channels.setdefault(self.channel, []).append(self)
+
+    def send(self, data: bytes) -> None:
+        with self._lock:
+            peers = [t for t in self._channels.get(self.channel, []) if t is not self]
+        for peer in peers:
+            peer._on_message(data)
+
+    def close(self) -> None:
+        with self._lock:
+            peers = self._channels.get(self.channel, [])
+            if self in peers:
+                peers.remove(self)
+
+
+class UnixSocketTransport:
+    """
+    Datagram sockets in a shared directory, one per worker on the host.
+
+    Each worker binds ``<directory>/<pid>-<random>.sock`` and sends every
+    message to all the other sockets there. Sends never block: a datagram
+    that does not fit a peer's buffer is dropped, and the peer notices the
+    gap in sequence numbers. Sockets of workers that exited are removed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path: Optional[str] = None
+        self.dropped = 0
+        self._sock: Optional[socket.socket] = None
+        self._out: Optional[socket.socket] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_message: Callable[[bytes], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(
+            self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        )
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(0.2)
+        self._out = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._out.setblocking(False)
+
+        def receive() -> None:
+            while not self._stopped.is_set():
+                try:
+                    data = self._sock.recv(MAX_DATAGRAM)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+                on_message(data)
+
+        self._thread = threading.Thread(
+            target=receive, name="invalidation-bus-recv", daemon=True
+        )
+        self._thread.start()
+
+    def send(self, data: bytes) -> None:
+        for name in os.listdir(self.directory):
+            peer = os.path.join(self.directory, name)
+            if not name.endswith(".sock") or peer == self.path:
+                continue
+            try:
+                self._out.sendto(data, peer)
+            except ConnectionRefusedError:
+                # Nobody bound to it any more
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except OSError:
+                self.dropped += 1
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        for sock in (self._sock, self._out):
+            if sock is not None:
+                sock.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class _Subscription:
+    __slots__ = ("drop", "flush")
+
+    def __init__(self, drop: Callable[[Hashable], None], flush: Callable[[], None]):
+        self.drop = drop
+        self.flush = flush
+
+
+class InvalidationBus:
+    """
+    Publishes invalidated cache keys to other workers and applies theirs.
+
+    Caches ``subscribe`` a namespace with a per-key ``drop`` and a ``flush``
+    of everything. Services ``publish`` keys after committing; keys are
+    collected for ``window_ms`` and sent as one message. Every message
+    carries the sender's running sequence number per namespace, so a
+    receiver that sees a number skip (a lost datagram) flushes that
+    namespace. Idle senders repeat their numbers every ``heartbeat`` seconds
+    so a lost last message is noticed too.
+
+    Without a transport, ``publish`` does nothing.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        window_ms: float = 5,
+        heartbeat: float = 5,
+        background: bool = True,
+    ):
+        self.transport = transport
+        self.window = window_ms / 1000
+        self.heartbeat = heartbeat
+        self.origin = uuid.uuid4().hex
+        self.published = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.keys_applied = 0
+        self.gap_flushes = 0
+        self.version_flushes = 0
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        self._pending: Dict[str, Set[Hashable]] = {}
+        self._sequences: Dict[str, int] = {}
+        # origin -> namespace -> last sequence number seen
+        self._seen: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        if transport is not None:
+            transport.start(self._receive)
+            if background:
+                self._thread = threading.Thread(
+                    target=self._run, name="invalidation-bus", daemon=True
+                )
+                self._thread.start()
+
+    def subscribe(
+        self,
+        namespace: str,
+        drop: Callable[[Hashable], None],
+        flush: Callable[[], None],
+    ) -> None:
+        """Apply other workers' invalidations in ``namespace`` to a cache."""
+        with self._lock:
+            self._subscriptions.setdefault(namespace, []).append(
+                _Subscription(drop, flush)
+            )
+
+    def publish(self, namespace: str, keys: Iterable[Hashable]) -> None:
+        """Queue keys this worker invalidated after a commit."""
+        if self.transport is None:
+            return
+        keys = list(keys)
+        if not keys:
+            return
+        with self._lock:
+            self._pending.setdefault(namespace, set()).update(keys)
+            self.published += len(keys)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if self._wake.wait(self.heartbeat):
+                # Gather what the rest of the window brings
+                self._stopped.wait(self.window)
+                self._wake.clear()
+                self.flush()
+            else:
+                self._send({})
+
+    def flush(self) -> None:
+        """Send everything queued now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        events = {
+            namespace: sorted(keys, key=repr) for namespace, keys in pending.items()
+        }
+        while events:
+            chunk = {ns: keys[:MAX_KEYS_PER_MESSAGE] for ns, keys in events.items()}
+            self._send(chunk)
+            events = {
+                ns: keys[MAX_KEYS_PER_MESSAGE:]
+                for ns, keys in events.items()
+                if len(keys) > MAX_KEYS_PER_MESSAGE
+            }
+
+    def _send(self, events: Dict[str, List[Hashable]]) -> None:
+        with self._send_lock:
+            for namespace in events:
+                self._sequences[namespace] = self._sequences.get(namespace, 0) + 1
+            message = {
+                "v": PROTOCOL_VERSION,
+                "origin": self.origin,
+                "seq": dict(self._sequences),
+                "events": events,
+            }
+            self.transport.send(json.dumps(message).encode())
+            self.messages_sent += 1
+
+    def _receive(self, data: bytes) -> None:
+        try:
+            message = json.loads(data)
+            version = message.get("v")
+        except (ValueError, AttributeError):
+            version = None
+
+        flushes: List[str] = []
+        drops: Dict[str, List[Hashable]] = {}
+        with self._lock:
+            if version != PROTOCOL_VERSION:
+                self.version_flushes += 1
+                flushes = list(self._subscriptions)
+            elif message["origin"] != self.origin:
+                self.messages_received += 1
+                events = message["events"]
+                seen = self._seen.get(message["origin"])
+                self._seen[message["origin"]] = dict(message["seq"])
+                for namespace, sequence in message["seq"].items():
+                    if seen is not None:
+                        expected = seen.get(namespace, 0) + (namespace in events)
+                        if sequence > expected:
+                            # Lost at least one message for this namespace
+                            self.gap_flushes += 1
+                            flushes.append(namespace)
+                            continue
+                    if namespace in events:
+                        drops[namespace] = events[namespace]
+                        self.keys_applied += len(events[namespace])
+            subscriptions = {
+                namespace: list(self._subscriptions.get(namespace, []))
+                for namespace in [*flushes, *drops]
+            }
+
+        for namespace in flushes:
+            for subscription in subscriptions[namespace]:
+                subscription.flush()
+        for namespace, keys in drops.items():
+            for subscription in subscriptions[namespace]:
+                for key in keys:
+                    subscription.drop(key)
+
+    def stats(self) -> Dict:
+        """Message counts for the metrics endpoint."""
+        return {
+            "transport": type(self.transport).__name__ if self.transport else None,
+            "published": self.published,
+            "messages_sent": self.messages_sent,
+            "messages_received": self.messages_received,
+            "keys_applied": self.keys_applied,
+            "gap_flushes": self.gap_flushes,
+            "version_flushes": self.version_flushes,
+            "peers": len(self._seen),
+            "dropped": getattr(self.transport, "dropped", 0),
+        }
+
+    def close(self) -> None:
+        """Send what is queued, stop the sender and release the transport."""
+        if self.transport is None:
+            return
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self.transport.close()
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get this worker's invalidation bus."""
+    config = current_app.config
+
+    def build() -> InvalidationBus:
+        url = config["INVALIDATION_BUS_URL"]
+        if url.startswith("unix://"):
+            transport = UnixSocketTransport(url[len("unix://") :])
+        elif url.startswith("local://"):
+            transport = LocalTransport(url[len("local://") :])
+        else:
+            transport = None
+        return InvalidationBus(
+            transport,
+            config["INVALIDATION_BUS_WINDOW_MS"],
+            config["INVALIDATION_BUS_HEARTBEAT"],
+        )
+
+    return get_local("invalidation_bus", build)
+
+
+def publish(namespace: str, keys: Iterable[Hashable]) -> None:
+    """Tell other workers to drop ``keys`` from their ``namespace`` caches."""
+    get_invalidation_bus().publish(namespace, keys)
@@ -0,0 +1,63 @@
+"""Per-worker cache of the tweet/follower/following counts on user profiles."""
+
+from typing import Dict, Iterable
+
+from flask import current_app
+
+from twitter_api.models import Follow, Tweet
+from twitter_api.services.invalidation_bus import get_invalidation_bus
+from twitter_api.utils.cache import LoadingCache
+from twitter_api.utils.local_state import get_local
+
+# Invalidation bus namespace; keys are user IDs
+NAMESPACE = "profile_counts"
+
+
+def get_profile_counts_cache() -> LoadingCache:
+    """Get this worker's profile counts cache."""
+    config = current_app.config
+    bus = get_invalidation_bus()
+
+    def build() -> LoadingCache:
+        cache = LoadingCache(
+            config["PROFILE_COUNTS_CACHE_SIZE"],
+            config["PROFILE_COUNTS_CACHE_TTL"],
+            config["CACHE_EARLY_REFRESH_BETA"],
+            config["CACHE_LOAD_TIMEOUT"],
+        )
+        bus.subscribe(NAMESPACE, cache.delete, cache.clear)
+        return cache
+
+    return get_local("profile_counts", build)
+
+
+def _count(user_id: int) -> Dict:
+    return {
+        "tweet_count": Tweet.query.filter_by(user_id=user_id).count(),
+        "followers_count": Follow.query.filter_by(followed_id=user_id).count(),
+        "following_count": Follow.query.filter_by(follower_id=user_id).count(),
+    }
+
+
+def load_profile_counts(user_id: int) -> Dict:
+    """
+    Tweet, follower and following counts for a profile.
+
+    Concurrent requests for the same profile share one set of COUNT queries,
+    and popular profiles are recounted shortly before their entry expires.
+
+    Returns:
+        Dict with ``tweet_count``, ``followers_count`` and ``following_count``
+    """
+    return dict(
+        get_profile_counts_cache().get_or_load(user_id, lambda: _count(user_id))
+    )
+
+
+def invalidate_profile_counts(user_ids: Iterable[int]) -> None:
+    """Drop cached counts, here and in other workers, after a commit."""
+    user_ids = list(user_ids)
+    cache = get_profile_counts_cache()
+    for user_id in user_ids:
+        cache.delete(user_id)
+    get_invalidation_bus().publish(NAMESPACE, user_ids)
@@ -0,0 +1,388 @@
+"""Similarity service layer - "similar accounts" from follower-set MinHash."""
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, insert, or_
+
+from twitter_api.database import db, insert_ignore
+from twitter_api.models import Follow, FollowerSignature, SignatureBand, User
+from twitter_api.utils import minhash
+from twitter_api.utils.graph import load_follow_graph
+
+# Candidates scored per request; bounds work for users in crowded buckets
+MAX_CANDIDATES = 1000
+
+# Rows written per INSERT while rebuilding all signatures
+WRITE_BATCH_SIZE = 10000
+
+# Stale signatures recomputed per transaction by refresh_stale
+REFRESH_BATCH_SIZE = 100
+
+
+class SimilarityService:
+    """Service class for similar-account lookups."""
+
+    @staticmethod
+    def _write_bands(
+        user_id: int, sig: np.ndarray, previous: Optional[np.ndarray] = None
+    ):
+        """
+        Point a user's LSH bands at ``sig`` in the current transaction.
+
+        With the ``previous`` signature only the bands whose bucket moved
+        are rewritten; without it all of the user's bands are replaced.
+        """
+        buckets = {}
+        if not minhash.is_empty(sig):
+            buckets = dict(enumerate(minhash.band_buckets(sig)))
+        delete = SignatureBand.query.filter(SignatureBand.user_id == user_id)
+        if previous is not None:
+            old = {}
+            if not minhash.is_empty(previous):
+                old = dict(enumerate(minhash.band_buckets(previous)))
+            changed = [
+                band
+                for band in range(minhash.BANDS)
+                if buckets.get(band) != old.get(band)
+            ]
+            if not changed:
+                return
+            buckets = {band: buckets[band] for band in changed if band in buckets}
+            delete = delete.filter(SignatureBand.band.in_(changed))
+        delete.delete(synchronize_session=False)
+        if buckets:
+            db.session.execute(
+                insert(SignatureBand),
+                [
+                    {"band": band, "bucket": bucket, "user_id": user_id}
+                    for band, bucket in buckets.items()
+                ],
+            )
+
+    @staticmethod
+    def _write_if_unchanged(user_id: int, version: datetime, values: Dict) -> bool:
+        """
+        Update a signature row unless another write moved ``updated_at``.
+
+        Every signature write bumps ``updated_at``, so it serves as the
+        row's version and no row lock is held while computing ``values``.
+        """
+        values = dict(values, updated_at=datetime.utcnow())
+        updated = FollowerSignature.query.filter(
+            FollowerSignature.user_id == user_id,
+            FollowerSignature.updated_at == version,
+        ).update(values, synchronize_session=False)
+        return bool(updated)
+
+    @staticmethod
+    def refresh_signature(user_id: int) -> bool:
+        """
+        Recompute a user's signature from their full follower list.
+
+        Nothing is written, and False returned, when the user has no
+        signature row or a follow or unfollow changed it meanwhile. Changes
+        are flushed but not committed.
+        """
+        version = (
+            db.session.query(FollowerSignature.updated_at)
+            .filter(FollowerSignature.user_id == user_id)
+            .scalar()
+        )
+        if version is None:
+            return False
+        followers = db.session.query(Follow.follower_id).filter(
+            Follow.followed_id == user_id
+        )
+        sig = minhash.signature(row[0] for row in followers.yield_per(50000))
+        if not SimilarityService._write_if_unchanged(
+            user_id, version, {"signature": minhash.to_bytes(sig)}
+        ):
+            return False
+        SimilarityService._write_bands(user_id, sig)
+        db.session.flush()
+        return True
+
+    @staticmethod
+    def _add_placeholders(user_ids: Iterable[int]) -> None:
+        """Insert empty, stale signatures for users without one."""
+        empty = minhash.to_bytes(minhash.empty_signature())
+        db.session.execute(
+            insert_ignore(
+                FollowerSignature,
+                [
+                    {"user_id": user_id, "signature": empty, "stale": True}
+                    for user_id in sorted(user_ids)
+                ],
+            )
+        )
+
+    @staticmethod
+    def add_follower(follower_id: int, user_ids: Iterable[int]) -> None:
+        """
+        Fold a new follower into the signatures of ``user_ids``.
+
+        Runs inside the caller's transaction. MinHash keeps the element-wise
+        minimum, so a follow is applied in place with ``add_to_signature``
+        and only the bands whose bucket moved are rewritten. A row is written
+        only when one of its minimums drops, which for an account with n
+        followers happens about ``NUM_PERM / n`` of the time, so follows of a
+        popular account rarely touch its row. If another write changed the
+        row since it was read, it is marked stale instead.
+
+        Users without a signature get one from this follower alone, marked
+        stale in case earlier followers predate the signature.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        rows = {
+            user_id: (signature, version)
+            for user_id, signature, version in db.session.query(
+                FollowerSignature.user_id,
+                FollowerSignature.signature,
+                FollowerSignature.updated_at,
+            ).filter(FollowerSignature.user_id.in_(user_ids))
+        }
+        missing = user_ids - rows.keys()
+        if missing:
+            SimilarityService._add_placeholders(missing)
+            rows.update(
+                (user_id, (signature, version))
+                for user_id, signature, version in db.session.query(
+                    FollowerSignature.user_id,
+                    FollowerSignature.signature,
+                    FollowerSignature.updated_at,
+                ).filter(FollowerSignature.user_id.in_(missing))
+            )
+
+        conflicts = []
+        for user_id, (stored, version) in rows.items():
+            previous = minhash.from_bytes(stored)
+            sig = minhash.add_to_signature(previous, follower_id)
+            if np.array_equal(sig, previous):
+                continue
+            if SimilarityService._write_if_unchanged(
+                user_id, version, {"signature": minhash.to_bytes(sig)}
+            ):
+                SimilarityService._write_bands(user_id, sig, previous)
+            else:
+                conflicts.append(user_id)
+        if conflicts:
+            FollowerSignature.query.filter(
+                FollowerSignature.user_id.in_(conflicts)
+            ).update(
+                {"stale": True, "updated_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+
+    @staticmethod
+    def mark_stale(user_ids: Iterable[int]) -> None:
+        """
+        Queue the signatures of users who lost followers.
+
+        MinHash cannot drop a member in place, so ``refresh_stale`` recomputes
+        them later. Runs inside the caller's transaction. Signatures that are
+        already stale are only read, so unfollows of a popular account do not
+        queue up on its row. Users without a signature get an empty, stale
+        one.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        stale = dict(
+            db.session.query(FollowerSignature.user_id, FollowerSignature.stale)
+            .filter(FollowerSignature.user_id.in_(user_ids))
+            .all()
+        )
+        fresh = [user_id for user_id, is_stale in stale.items() if not is_stale]
+        if fresh:
+            FollowerSignature.query.filter(
+                FollowerSignature.user_id.in_(fresh),
+                FollowerSignature.stale.is_(False),
+            ).update(
+                {"stale": True, "updated_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+        missing = user_ids - stale.keys()
+        if missing:
+            SimilarityService._add_placeholders(missing)
+
+    @staticmethod
+    def refresh_stale(limit: Optional[int] = None) -> Dict:
+        """
+        Recompute signatures marked stale by unfollows.
+
+        Each batch clears the flags and commits before reading followers.
+        A signature changed meanwhile by a follow or unfollow is not
+        overwritten; it is marked stale again for the next run.
+
+        Args:
+            limit: Maximum signatures recomputed (default: all stale ones)
+
+        Returns:
+            Dict with the refreshed count
+        """
+        refreshed = 0
+        attempted: List[int] = []
+        while limit is None or len(attempted) < limit:
+            size = REFRESH_BATCH_SIZE
+            if limit is not None:
+                size = min(size, limit - len(attempted))
+            user_ids = [
+                row[0]
+                for row in db.session.query(FollowerSignature.user_id)
+                .filter(
+                    FollowerSignature.stale.is_(True),
+                    FollowerSignature.user_id.notin_(attempted),
+                )
+                .order_by(FollowerSignature.updated_at)
+                .limit(size)
+            ]
+            if not user_ids:
+                break
+            attempted.extend(user_ids)
+
+            FollowerSignature.query.filter(
+                FollowerSignature.user_id.in_(user_ids)
+            ).update(
+                {"stale": False, "updated_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+            db.session.commit()
+
+            changed = []
+            for user_id in user_ids:
+                if SimilarityService.refresh_signature(user_id):
+                    refreshed += 1
+                else:
+                    changed.append(user_id)
+            if changed:
+                FollowerSignature.query.filter(
+                    FollowerSignature.user_id.in_(changed)
+                ).update(
+                    {"stale": True, "updated_at": datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            db.session.commit()
+
+        return {"refreshed": refreshed}
+
+    @staticmethod
+    def rebuild_all() -> Dict:
+        """
+        Recompute every user's signature and bands from the follow graph.
+
+        Returns:
+            Dict with users and stored signature counts
+        """
+        graph = load_follow_graph()
+        followers_by_column = graph.matrix.tocsc()
+
+        SignatureBand.query.delete(synchronize_session=False)
+        FollowerSignature.query.delete(synchronize_session=False)
+
+        signatures: List[Dict] = []
+        bands: List[Dict] = []
+        stored = 0
+        for position, user_id in enumerate(graph.user_ids):
+            begin = followers_by_column.indptr[position]
+            end = followers_by_column.indptr[position + 1]
+            if begin == end:
+                continue
+
+            user_id = int(user_id)
+            follower_ids = graph.user_ids[followers_by_column.indices[begin:end]]
+            sig = minhash.signature(follower_ids)
+            signatures.append(
+                {"user_id": user_id, "signature": minhash.to_bytes(sig), "stale": False}
+            )
+            bands.extend(
+                {"band": band, "bucket": bucket, "user_id": user_id}
+                for band, bucket in enumerate(minhash.band_buckets(sig))
+            )
+            stored += 1
+
+            if len(bands) >= WRITE_BATCH_SIZE:
+                db.session.execute(insert(FollowerSignature), signatures)
+                db.session.execute(insert(SignatureBand), bands)
+                signatures, bands = [], []
+
+        if signatures:
+            db.session.execute(insert(FollowerSignature), signatures)
+            db.session.execute(insert(SignatureBand), bands)
+        db.session.commit()
+
+        return {"users": len(graph.user_ids), "signatures": stored}
+
+    @staticmethod
+    def get_similar_accounts(user_id: int, limit: int = 20) -> List[Dict]:
+        """
+        Get accounts whose follower sets overlap most with ``user_id``'s.
+
+        Candidates come from shared LSH buckets, so only accounts likely to be
+        similar are scored rather than every user. Follows are folded in as
+        they happen; signatures that lost followers since the last
+        ``refresh_stale`` run are used as stored.
+
+        Args:
+            user_id: ID of the profile user
+            limit: Maximum number of accounts returned
+
+        Returns:
+            List of user dicts with an estimated ``similarity``, best first
+        """
+        limit = min(limit, 100)
+
+        # Read-only: stale signatures are used as they are until the batch
+        # job recomputes them
+        row = db.session.get(FollowerSignature, user_id)
+        if row is None:
+            return []
+        sig = minhash.from_bytes(row.signature)
+        if minhash.is_empty(sig):
+            return []
+
+        bucket_filter = or_(
+            *[
+                and_(SignatureBand.band == band, SignatureBand.bucket == bucket)
+                for band, bucket in enumerate(minhash.band_buckets(sig))
+            ]
+        )
+        # Accounts sharing the most bands are the likeliest to be similar
+        shared_bands = func.count(SignatureBand.band)
+        candidate_ids = [
+            candidate_id
+            for candidate_id, _ in db.session.query(
+                SignatureBand.user_id, shared_bands
+            )
+            .filter(bucket_filter, SignatureBand.user_id != user_id)
+            .group_by(SignatureBand.user_id)
+            .order_by(shared_bands.desc(), SignatureBand.user_id)
+            .limit(MAX_CANDIDATES)
+        ]
+        if not candidate_ids:
+            return []
+
+        scored = []
+        for candidate in FollowerSignature.query.filter(
+            FollowerSignature.user_id.in_(candidate_ids)
+        ).all():
+            candidate_sig = minhash.from_bytes(candidate.signature)
+            similarity = minhash.estimate_jaccard(sig, candidate_sig)
+            if similarity > 0:
+                scored.append((similarity, candidate.user_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        scored = scored[:limit]
+
+        users = {
+            user.id: user
+            for user in User.query.filter(User.id.in_([uid for _, uid in scored]))
+        }
+        similar = []
+        for similarity, candidate_id in scored:
+            user_dict = users[candidate_id].to_dict()
+            user_dict["similarity"] = round(similarity, 4)
+            similar.append(user_dict)
+        return similar
@@ -0,0 +1,110 @@
+"""Suggestion service layer - "who to follow" ranking and reads."""
+
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import and_, insert
+
+from twitter_api.database import db
+from twitter_api.models import Follow, FollowSuggestion, User
+from twitter_api.utils.graph import friends_of_friends, load_follow_graph
+
+# Rows written per INSERT while storing precomputed suggestions
+WRITE_BATCH_SIZE = 10000
+
+
+class SuggestionService:
+    """Service class for follow suggestions."""
+
+    @staticmethod
+    def refresh_suggestions(limit_per_user: int = 20) -> Dict:
+        """
+        Recompute follow suggestions for every user.
+
+        Ranks candidates with a sparse two-hop product over the whole follow
+        graph and replaces the stored suggestions in one transaction.
+
+        Args:
+            limit_per_user: Maximum suggestions stored per user
+
+        Returns:
+            Dict with users, edges, and stored suggestion counts
+        """
+        graph = load_follow_graph()
+        now = datetime.utcnow()
+
+        FollowSuggestion.query.delete(synchronize_session=False)
+
+        stored = 0
+        rows: List[Dict] = []
+        for user_id, candidates in friends_of_friends(graph, limit_per_user):
+            rows.extend(
+                {
+                    "user_id": user_id,
+                    "candidate_id": candidate_id,
+                    "score": score,
+                    "created_at": now,
+                }
+                for candidate_id, score in candidates
+            )
+            if len(rows) >= WRITE_BATCH_SIZE:
+                db.session.execute(insert(FollowSuggestion), rows)
+                stored += len(rows)
+                rows = []
+
+        if rows:
+            db.session.execute(insert(FollowSuggestion), rows)
+            stored += len(rows)
+
+        db.session.commit()
+
+        return {
+            "users": len(graph.user_ids),
+            "edges": graph.num_edges,
+            "suggestions": stored,
+        }
+
+    @staticmethod
+    def get_suggestions(user_id: int, limit: int = 20) -> List[Dict]:
+        """
+        Get precomputed follow suggestions for a user.
+
+        Candidates followed since the last refresh are filtered out.
+
+        Args:
+            user_id: ID of the user asking for suggestions
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of user dicts with a ``mutual_count`` field, best first
+        """
+        limit = min(limit, 100)
+
+        already_following = (
+            db.session.query(Follow.followed_id)
+            .filter(
+                and_(
+                    Follow.follower_id == user_id,
+                    Follow.followed_id == FollowSuggestion.candidate_id,
+                )
+            )
+            .exists()
+        )
+
+        rows = (
+            db.session.query(User, FollowSuggestion.score)
+            .join(FollowSuggestion, FollowSuggestion.candidate_id == User.id)
+            .filter(FollowSuggestion.user_id == user_id, ~already_following)
+            .order_by(
+                FollowSuggestion.score.desc(), User.influence_score.desc(), User.id
+            )
+            .limit(limit)
+            .all()
+        )
+
+        suggestions = []
+        for user, score in rows:
+            user_dict = user.to_dict()
+            user_dict["mutual_count"] = score
+            suggestions.append(user_dict)
+        return suggestions
@@ -0,0 +1,215 @@
+"""Revoked-token list checked on every authenticated request."""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from twitter_api.database import db, insert_ignore
+from twitter_api.models import RevokedToken
+from twitter_api.utils.bloom import BloomFilter
+from twitter_api.utils.local_state import get_local
+
+# Smallest filter built; grows by doubling as revocations accumulate
+MIN_CAPACITY = 1024
+
+# Re-read this much before the last sync so rows committed slightly out of
+# order by other workers are not missed (adds are idempotent)
+SYNC_OVERLAP = timedelta(seconds=2)
+
+# (jti, expiry as a UNIX timestamp)
+Revocation = Tuple[str, float]
+
+
+class DatabaseRevocationBackend:
+    """Revocations shared by every worker through the ``revoked_tokens`` table."""
+
+    shared = True
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """
+        Store a revocation; revoking twice is a no-op.
+
+        Rows for tokens that have expired anyway are purged in the same
+        transaction, so the table only holds live revocations.
+        """
+        RevokedToken.query.filter(RevokedToken.expires_at <= datetime.utcnow()).delete(
+            synchronize_session=False
+        )
+        row = {
+            "jti": jti,
+            "expires_at": datetime.utcfromtimestamp(expires_at),
+            "revoked_at": datetime.utcnow(),
+        }
+        db.session.execute(insert_ignore(RevokedToken, [row]))
+        db.session.commit()
+
+    def revoked_since(self, since: Optional[datetime]) -> List[Revocation]:
+        """Unexpired revocations made at or after ``since`` (all when None)."""
+        query = db.session.query(RevokedToken.jti, RevokedToken.expires_at).filter(
+            RevokedToken.expires_at > datetime.utcnow()
+        )
+        if since is not None:
+            query = query.filter(RevokedToken.revoked_at >= since - SYNC_OVERLAP)
+        return [
+            (jti, (expires_at - datetime(1970, 1, 1)).total_seconds())
+            for jti, expires_at in query
+        ]
+
+
+class MemoryRevocationBackend:
+    """Process-local stand-in for the shared backend (tests, single worker)."""
+
+    shared = False
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Store a revocation, dropping expired ones."""
+        now = time.time()
+        for expired in [key for key, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[expired]
+        self._revoked[jti] = expires_at
+
+    def revoked_since(self, since: Optional[datetime]) -> List[Revocation]:
+        """Every unexpired revocation."""
+        now = time.time()
+        return [(jti, exp) for jti, exp in self._revoked.items() if exp > now]
+
+
+class RevocationList:
+    """
+    In-memory view of revoked token IDs with a Bloom pre-check.
+
+    Lookups never touch the backend: almost every token misses the Bloom
+    filter, and the rest are confirmed against an exact ``jti -> exp`` map.
+    Revocations from other workers are pulled in every ``sync_seconds``;
+    entries drop out once their token expires. A failed sync (e.g. the
+    ``revoked_tokens`` table has not been migrated yet) is logged, counted
+    in ``sync_errors`` and retried next interval; lookups meanwhile use the
+    revocations already held.
+    """
+
+    def __init__(self, backend, sync_seconds: float, error_rate: float = 0.001):
+        self.backend = backend
+        self.sync_seconds = sync_seconds
+        self.error_rate = error_rate
+        self.checks = 0
+        self.bloom_negatives = 0
+        self.syncs = 0
+        self.sync_errors = 0
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(MIN_CAPACITY, error_rate)
+        self._synced_at: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def _add_local(self, revocations: Iterable[Revocation]) -> None:
+        for jti, expires_at in revocations:
+            if jti in self._revoked:
+                continue
+            self._revoked[jti] = expires_at
+            if self._bloom.count >= self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+            self._bloom.add(jti.encode())
+
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity, self.error_rate)
+        for jti in self._revoked:
+            bloom.add(jti.encode())
+        self._bloom = bloom
+
+    def _sync(self) -> None:
+        started = datetime.utcnow()
+        try:
+            revocations = self.backend.revoked_since(self._synced_at)
+        except SQLAlchemyError:
+            db.session.rollback()
+            self.sync_errors += 1
+            self._next_sync = time.monotonic() + self.sync_seconds
+            current_app.logger.exception("Revoked-token sync failed")
+            return
+
+        now = time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        if expired:
+            # Bloom filters cannot delete; start over from the live entries
+            self._rebuild(max(MIN_CAPACITY, len(self._revoked) * 2))
+        self._add_local(revocations)
+
+        self._synced_at = started
+        self._next_sync = time.monotonic() + self.sync_seconds
+        self.syncs += 1
+
+    def _maybe_sync(self) -> None:
+        if time.monotonic() >= self._next_sync:
+            with self._lock:
+                if time.monotonic() >= self._next_sync:
+                    self._sync()
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Revoke a token in the backend and in this worker immediately."""
+        self.backend.add(jti, expires_at)
+        with self._lock:
+            self._add_local([(jti, expires_at)])
+
+    def is_revoked(self, jti: str) -> bool:
+        """True when the token ID has been revoked and has not yet expired."""
+        self._maybe_sync()
+        self.checks += 1
+        if jti.encode() not in self._bloom:
+            self.bloom_negatives += 1
+            return False
+        expires_at = self._revoked.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def stats(self) -> Dict:
+        """Size and lookup report for the metrics endpoint."""
+        return {
+            "backend": "database" if self.backend.shared else "memory",
+            "revoked": len(self._revoked),
+            "checks": self.checks,
+            "bloom_negatives": self.bloom_negatives,
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "bloom_memory_bytes": self._bloom.memory_bytes,
+        }
+
+
+def get_revocation_list() -> RevocationList:
+    """Get this worker's revocation list."""
+    config = current_app.config
+
+    def build():
+        if config["TOKEN_REVOCATION_BACKEND"] == "memory":
+            backend = MemoryRevocationBackend()
+        else:
+            backend = DatabaseRevocationBackend()
+        return RevocationList(backend, config["TOKEN_REVOCATION_SYNC_SECONDS"])
+
+    return get_local("token_revocations", build)
+
+
+def revoke_token(claims: Dict) -> bool:
+    """
+    Revoke the token behind verified ``claims`` until it expires.
+
+    Returns:
+        False for tokens issued without a ``jti`` (they cannot be revoked)
+    """
+    if "jti" not in claims:
+        return False
+    get_revocation_list().revoke(claims["jti"], float(claims["exp"]))
+    return True
+
+
+def is_token_revoked(claims: Dict) -> bool:
+    """True when verified ``claims`` belong to a revoked token."""
+    jti = claims.get("jti")
+    return jti is not None and get_revocation_list().is_revoked(jti)
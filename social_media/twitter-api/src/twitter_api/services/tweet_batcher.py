@@ -0,0 +1,222 @@
+"""Group commit for tweet creation: many requests, one INSERT, one commit."""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Dict, List
+
+from flask import Flask, current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from twitter_api.database import FOREIGN_KEY_VIOLATION, constraint_violation, db
+from twitter_api.models import Tweet
+from twitter_api.services.entity_cache import TWEET, get_entity_cache
+from twitter_api.services.profile_counts import invalidate_profile_counts
+from twitter_api.utils.load_shedding import ServerBusy
+from twitter_api.utils.local_state import get_local
+from twitter_api.utils.snowflake import next_tweet_id
+
+
+class TweetBatcherBusy(ServerBusy):
+    """Raised when the write queue is full; the tweet was not queued."""
+
+
+class PendingTweet:
+    """A queued tweet and the futures its request waits on."""
+
+    __slots__ = ("row", "username", "assigned", "committed")
+
+    def __init__(self, row: Dict, username: str):
+        self.row = row
+        self.username = username
+        # Resolved with (tweet_dict, None) as soon as the tweet is queued; its
+        # Snowflake ID is assigned up front
+        self.assigned: Future = Future()
+        self.assigned.set_result((self.result(), None))
+        # Resolved with (tweet_dict, error) once the batch committed
+        self.committed: Future = Future()
+
+    def result(self) -> Dict:
+        row = self.row
+        return {
+            "id": row["id"],
+            "id_str": str(row["id"]),
+            "content": row["content"],
+            "user_id": row["user_id"],
+            "username": self.username,
+            "created_at": row["created_at"].isoformat(),
+            "updated_at": row["updated_at"].isoformat(),
+        }
+
+    def fail(self, error: str) -> None:
+        if not self.committed.done():
+            self.committed.set_result((None, error))
+
+
+class TweetBatcher:
+    """
+    Collects tweets for up to ``window_ms`` and writes them together.
+
+    A background thread drains the queue: the first tweet opens a batch,
+    which closes after ``window_ms`` or ``max_batch`` tweets. IDs are
+    assigned on submit, so the batch is written as one executemany INSERT and
+    one commit. If the INSERT fails (e.g. an unknown user), rows are retried
+    one by one under savepoints so only the offending requests get an error.
+    """
+
+    def __init__(self, app: Flask, window_ms: float, max_batch: int, max_queue: int):
+        self.app = app
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.tweets = 0
+        self.commit_seconds_total = 0.0
+        self._queue: "queue.Queue[PendingTweet]" = queue.Queue(max_queue)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="tweet-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, user_id: int, username: str, content: str) -> PendingTweet:
+        """
+        Queue a validated tweet.
+
+        Raises:
+            TweetBatcherBusy: If the queue is full
+        """
+        now = datetime.utcnow()
+        pending = PendingTweet(
+            {
+                "id": next_tweet_id(),
+                "content": content,
+                "user_id": user_id,
+                "created_at": now,
+                "updated_at": now,
+            },
+            username,
+        )
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full:
+            raise TweetBatcherBusy()
+        return pending
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            with self.app.app_context():
+                self._write(batch)
+
+        # Write whatever was accepted before close()
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            with self.app.app_context():
+                self._write(leftover)
+
+    def _write(self, batch: List[PendingTweet]) -> None:
+        try:
+            try:
+                db.session.execute(insert(Tweet), [pending.row for pending in batch])
+                written = batch
+            except IntegrityError:
+                db.session.rollback()
+                written = self._write_one_by_one(batch)
+
+            started = time.perf_counter()
+            db.session.commit()
+            self.commit_seconds_total += time.perf_counter() - started
+            self.batches += 1
+            self.tweets += len(written)
+        except Exception as e:
+            db.session.rollback()
+            db.session.remove()
+            for pending in batch:
+                pending.fail(f"Error creating tweet: {str(e)}")
+            return
+
+        # The tweets are stored now: a cache failure must not report them as
+        # failed (a retry would duplicate them), only leave entries to expire
+        try:
+            invalidate_profile_counts({p.row["user_id"] for p in written})
+            # Async callers know the IDs early; drop "not found" entries
+            get_entity_cache().invalidate(TWEET, [p.row["id"] for p in written])
+        except Exception:
+            self.app.logger.exception("Cache invalidation after tweet batch failed")
+        finally:
+            db.session.remove()
+        for pending in written:
+            pending.committed.set_result((pending.result(), None))
+
+    def _write_one_by_one(self, batch: List[PendingTweet]) -> List[PendingTweet]:
+        written: List[PendingTweet] = []
+        for pending in batch:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Tweet).values(pending.row))
+                written.append(pending)
+            except IntegrityError as e:
+                if constraint_violation(e) == FOREIGN_KEY_VIOLATION:
+                    pending.fail("User not found")
+                else:
+                    pending.fail(f"Error creating tweet: {str(e)}")
+        return written
+
+    def stats(self) -> Dict:
+        """Batch sizes and commit cost for the metrics endpoint."""
+        return {
+            "window_ms": self.window * 1000,
+            "queued": self._queue.qsize(),
+            "batches": self.batches,
+            "tweets": self.tweets,
+            "avg_batch_size": (
+                round(self.tweets / self.batches, 2) if self.batches else None
+            ),
+            "avg_commit_ms": (
+                round(self.commit_seconds_total / self.batches * 1000, 3)
+                if self.batches
+                else None
+            ),
+        }
+
+    def close(self) -> None:
+        """Stop the writer thread after it finishes the current batch."""
+        self._stopped.set()
+        self._thread.join(timeout=5)
+
+
+def get_tweet_batcher() -> TweetBatcher:
+    """Get this worker's tweet batcher, starting its writer thread."""
+    config = current_app.config
+    return get_local(
+        "tweet_batcher",
+        lambda: TweetBatcher(
+            current_app._get_current_object(),
+            config["TWEET_BATCH_WINDOW_MS"],
+            config["TWEET_BATCH_MAX_SIZE"],
+            config["TWEET_BATCH_QUEUE_SIZE"],
+        ),
+    )
@@ -0,0 +1,305 @@
+"""Bulk tweet import from NDJSON streams, validated and written per batch."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from sqlalchemy import insert, or_
+
+from twitter_api.database import db
+from twitter_api.models import Tweet, User
+from twitter_api.services.profile_counts import invalidate_profile_counts
+from twitter_api.utils.params import MAX_ID
+from twitter_api.utils.snowflake import EPOCH_MS, get_id_generator
+
+MAX_CONTENT_LENGTH = 280
+
+# Columns written by COPY, in order
+COPY_COLUMNS = ("id", "user_id", "content", "created_at", "updated_at")
+
+# Oldest created_at that fits in a tweet ID
+MIN_CREATED_AT = datetime.utcfromtimestamp(EPOCH_MS / 1000)
+
+# ID ranges per query when looking up IDs already backfilled
+RANGES_PER_QUERY = 500
+
+Line = Union[str, bytes]
+
+
+def _batches(
+    lines: Iterable[Line], batch_size: int
+) -> Iterator[List[Tuple[int, Line]]]:
+    """Group non-blank lines into numbered batches without reading ahead."""
+    batch: List[Tuple[int, Line]] = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        batch.append((line_no, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp into naive UTC; None if invalid."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse(line: Line, now: datetime) -> Tuple[Optional[Dict], Optional[str]]:
+    """Decode one NDJSON record; content is checked later for the whole batch."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None, "Invalid JSON"
+    if not isinstance(record, dict):
+        return None, "Each line must be a JSON object"
+
+    user_id = record.get("user_id")
+    if not isinstance(user_id, int) or isinstance(user_id, bool):
+        return None, "user_id must be an integer"
+    if not 0 < user_id <= MAX_ID:
+        # No such user, and it would not fit the int64 author array
+        return None, "User not found"
+    content = record.get("content")
+    if not isinstance(content, str):
+        return None, "content must be a string"
+
+    created_at = now
+    if record.get("created_at") is not None:
+        created_at = _parse_timestamp(record["created_at"])
+        if created_at is None:
+            return None, "created_at must be an ISO 8601 timestamp"
+        if created_at < MIN_CREATED_AT:
+            return None, f"created_at must not be before {MIN_CREATED_AT.date()}"
+
+    return {
+        "user_id": user_id,
+        "content": content,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }, None
+
+
+def validate_batch(
+    records: List[Dict],
+) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """
+    Validate a batch of parsed records with array operations.
+
+    Content length and emptiness are checked over the whole batch at once,
+    and authors are checked with a single ``IN`` lookup of the distinct IDs.
+    Messages match ``TweetService.validate_content`` and ``create_tweet``.
+
+    Args:
+        records: Parsed records with ``user_id`` and ``content``
+
+    Returns:
+        Tuple of (boolean mask of valid records, error message per record)
+    """
+    count = len(records)
+    if count == 0:
+        return np.zeros(0, dtype=bool), []
+
+    # Content past the limit is cut so one huge value cannot inflate the
+    # fixed-width array; the cut keeps it over the limit
+    contents = np.array(
+        [record["content"][: MAX_CONTENT_LENGTH + 1] for record in records],
+        dtype=str,
+    )
+    lengths = np.char.str_len(contents)
+    blank = np.char.str_len(np.char.strip(contents)) == 0
+    # A cut value that is all whitespace may still have text further on
+    for index in np.flatnonzero(blank & (lengths > MAX_CONTENT_LENGTH)):
+        blank[index] = not records[index]["content"].strip()
+    too_long = ~blank & (lengths > MAX_CONTENT_LENGTH)
+
+    user_ids = np.fromiter(
+        (record["user_id"] for record in records), dtype=np.int64, count=count
+    )
+    wanted = np.unique(user_ids[~(blank | too_long)])
+    known = np.fromiter(
+        (
+            row[0]
+            for row in db.session.query(User.id).filter(User.id.in_(wanted.tolist()))
+        ),
+        dtype=np.int64,
+    )
+    unknown = ~np.isin(user_ids, known)
+
+    errors: List[Optional[str]] = [None] * count
+    for index in np.flatnonzero(blank):
+        errors[index] = "Tweet content cannot be empty"
+    for index in np.flatnonzero(too_long):
+        errors[index] = f"Tweet content must be at most {MAX_CONTENT_LENGTH} characters"
+    for index in np.flatnonzero(~(blank | too_long) & unknown):
+        errors[index] = "User not found"
+
+    return ~(blank | too_long | unknown), errors
+
+
+def _copy_rows(rows: List[Dict]) -> None:
+    """Stream rows into ``tweets`` with PostgreSQL ``COPY ... FROM STDIN``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            (
+                row["id"],
+                row["user_id"],
+                row["content"],
+                row["created_at"].isoformat(),
+                row["updated_at"].isoformat(),
+            )
+        )
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Tweet.__tablename__} ({', '.join(COPY_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def stored_ids(ranges: List[Tuple[int, int]]) -> Iterator[int]:
+    """Tweet IDs inside the given inclusive ranges, with indexed range scans."""
+    for start in range(0, len(ranges), RANGES_PER_QUERY):
+        chunk = ranges[start : start + RANGES_PER_QUERY]
+        query = db.session.query(Tweet.id).filter(
+            or_(*(Tweet.id.between(low, high) for low, high in chunk))
+        )
+        for row in query:
+            yield row[0]
+
+
+def write_rows(rows: List[Dict]) -> None:
+    """
+    Insert validated rows in the current transaction.
+
+    Uses COPY on PostgreSQL and a multi-row executemany INSERT elsewhere.
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        _copy_rows(rows)
+    else:
+        db.session.execute(insert(Tweet), rows)
+
+
+class TweetImportService:
+    """Service class for bulk tweet imports."""
+
+    @staticmethod
+    def import_ndjson(
+        lines: Iterable[Line],
+        batch_size: int = 5000,
+        max_errors: int = 1000,
+        on_batch: Optional[Callable[[Dict], None]] = None,
+    ) -> Dict:
+        """
+        Import tweets from NDJSON lines, one committed batch at a time.
+
+        Each line is an object with ``user_id``, ``content`` and an optional
+        ISO 8601 ``created_at``, which also sets the time embedded in the
+        tweet's ID so imported tweets sort among existing ones. Lines are
+        consumed lazily, so only one batch is held in memory. Invalid rows
+        are skipped and reported by line number; the rest of their batch is
+        still imported.
+
+        Args:
+            lines: NDJSON lines (str or bytes), e.g. an open file
+            batch_size: Rows validated and written per transaction
+            max_errors: Row errors kept in the report; later ones are counted
+            on_batch: Called with the running report after each batch
+
+        Returns:
+            Dict with ``processed``, ``imported``, ``failed`` and ``batches``
+            counts, ``errors`` (line/error pairs) and ``errors_truncated``
+        """
+        report: Dict = {
+            "processed": 0,
+            "imported": 0,
+            "failed": 0,
+            "batches": 0,
+            "errors": [],
+            "errors_truncated": False,
+        }
+
+        def record_error(line_no: int, error: str) -> None:
+            report["failed"] += 1
+            if len(report["errors"]) < max_errors:
+                report["errors"].append({"line": line_no, "error": error})
+            else:
+                report["errors_truncated"] = True
+
+        for batch in _batches(lines, batch_size):
+            now = datetime.utcnow()
+            records: List[Dict] = []
+            line_nos: List[int] = []
+            for line_no, line in batch:
+                record, error = _parse(line, now)
+                if error:
+                    record_error(line_no, error)
+                else:
+                    records.append(record)
+                    line_nos.append(line_no)
+
+            valid, errors = validate_batch(records)
+            for line_no, error in zip(line_nos, errors):
+                if error:
+                    record_error(line_no, error)
+
+            ids = get_id_generator()
+            kept = [
+                (line_no, record)
+                for line_no, record, keep in zip(line_nos, records, valid)
+                if keep
+            ]
+            # Continue after IDs earlier imports stored in the same milliseconds
+            sequences = ids.backfill_sequences(
+                (record["created_at"] for _, record in kept), stored_ids
+            )
+            rows = []
+            row_line_nos = []
+            for line_no, record in kept:
+                try:
+                    tweet_id = ids.id_at(record["created_at"], sequences)
+                except ValueError as e:
+                    record_error(line_no, str(e))
+                    continue
+                rows.append(
+                    dict(record, id=tweet_id, content=record["content"].strip())
+                )
+                row_line_nos.append(line_no)
+            if rows:
+                try:
+                    write_rows(rows)
+                    db.session.commit()
+                    invalidate_profile_counts({row["user_id"] for row in rows})
+                    report["imported"] += len(rows)
+                except Exception as e:
+                    # e.g. an author deleted since validation; skip the batch
+                    db.session.rollback()
+                    for line_no in row_line_nos:
+                        record_error(line_no, f"Error importing batch: {str(e)}")
+
+            report["processed"] += len(batch)
+            report["batches"] += 1
+            if on_batch is not None:
+                on_batch(report)
+
+        return report
@@ -1,9 +1,46 @@
 """Tweet service layer - business logic for tweet operations."""
 
 from typing import Optional, Dict, List, Tuple
-from twitter_api.database import db
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.util import identity_key
+from twitter_api.database import FOREIGN_KEY_VIOLATION, constraint_violation, db
 from twitter_api.models.tweet import Tweet
-from twitter_api.models.user import User
+from twitter_api.services.entity_cache import (
+    TWEET,
+    attach,
+    get_entity_cache,
+    snapshot,
+)
+from twitter_api.services.profile_counts import invalidate_profile_counts
+from twitter_api.services.tweet_batcher import get_tweet_batcher
+from twitter_api.services.user_loader import load_user, load_users
+from twitter_api.services.write_overlay import (
+    CREATED,
+    DELETED,
+    UPDATED,
+    get_write_overlay,
+    record_write,
+)
+from twitter_api.utils.conditional import page_etag
+
+# Maximum IDs accepted by a multi-get lookup
+MAX_TWEET_LOOKUP = 100
+
+
+def _load_snapshots(tweet_ids: List[int]) -> Dict[int, Dict]:
+    return {
+        tweet.id: snapshot(tweet)
+        for tweet in Tweet.query.filter(Tweet.id.in_(tweet_ids))
+    }
+
+
+def _attach(values: Dict) -> Tweet:
+    """Session-bound Tweet for a cached snapshot, reusing one already loaded."""
+    return db.session.identity_map.get(identity_key(Tweet, values["id"])) or attach(
+        Tweet, values
+    )
 
 
 class TweetService:
@@ -42,26 +79,147 @@ class TweetService:
         if not valid:
             return None, error
 
-        # Verify user exists
-        user = User.query.get(user_id)
-        if not user:
-            return None, "User not found"
-
-        # Create tweet
+        # Create tweet; the user_id foreign key rejects unknown users
         tweet = Tweet(content=content.strip(), user_id=user_id)
 
         try:
             db.session.add(tweet)
             db.session.commit()
+            invalidate_profile_counts([user_id])
+            record_write(user_id, CREATED, tweet.to_dict())
             return tweet, None
+        except IntegrityError as e:
+            db.session.rollback()
+            if constraint_violation(e) == FOREIGN_KEY_VIOLATION:
+                return None, "User not found"
+            return None, f"Error creating tweet: {str(e)}"
         except Exception as e:
             db.session.rollback()
             return None, f"Error creating tweet: {str(e)}"
 
+    @staticmethod
+    def submit_tweet(
+        user_id: int, username: str, content: str, wait_for_commit: bool = True
+    ) -> Tuple[Optional[Dict], Optional[str], bool]:
+        """
+        Create a tweet through the group-commit batcher.
+
+        Args:
+            user_id: ID of the user creating the tweet
+            username: Author's username, echoed in the result
+            content: Tweet content
+            wait_for_commit: Return once the batch commits (or after
+                TWEET_BATCH_TIMEOUT); otherwise return as soon as the tweet is
+                queued with its ID (the write may still fail)
+
+        Returns:
+            Tuple of (tweet_dict, error_message, committed); when not
+            committed, the tweet is queued and will be written later, so it
+            must not be resubmitted
+
+        Raises:
+            TweetBatcherBusy: If the write queue is full (nothing was queued)
+        """
+        valid, error = TweetService.validate_content(content)
+        if not valid:
+            return None, error, False
+
+        overlay = get_write_overlay()
+        pending = get_tweet_batcher().submit(user_id, username, content.strip())
+
+        def record_if_written(future) -> None:
+            # Runs on the batcher thread; tweets that fail are never shown
+            written, _ = future.result()
+            if written is not None:
+                overlay.record(user_id, CREATED, written)
+
+        if wait_for_commit:
+            try:
+                tweet, error = pending.committed.result(
+                    timeout=current_app.config["TWEET_BATCH_TIMEOUT"]
+                )
+                if tweet is not None:
+                    overlay.record(user_id, CREATED, tweet)
+                return tweet, error, True
+            except FutureTimeoutError:
+                pass
+
+        pending.committed.add_done_callback(record_if_written)
+        tweet, error = pending.assigned.result()
+        return tweet, error, False
+
     @staticmethod
     def get_tweet_by_id(tweet_id: int) -> Optional[Tweet]:
-        """Get a tweet by ID."""
-        return Tweet.query.get(tweet_id)
+        """
+        Get a tweet by ID.
+
+        Served from the entity cache, as is its author, so a hit runs no
+        query. Missing IDs are cached briefly too.
+        """
+        values = get_entity_cache().get(
+            TWEET, tweet_id, lambda: _load_snapshots([tweet_id]).get(tweet_id)
+        )
+        if values is None:
+            return None
+        tweet = _attach(values)
+        # Puts the author in the identity map, where tweet.user finds it
+        load_user(tweet.user_id)
+        return tweet
+
+    @staticmethod
+    def get_tweets_by_ids(tweet_ids: List[int]) -> Dict[int, Optional[Tweet]]:
+        """
+        Get many tweets by ID with at most one query.
+
+        Tweets come from the entity cache, with one ``IN`` query for the
+        rest. Authors are loaded together through ``load_users``, so
+        serializing the tweets does not query once per author.
+
+        Args:
+            tweet_ids: IDs to look up
+
+        Returns:
+            Dict mapping each ID to its Tweet, or None if it does not exist
+        """
+        found = {}
+        if tweet_ids:
+            snapshots = get_entity_cache().get_many(
+                TWEET, list(dict.fromkeys(tweet_ids)), _load_snapshots
+            )
+            found = {
+                tweet_id: _attach(values)
+                for tweet_id, values in snapshots.items()
+                if values is not None
+            }
+            # Puts the authors in the identity map, where tweet.user finds them
+            load_users({tweet.user_id for tweet in found.values()})
+        return {tweet_id: found.get(tweet_id) for tweet_id in tweet_ids}
+
+    @staticmethod
+    def _all_tweets_query(sort: str):
+        """Query behind ``get_all_tweets`` in the requested order."""
+        if sort == "oldest":
+            return Tweet.query.order_by(Tweet.id.asc())
+        return Tweet.query.order_by(Tweet.id.desc())  # default to newest
+
+    @staticmethod
+    def get_all_tweets_etag(
+        page: int = 1, per_page: int = 20, sort: str = "newest"
+    ) -> str:
+        """
+        ETag of the ``get_all_tweets`` page, from its tweets' IDs and times.
+
+        Runs only a narrow version query, so unchanged pages can be answered
+        with 304 before the tweets and authors are loaded.
+        """
+        return page_etag(
+            f"tweets:{sort}",
+            TweetService._all_tweets_query(sort),
+            Tweet.id,
+            Tweet.updated_at,
+            page,
+            min(per_page, 100),
+        )
 
     @staticmethod
     def get_all_tweets(
@@ -81,13 +239,9 @@ class TweetService:
         # Limit per_page to prevent abuse
         per_page = min(per_page, 100)
 
-        # Determine sort order
-        if sort == "oldest":
-            query = Tweet.query.order_by(Tweet.created_at.asc())
-        else:  # default to newest
-            query = Tweet.query.order_by(Tweet.created_at.desc())
-
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        pagination = TweetService._all_tweets_query(sort).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
         pagination_info = {
             "page": pagination.page,
@@ -132,6 +286,8 @@ class TweetService:
 
         try:
             db.session.commit()
+            get_entity_cache().invalidate(TWEET, [tweet_id])
+            record_write(user_id, UPDATED, tweet.to_dict())
             return tweet, None
         except Exception as e:
             db.session.rollback()
@@ -159,8 +315,12 @@ class TweetService:
             return False, "You can only delete your own tweets"
 
         try:
+            tweet_dict = tweet.to_dict()
             db.session.delete(tweet)
             db.session.commit()
+            get_entity_cache().invalidate(TWEET, [tweet_id])
+            invalidate_profile_counts([user_id])
+            record_write(user_id, DELETED, tweet_dict)
             return True, None
         except Exception as e:
             db.session.rollback()
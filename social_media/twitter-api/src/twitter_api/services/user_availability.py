@@ -0,0 +1,79 @@
+"""Per-worker Bloom filter over taken usernames and emails."""
+
+from typing import Iterable, Tuple
+
+from flask import current_app
+
+from twitter_api.database import db
+from twitter_api.models import User
+from twitter_api.services.invalidation_bus import get_invalidation_bus
+from twitter_api.utils.bloom import RebuildingBloomFilter
+from twitter_api.utils.local_state import get_local
+
+# Smallest filter built, so a young table does not rebuild on every signup
+MIN_CAPACITY = 10000
+
+USERNAME = "username"
+EMAIL = "email"
+
+# Invalidation bus namespace; keys are hex-encoded filter keys to add
+NAMESPACE = "availability_filter"
+
+
+def _key(kind: str, value: str) -> bytes:
+    return f"{kind}:{value}".encode()
+
+
+def _load_users() -> Tuple[int, Iterable[bytes]]:
+    rows = db.session.query(User.username, User.email)
+    return User.query.count() * 4, (
+        key
+        for username, email in rows.yield_per(50000)
+        for key in (_key(USERNAME, username), _key(EMAIL, email))
+    )
+
+
+class AvailabilityFilter(RebuildingBloomFilter):
+    """
+    Answers "definitely not taken" for usernames and emails without a query.
+
+    Built from the ``users`` table in the background, updated by
+    registrations in this worker and, through the invalidation bus, in the
+    others, and rebuilt after ``refresh_seconds`` or once it holds more keys
+    than it was sized for.
+    """
+
+    def might_be_taken(self, kind: str, value: str) -> bool:
+        """False means no user has this username/email."""
+        return self.might_contain(_key(kind, value))
+
+
+def get_availability_filter() -> AvailabilityFilter:
+    """Get this worker's username/email filter."""
+    config = current_app.config
+    app = current_app._get_current_object()
+    bus = get_invalidation_bus()
+
+    def build() -> AvailabilityFilter:
+        availability_filter = AvailabilityFilter(
+            app,
+            _load_users,
+            config["AVAILABILITY_FILTER_ERROR_RATE"],
+            config["AVAILABILITY_FILTER_REFRESH_SECONDS"],
+            MIN_CAPACITY,
+            synced=config["SINGLE_WORKER"] or bus.transport is not None,
+            background=config["BLOOM_FILTER_BACKGROUND_REBUILD"],
+        )
+        availability_filter.subscribe(bus, NAMESPACE)
+        return availability_filter
+
+    return get_local("availability_filter", build)
+
+
+def record_registration(username: str, email: str) -> None:
+    """Add a committed signup to this worker's filter and the other workers'."""
+    keys = [_key(USERNAME, username), _key(EMAIL, email)]
+    availability_filter = get_availability_filter()
+    for key in keys:
+        availability_filter.add(key)
+    get_invalidation_bus().publish(NAMESPACE, [key.hex() for key in keys])
@@ -0,0 +1,125 @@
+"""Request-scoped user loading backed by the entity cache."""
+
+from typing import Dict, Iterable, List, Optional
+
+from flask import g
+from sqlalchemy.orm.util import identity_key
+
+from twitter_api.database import db
+from twitter_api.models import User
+from twitter_api.services.entity_cache import USER, attach, get_entity_cache, snapshot
+
+# Left out of snapshots; loaded on access by the rare caller that needs it
+UNCACHED_COLUMNS = {"password_hash"}
+
+
+def _snapshot(user: User) -> Dict:
+    return snapshot(user, UNCACHED_COLUMNS)
+
+
+def _load_snapshot(user_id: int) -> Optional[Dict]:
+    user = db.session.get(User, user_id)
+    return _snapshot(user) if user is not None else None
+
+
+def _load_snapshots(user_ids: List[int]) -> Dict[int, Dict]:
+    return {
+        user.id: _snapshot(user) for user in User.query.filter(User.id.in_(user_ids))
+    }
+
+
+def load_user(user_id: int) -> Optional[User]:
+    """
+    Load a user at most once per request.
+
+    Lookups go to the request's memo, the session's identity map, the
+    entity cache, and only then the database. Concurrent misses for the
+    same user share one query. The authenticated user's row is also exposed
+    as ``g.user``.
+
+    Args:
+        user_id: ID of the user to load
+
+    Returns:
+        User instance, or None if the user does not exist
+    """
+    loaded = g.setdefault("loaded_users", {})
+    if user_id in loaded:
+        return loaded[user_id]
+
+    # A row already in the session is fresher than any snapshot
+    key = identity_key(User, user_id)
+    user = db.session.identity_map.get(key)
+    if user is None:
+        values = get_entity_cache().get(USER, user_id, lambda: _load_snapshot(user_id))
+        if values is not None:
+            # Loaded by this request if it ran the query, else from the cache
+            user = db.session.identity_map.get(key) or attach(User, values)
+
+    loaded[user_id] = user
+    if user_id == g.get("user_id"):
+        g.user = user
+    return user
+
+
+def load_users(user_ids: Iterable[int]) -> Dict[int, Optional[User]]:
+    """
+    Load many users with at most one query.
+
+    Each ID goes through the same lookups as ``load_user``; whatever is left
+    is fetched with a single ``IN`` query and cached.
+
+    Args:
+        user_ids: IDs of the users to load
+
+    Returns:
+        Dict mapping each ID to its User, or None if it does not exist
+    """
+    loaded = g.setdefault("loaded_users", {})
+    users: Dict[int, Optional[User]] = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        if user_id in loaded:
+            users[user_id] = loaded[user_id]
+            continue
+        user = db.session.identity_map.get(identity_key(User, user_id))
+        if user is None:
+            missing.append(user_id)
+        else:
+            users[user_id] = user
+
+    if missing:
+        snapshots = get_entity_cache().get_many(USER, missing, _load_snapshots)
+        for user_id in missing:
+            values = snapshots[user_id]
+            users[user_id] = None
+            if values is not None:
+                users[user_id] = db.session.identity_map.get(
+                    identity_key(User, user_id)
+                ) or attach(User, values)
+
+    loaded.update(users)
+    if g.get("user_id") in users:
+        g.user = users[g.user_id]
+    return users
+
+
+def current_user_record() -> Optional[User]:
+    """The authenticated user's row (``g.user``), loaded on first use."""
+    user_id = g.get("user_id")
+    if user_id is None:
+        return None
+    return load_user(user_id)
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a user's cached snapshot after their row changes."""
+    get_entity_cache().invalidate(USER, [user_id])
+    g.get("loaded_users", {}).pop(user_id, None)
+
+
+def reset_request_users() -> None:
+    """Forget users loaded by a previous request (registered as before_request)."""
+    g.pop("loaded_users", None)
+    g.pop("user", None)
+    g.pop("user_id", None)
@@ -1,12 +1,35 @@
 """User service layer - business logic for user operations."""
 
 from typing import Optional, Dict, List, Tuple
-from twitter_api.database import db
+from sqlalchemy.exc import IntegrityError
+from twitter_api.database import db, violated_column
 from twitter_api.models.user import User
-from twitter_api.utils.password import hash_password, verify_password
+from twitter_api.services.user_availability import (
+    EMAIL,
+    USERNAME,
+    get_availability_filter,
+    record_registration,
+)
+from twitter_api.services.entity_cache import (
+    USER,
+    USER_ID_BY_NAME,
+    get_entity_cache,
+)
+from twitter_api.services.profile_counts import load_profile_counts
+from twitter_api.services.user_loader import invalidate_user, load_user, load_users
+from twitter_api.utils.password import (
+    PasswordHasherBusy,
+    hash_password_pooled,
+    needs_rehash,
+    verify_password_pooled,
+)
+from twitter_api.utils.conditional import page_etag
 from twitter_api.utils.jwt import create_access_token
 import re
 
+# Maximum IDs accepted by a multi-get lookup
+MAX_USER_LOOKUP = 100
+
 
 class UserService:
     """Service class for user-related operations."""
@@ -72,6 +95,9 @@ class UserService:
 
         Returns:
             Tuple of (user, error_message)
+
+        Raises:
+            PasswordHasherBusy: If the hashing pool is saturated
         """
         # Validate username
         valid, error = UserService.validate_username(username)
@@ -88,34 +114,91 @@ class UserService:
         if not valid:
             return None, error
 
-        # Check if username already exists
-        if User.query.filter_by(username=username).first():
-            return None, "Username already exists"
-
-        # Check if email already exists
-        if User.query.filter_by(email=email).first():
-            return None, "Email already exists"
-
         # Validate display name length if provided
         if display_name and len(display_name) > 100:
             return None, "Display name must be at most 100 characters"
 
-        # Create user
+        password_hash = hash_password_pooled(password)
+
+        # One INSERT: the unique constraints reject taken usernames and emails
         user = User(
             username=username,
             email=email,
-            password_hash=hash_password(password),
+            password_hash=password_hash,
             display_name=display_name,
         )
 
         try:
             db.session.add(user)
             db.session.commit()
-            return user, None
+        except IntegrityError as e:
+            db.session.rollback()
+            column = violated_column(e, ["username", "email"])
+            if column == "username":
+                return None, "Username already exists"
+            if column == "email":
+                return None, "Email already exists"
+            return None, f"Error creating user: {str(e)}"
         except Exception as e:
             db.session.rollback()
             return None, f"Error creating user: {str(e)}"
 
+        record_registration(username, email)
+        # Drop "not found" entries cached for the new username or ID
+        cache = get_entity_cache()
+        cache.invalidate(USER_ID_BY_NAME, [username])
+        cache.invalidate(USER, [user.id])
+        return user, None
+
+    @staticmethod
+    def check_availability(
+        username: Optional[str] = None, email: Optional[str] = None
+    ) -> Dict[str, Dict]:
+        """
+        Check whether a username and/or email can still be registered.
+
+        Values the Bloom filter has never seen are reported available without
+        a query when it sees every signup (SINGLE_WORKER); otherwise, and for
+        probable matches, an indexed lookup decides. Registration itself
+        still rejects duplicates.
+
+        Args:
+            username: Username to check (optional)
+            email: Email to check (optional)
+
+        Returns:
+            Dict keyed by "username"/"email" with ``available`` and, when not
+            available, ``error``
+        """
+        checks = [
+            (USERNAME, username, UserService.validate_username, User.username),
+            (EMAIL, email, UserService.validate_email, User.email),
+        ]
+        availability_filter = get_availability_filter()
+
+        results = {}
+        for kind, value, validate, column in checks:
+            if value is None:
+                continue
+            valid, error = validate(value)
+            if not valid:
+                results[kind] = {"available": False, "error": error}
+                continue
+
+            taken = (
+                availability_filter.might_be_taken(kind, value)
+                and db.session.query(User.id).filter(column == value).first()
+                is not None
+            )
+            if taken:
+                results[kind] = {
+                    "available": False,
+                    "error": f"{kind.capitalize()} already exists",
+                }
+            else:
+                results[kind] = {"available": True}
+        return results
+
     @staticmethod
     def authenticate_user(
         username: str, password: str
@@ -129,6 +212,9 @@ class UserService:
 
         Returns:
             Tuple of (token, user, error_message)
+
+        Raises:
+            PasswordHasherBusy: If the hashing pool is saturated
         """
         # Find user by username
         user = User.query.filter_by(username=username).first()
@@ -137,31 +223,105 @@ class UserService:
             return None, None, "Invalid username or password"
 
         # Verify password
-        if not verify_password(password, user.password_hash):
+        valid = verify_password_pooled(password, user.password_hash)
+        if not valid:
             return None, None, "Invalid username or password"
 
+        # Upgrade hashes made at a lower cost; the login
+        # already succeeded, so a busy pool just postpones the rehash
+        if needs_rehash(user.password_hash):
+            try:
+                user.password_hash = hash_password_pooled(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass
+
         # Generate token
         token = create_access_token(user.id, user.username)
         return token, user, None
 
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[User]:
-        """Get a user by ID."""
-        return User.query.get(user_id)
+        """
+        Get a user by ID.
+
+        Served from the entity cache; concurrent misses for the same user
+        share one query.
+        """
+        return load_user(user_id)
+
+    @staticmethod
+    def get_profile_counts(user_id: int) -> Dict:
+        """Get a user's tweet, follower and following counts (cached briefly)."""
+        return load_profile_counts(user_id)
+
+    @staticmethod
+    def get_users_by_ids(user_ids: List[int]) -> Dict[int, Optional[User]]:
+        """
+        Get many users by ID with at most one query.
+
+        Users already cached by this worker are served without a query.
+
+        Args:
+            user_ids: IDs to look up
+
+        Returns:
+            Dict mapping each ID to its User, or None if it does not exist
+        """
+        return load_users(user_ids)
 
     @staticmethod
     def get_user_by_username(username: str) -> Optional[User]:
-        """Get a user by username."""
-        return User.query.filter_by(username=username).first()
+        """
+        Get a user by username.
+
+        The username's user ID is cached, so repeat lookups are served from
+        the entity cache like ``get_user_by_id``.
+        """
+        user_id = get_entity_cache().get(
+            USER_ID_BY_NAME,
+            username,
+            lambda: db.session.query(User.id).filter_by(username=username).scalar(),
+        )
+        return load_user(user_id) if user_id is not None else None
+
+    @staticmethod
+    def _all_users_query(sort: str):
+        """Query behind ``get_all_users`` in the requested order."""
+        if sort == "influence":
+            return User.query.order_by(User.influence_score.desc(), User.id)
+        return User.query.order_by(User.created_at.desc())  # default to newest
+
+    @staticmethod
+    def get_all_users_etag(
+        page: int = 1, per_page: int = 20, sort: str = "newest"
+    ) -> str:
+        """
+        ETag of the ``get_all_users`` page, from its users' IDs and times.
+
+        Runs only a narrow version query, so unchanged pages can be answered
+        with 304 before the users are loaded.
+        """
+        return page_etag(
+            f"users:{sort}",
+            UserService._all_users_query(sort),
+            User.id,
+            User.updated_at,
+            page,
+            min(per_page, 100),
+        )
 
     @staticmethod
-    def get_all_users(page: int = 1, per_page: int = 20) -> Tuple[List[User], Dict]:
+    def get_all_users(
+        page: int = 1, per_page: int = 20, sort: str = "newest"
+    ) -> Tuple[List[User], Dict]:
         """
         Get all users with pagination.
 
         Args:
             page: Page number (1-indexed)
             per_page: Number of users per page
+            sort: Sort order ('newest' or 'influence')
 
         Returns:
             Tuple of (users_list, pagination_info)
@@ -169,7 +329,7 @@ class UserService:
         # Limit per_page to prevent abuse
         per_page = min(per_page, 100)
 
-        pagination = User.query.order_by(User.created_at.desc()).paginate(
+        pagination = UserService._all_users_query(sort).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
@@ -216,6 +376,7 @@ class UserService:
 
         try:
             db.session.commit()
+            invalidate_user(user_id)
             return user, None
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,223 @@
+"""Read-your-writes overlay: each user's recent tweet writes, merged into pages."""
+
+import json
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+
+from twitter_api.services.entity_cache import get_entity_cache
+from twitter_api.utils.cache import TTLCache
+from twitter_api.utils.local_state import get_local
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+class WriteOverlay:
+    """
+    Tweets each user created, edited or deleted in the last ``ttl`` seconds.
+
+    Cached pages (e.g. the global feed) lag behind writes by up to their TTL.
+    ``merge`` patches such a page for the author only: edited tweets are
+    replaced, deleted ones dropped, and new ones placed at the top of the
+    first page. Nobody else's view changes, and no cache is invalidated.
+    ``ttl`` should cover the longest cache TTL it papers over.
+
+    Writes are kept in ``store`` (the entity cache's shared store) so the
+    author's next request sees them whichever worker serves it; without a
+    store they are kept in this worker only. Only committed writes may be
+    recorded.
+    """
+
+    def __init__(self, max_users: int, ttl: float, store=None):
+        self.ttl = ttl
+        self.store = store
+        # user_id -> {tweet_id: (recorded_at, op, tweet_dict)} without a store
+        self._writes = TTLCache(max_users, ttl)
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.merged = 0
+
+    @staticmethod
+    def _store_key(user_id: int) -> str:
+        return f"overlay:{user_id}"
+
+    def _load(self, user_id: int) -> Dict[int, Tuple[float, str, Dict]]:
+        if self.store is None:
+            return dict(self._writes.get(user_id) or {})
+        raw = self.store.get_many([self._store_key(user_id)])[0]
+        if raw is None:
+            return {}
+        return {
+            int(tweet_id): tuple(entry) for tweet_id, entry in json.loads(raw).items()
+        }
+
+    def record(self, user_id: int, op: str, tweet: Dict) -> None:
+        """Remember a committed write by ``user_id``."""
+        if self.ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            # Concurrent writes by one user through two workers may drop one
+            # entry; the page then lags until its cache expires, as before
+            writes = self._load(user_id)
+            previous = writes.get(tweet["id"])
+            if op == UPDATED and previous is not None and previous[1] == CREATED:
+                # Still new to pages loaded before the create
+                op = CREATED
+            writes[tweet["id"]] = (now, op, tweet)
+            writes = {
+                tweet_id: entry
+                for tweet_id, entry in writes.items()
+                if entry[0] >= now - self.ttl
+            }
+            if self.store is None:
+                self._writes.set(user_id, writes)
+            else:
+                self.store.set_many(
+                    {self._store_key(user_id): json.dumps(writes)}, self.ttl
+                )
+            self.recorded += 1
+
+    def recent(self, user_id: int) -> Dict[int, Tuple[str, Dict]]:
+        """The user's unexpired writes: tweet ID -> (op, tweet dict)."""
+        writes = self._load(user_id)
+        cutoff = time.time() - self.ttl
+        return {
+            tweet_id: (op, tweet)
+            for tweet_id, (recorded_at, op, tweet) in writes.items()
+            if recorded_at >= cutoff
+        }
+
+    def merge(
+        self, user_id: Optional[int], tweets: List[Dict], page: int, per_page: int
+    ) -> List[Dict]:
+        """
+        Apply a user's recent writes to a newest-first page of tweet dicts.
+
+        Args:
+            user_id: Viewer; None (anonymous) returns the page unchanged
+            tweets: Page as cached, shared with other requests (not modified)
+            page: Page number (1-indexed); new tweets only go on page 1
+            per_page: Page size the result is trimmed to
+
+        Returns:
+            The page as the user should see it
+        """
+        writes = self.recent(user_id) if user_id is not None else {}
+        if not writes:
+            return tweets
+
+        merged = []
+        for tweet in tweets:
+            op, latest = writes.get(tweet["id"], (None, tweet))
+            if op != DELETED:
+                merged.append(latest)
+        if page == 1:
+            present = {tweet["id"] for tweet in merged}
+            created = [
+                tweet
+                for op, tweet in writes.values()
+                if op == CREATED and tweet["id"] not in present
+            ]
+            if created:
+                merged = sorted(merged + created, key=lambda t: t["id"], reverse=True)
+                merged = merged[:per_page]
+        self.merged += 1
+        return merged
+
+    def count_change(self, user_id: Optional[int], since: float) -> int:
+        """
+        Net tweets ``user_id`` added since ``since`` (a ``time.time()``).
+
+        Used to correct the totals of a page loaded at ``since``: creates
+        recorded later are missing from it, and deletes recorded later of
+        tweets created before it are still counted.
+        """
+        if user_id is None:
+            return 0
+        change = 0
+        for recorded_at, op, tweet in self._load(user_id).values():
+            if recorded_at <= since or recorded_at < time.time() - self.ttl:
+                continue
+            created = _created_at(tweet)
+            # A create edited since is recorded again, but the page may hold it
+            if op == CREATED and (created is None or created > since):
+                change += 1
+            elif op == DELETED and (created is None or created <= since):
+                change -= 1
+        return change
+
+    def merge_page(
+        self,
+        user_id: Optional[int],
+        result: Dict,
+        loaded_at: float,
+        page: int,
+        per_page: int,
+        total_key: str = "total",
+        pages_key: str = "pages",
+    ) -> Dict:
+        """
+        ``merge`` a paginated result and correct its totals for the viewer.
+
+        Args:
+            user_id: Viewer; None (anonymous) returns ``result`` unchanged
+            result: Dict with ``tweets`` and ``pagination`` (not modified)
+            loaded_at: ``time.time()`` when ``result`` was read
+            page: Page number (1-indexed)
+            per_page: Page size
+            total_key: Pagination key holding the item count
+            pages_key: Pagination key holding the page count
+
+        Returns:
+            The result as the user should see it
+        """
+        tweets = self.merge(user_id, result["tweets"], page, per_page)
+        change = self.count_change(user_id, loaded_at)
+        if tweets is result["tweets"] and not change:
+            return result
+        pagination = dict(result["pagination"])
+        total = max(pagination[total_key] + change, 0)
+        pagination[total_key] = total
+        pagination[pages_key] = math.ceil(total / per_page) if total else 0
+        return dict(result, tweets=tweets, pagination=pagination)
+
+    def stats(self) -> Dict:
+        """Counts for the metrics endpoint."""
+        return {
+            "shared_store": type(self.store).__name__ if self.store else None,
+            "users": len(self._writes),
+            "recorded": self.recorded,
+            "merged": self.merged,
+        }
+
+
+def _created_at(tweet: Dict) -> Optional[float]:
+    created_at = tweet.get("created_at")
+    if not created_at:
+        return None
+    created = datetime.fromisoformat(created_at).replace(tzinfo=timezone.utc)
+    return created.timestamp()
+
+
+def get_write_overlay() -> WriteOverlay:
+    """Get this worker's read-your-writes overlay."""
+    config = current_app.config
+    store = get_entity_cache().store
+    return get_local(
+        "write_overlay",
+        lambda: WriteOverlay(
+            config["WRITE_OVERLAY_MAX_USERS"], config["WRITE_OVERLAY_TTL"], store
+        ),
+    )
+
+
+def record_write(user_id: int, op: str, tweet: Dict) -> None:
+    """Record a committed tweet write by ``user_id`` in the overlay."""
+    get_write_overlay().record(user_id, op, tweet)
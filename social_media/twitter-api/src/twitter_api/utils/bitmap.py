@@ -0,0 +1,156 @@
+"""Compressed bitmap of non-negative integer IDs."""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Union
+
+# Chunks holding more IDs than this switch from a sorted array to a bitset
+ARRAY_MAX = 4096
+
+Container = Union[array, int]
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+def _to_bitset(values: Iterable[int]) -> int:
+    bits = 0
+    for value in values:
+        bits |= 1 << value
+    return bits
+
+
+def _from_bitset(bits: int) -> Iterator[int]:
+    # Lowest first and lazily, one byte at a time, so callers can stop early
+    # and a full chunk costs one pass instead of a copy per set bit
+    size = (bits.bit_length() + 7) // 8
+    for index, byte in enumerate(bits.to_bytes(size, "little")):
+        base = index << 3
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+
+def _intersect(left: Container, right: Container) -> Container:
+    if isinstance(left, int) and isinstance(right, int):
+        return left & right
+    if isinstance(left, int):
+        left, right = right, left
+    if isinstance(right, int):
+        return array("H", [value for value in left if right >> value & 1])
+    if len(left) > len(right):
+        left, right = right, left
+    other = set(right)
+    return array("H", [value for value in left if value in other])
+
+
+def _size(container: Container) -> int:
+    if isinstance(container, int):
+        return _popcount(container)
+    return len(container)
+
+
+class IdBitmap:
+    """
+    Roaring-style compressed set of IDs.
+
+    IDs are split into chunks of 65536 by their high bits. Sparse chunks are
+    sorted ``array('H')`` of the low 16 bits (2 bytes per ID); dense chunks
+    are a single bitset integer (at most 8 KiB). Intersections run per
+    shared chunk, so cost follows the smaller set rather than the ID range.
+    """
+
+    def __init__(self):
+        self._chunks: Dict[int, Container] = {}
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "IdBitmap":
+        """Build a bitmap from any iterable of IDs."""
+        grouped: Dict[int, List[int]] = {}
+        for value in ids:
+            grouped.setdefault(value >> 16, []).append(value & 0xFFFF)
+
+        bitmap = cls()
+        for high, lows in grouped.items():
+            lows = sorted(set(lows))
+            if len(lows) > ARRAY_MAX:
+                bitmap._chunks[high] = _to_bitset(lows)
+            else:
+                bitmap._chunks[high] = array("H", lows)
+        return bitmap
+
+    def add(self, value: int) -> None:
+        """Add one ID."""
+        high, low = value >> 16, value & 0xFFFF
+        container = self._chunks.get(high)
+        if container is None:
+            self._chunks[high] = array("H", [low])
+        elif isinstance(container, int):
+            self._chunks[high] = container | (1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                return
+            container.insert(position, low)
+            if len(container) > ARRAY_MAX:
+                self._chunks[high] = _to_bitset(container)
+
+    def discard(self, value: int) -> None:
+        """Remove one ID if present."""
+        high, low = value >> 16, value & 0xFFFF
+        container = self._chunks.get(high)
+        if container is None:
+            return
+        if isinstance(container, int):
+            container &= ~(1 << low)
+        else:
+            position = bisect_left(container, low)
+            if position < len(container) and container[position] == low:
+                del container[position]
+        if not container:
+            del self._chunks[high]
+        elif isinstance(container, int):
+            self._chunks[high] = container
+
+    def __and__(self, other: "IdBitmap") -> "IdBitmap":
+        result = IdBitmap()
+        smaller, larger = sorted((self._chunks, other._chunks), key=len)
+        for high, container in smaller.items():
+            if high in larger:
+                shared = _intersect(container, larger[high])
+                if shared:
+                    result._chunks[high] = shared
+        return result
+
+    def __contains__(self, value: int) -> bool:
+        container = self._chunks.get(value >> 16)
+        if container is None:
+            return False
+        low = value & 0xFFFF
+        if isinstance(container, int):
+            return bool(container >> low & 1)
+        position = bisect_left(container, low)
+        return position < len(container) and container[position] == low
+
+    def __len__(self) -> int:
+        return sum(_size(container) for container in self._chunks.values())
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._chunks):
+            container = self._chunks[high]
+            lows = _from_bitset(container) if isinstance(container, int) else container
+            base = high << 16
+            for low in lows:
+                yield base | low
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate payload size of the containers."""
+        return sum(
+            (container.bit_length() + 7) // 8
+            if isinstance(container, int)
+            else container.itemsize * len(container)
+            for container in self._chunks.values()
+        )
@@ -0,0 +1,241 @@
+"""Bloom filter for cheap definite-negative membership checks."""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over byte-string keys.
+
+    ``key in bloom`` is False only when the key was never added; True means
+    "probably added" with roughly ``error_rate`` false positives while at
+    most ``capacity`` keys have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: bytes):
+        """Bit positions for ``key`` using double hashing over one digest."""
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: bytes) -> None:
+        """Add ``key`` to the filter."""
+        positions = self._positions(key)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected for the keys added so far."""
+        fill = 1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+        return fill**self.num_hashes
+
+    def stats(self) -> Dict:
+        """Sizing and fill report."""
+        return {
+            "capacity": self.capacity,
+            "count": self.count,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "memory_bytes": self.memory_bytes,
+            "target_error_rate": self.error_rate,
+            "estimated_error_rate": round(self.estimated_error_rate(), 6),
+        }
+
+
+class RebuildingBloomFilter:
+    """
+    Bloom filter over a table, rebuilt from a full scan and swapped in.
+
+    ``load`` returns the number of keys expected and an iterable of them; it
+    runs on a background thread inside an app context of ``app`` (inline
+    when ``background`` is false). A rebuild starts on first use, after
+    ``refresh_seconds`` (to drop deleted keys) or once the filter holds more
+    keys than it was sized for; lookups keep using the previous filter
+    meanwhile and answer "maybe" until the first one is ready.
+
+    A negative is only trusted while the filter is ``synced``, i.e. every
+    committed key reaches ``add`` (one worker, or an invalidation bus it is
+    ``subscribe``d to); otherwise another worker may have written it and
+    ``might_contain`` answers "maybe" so the caller checks the database.
+    After ``resync`` negatives are distrusted until a fresh scan finishes.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        load: Callable[[], Tuple[int, Iterable[bytes]]],
+        error_rate: float,
+        refresh_seconds: float,
+        min_capacity: int,
+        synced: bool = False,
+        background: bool = True,
+    ):
+        self.app = app
+        self.load = load
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.min_capacity = min_capacity
+        self.synced = synced
+        self.background = background
+        self.rebuilds = 0
+        self.negatives = 0
+        self.positives = 0
+        self.unverified = 0
+        self._bloom: Optional[BloomFilter] = None
+        self._built_at = 0.0
+        self._rebuilding = False
+        # Set by resync: distrust negatives until a scan started after it ends
+        self._resyncing = False
+        self._rescan = False
+        # Keys added while a rebuild scans the table, replayed into its filter
+        self._pending: Optional[List[bytes]] = None
+        self._lock = threading.Lock()
+
+    def _is_stale(self) -> bool:
+        bloom = self._bloom
+        return (
+            bloom is None
+            or bloom.count > bloom.capacity
+            or time.monotonic() - self._built_at > self.refresh_seconds
+        )
+
+    def rebuild(self) -> None:
+        """Start a rebuild unless one is already running."""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+            self._pending = []
+
+        if self.background:
+            threading.Thread(
+                target=self._rebuild_in_context, name="bloom-rebuild", daemon=True
+            ).start()
+        else:
+            self._rebuild()
+
+    def _rebuild_in_context(self) -> None:
+        with self.app.app_context():
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        try:
+            expected, keys = self.load()
+            bloom = BloomFilter(max(self.min_capacity, expected), self.error_rate)
+            for key in keys:
+                bloom.add(key)
+        except Exception:
+            self.app.logger.exception("Bloom filter rebuild failed")
+            with self._lock:
+                self._pending = None
+                self._rebuilding = False
+                # Retry after another refresh interval, not on every lookup
+                self._built_at = time.monotonic()
+            return
+
+        with self._lock:
+            for key in self._pending:
+                bloom.add(key)
+            self._pending = None
+            self._bloom = bloom
+            self._built_at = time.monotonic()
+            self._rebuilding = False
+            self.rebuilds += 1
+            rescan, self._rescan = self._rescan, False
+            if not rescan:
+                self._resyncing = False
+        if rescan:
+            self.rebuild()
+
+    def resync(self) -> None:
+        """
+        Rebuild after keys may have been missed (e.g. a lost bus message).
+
+        Negatives are not trusted until a scan that started after this call
+        has finished.
+        """
+        with self._lock:
+            self._resyncing = True
+            if self._rebuilding:
+                # The running scan may predate the missed keys
+                self._rescan = True
+                return
+        self.rebuild()
+
+    def subscribe(self, bus, namespace: str) -> None:
+        """Add the hex-encoded keys other workers publish to ``namespace``."""
+        bus.subscribe(namespace, lambda key: self.add(bytes.fromhex(key)), self.resync)
+
+    def might_contain(self, key: bytes) -> bool:
+        """False means the key is definitely not in the table."""
+        if self._is_stale():
+            self.rebuild()
+        bloom = self._bloom
+        if bloom is not None and key not in bloom:
+            if self.synced and not self._resyncing:
+                self.negatives += 1
+                return False
+            self.unverified += 1
+            return True
+        self.positives += 1
+        return True
+
+    def add(self, key: bytes) -> None:
+        """Record a committed key."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(key)
+            bloom = self._bloom
+        if bloom is not None:
+            bloom.add(key)
+
+    def stats(self) -> Dict:
+        """Memory usage and hit report for the metrics endpoint."""
+        stats = {
+            "synced": self.synced and not self._resyncing,
+            "rebuilds": self.rebuilds,
+            "definite_negatives": self.negatives,
+            "possible_positives": self.positives,
+            "unverified_negatives": self.unverified,
+        }
+        bloom = self._bloom
+        if bloom is not None:
+            stats.update(bloom.stats())
+        return stats
@@ -0,0 +1,237 @@
+"""Small in-process caches shared by the per-worker services."""
+
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Loader result meaning "does not exist"; cached for ``negative_ttl``
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU whose entries also expire ``ttl`` seconds after being set.
+
+    ``None`` cannot be stored as a value; ``get`` uses it to signal a miss.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, value, seconds the value took to compute)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for ``key``, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self, key: Hashable, value: Any, cost: float = 0.0, ttl: Optional[float] = None
+    ) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used."""
+        with self._lock:
+            self._set_locked(key, value, cost, ttl)
+
+    def _set_locked(
+        self, key: Hashable, value: Any, cost: float, ttl: Optional[float]
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value, cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop ``key`` if cached."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Entry count and hit ratio for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+class _Flight:
+    """One in-progress computation that other callers can wait on."""
+
+    __slots__ = ("done", "value", "error", "invalidated")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        # Set by delete()/clear() while loading: the result may predate the
+        # write, so it is returned but not cached
+        self.invalidated = False
+
+
+class LoadingCache(TTLCache):
+    """
+    TTLCache that computes missing values once per key.
+
+    ``get_or_load`` coalesces concurrent misses: the first caller runs the
+    loader and the others wait for its result instead of repeating the work
+    (singleflight). Hot entries are also refreshed before they expire with
+    probabilistic early expiration (XFetch): a hit recomputes early with a
+    probability that grows as expiry nears and with how long the value took
+    to compute, scaled by ``beta``. Meanwhile other callers keep getting the
+    cached value.
+
+    Loaders may return ``MISSING`` to cache a negative result for
+    ``negative_ttl`` seconds. Values are shared between threads, so loaders
+    should return plain data rather than session-bound ORM objects.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        beta: float = 1.0,
+        timeout: float = 5.0,
+        negative_ttl: float = 0.0,
+    ):
+        super().__init__(max_entries, ttl)
+        self.beta = beta
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.loads = 0
+        self.coalesced = 0
+        self.early_refreshes = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def _should_refresh(self, now: float, expires_at: float, cost: float) -> bool:
+        if self.beta <= 0 or cost <= 0:
+            return False
+        # -log(U) is exponentially distributed, so the refresh time is spread
+        # ahead of expiry in proportion to the compute cost
+        headstart = -cost * self.beta * math.log(random.random() or 1e-12)
+        return now + headstart >= expires_at
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Cached value for ``key``, computing it with ``loader`` when needed.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable producing the value; None results
+                are returned but not cached, ``MISSING`` is cached briefly
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        stale: Any = None
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(key)
+            flight = self._flights.get(key)
+            if entry is not None and now < entry[0]:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                expires_at, value, cost = entry
+                if flight is not None or not self._should_refresh(
+                    now, expires_at, cost
+                ):
+                    return value
+                self.early_refreshes += 1
+                stale = value
+                leader = True
+            elif flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                leader = True
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if flight.done.wait(self.timeout):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            # The leader is stuck; compute this caller's own copy
+            return loader()
+
+        try:
+            started = time.perf_counter()
+            value = loader()
+            self.loads += 1
+            cost = time.perf_counter() - started
+            with self._lock:
+                if value is MISSING and not flight.invalidated:
+                    self._set_locked(key, value, 0.0, self.negative_ttl)
+                elif value is not None and not flight.invalidated:
+                    self._set_locked(key, value, cost, None)
+            flight.value = value
+            return value
+        except Exception as e:
+            if stale is not None:
+                # A failed early refresh keeps serving the unexpired value
+                flight.value = stale
+                return stale
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def delete(self, key: Hashable) -> None:
+        """Drop ``key``, and keep an in-progress load of it out of the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.invalidated = True
+
+    def clear(self) -> None:
+        """Drop every entry and keep in-progress loads out of the cache."""
+        with self._lock:
+            self._entries.clear()
+            for flight in self._flights.values():
+                flight.invalidated = True
+
+    def stats(self) -> Dict:
+        """TTLCache stats plus load, coalescing and early refresh counts."""
+        stats = super().stats()
+        stats.update(
+            {
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "early_refreshes": self.early_refreshes,
+            }
+        )
+        return stats
@@ -0,0 +1,84 @@
+"""Conditional GET: validators computed from row versions, not response bodies."""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag value for a representation identified by ``parts``.
+
+    Parts are the IDs, timestamps and counts the body is built from, so the
+    tag changes whenever the body would, without serializing it.
+    """
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def page_etag(
+    namespace: str, query, id_column, updated_column, page: int, per_page: int, *extra
+) -> str:
+    """
+    ETag for one page of ``query`` from a narrow query of its versions.
+
+    Selects only the page's IDs and ``updated_at`` values, plus the total the
+    pagination block reports, so a match costs no row loads or serialization.
+
+    Args:
+        namespace: Distinguishes endpoints that page the same rows
+        query: Ordered query the endpoint paginates
+        id_column: Primary key column of the rows
+        updated_column: Their ``updated_at`` column
+        page: Page number (1-indexed)
+        per_page: Rows per page, after the endpoint's clamping
+        *extra: Other versions the body depends on, e.g. a profile header
+
+    Returns:
+        ETag value
+    """
+    rows = (
+        query.with_entities(id_column, updated_column)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+        .all()
+    )
+    total = query.order_by(None).count()
+    newest = max((row[1] for row in rows), default=None)
+    return make_etag(
+        namespace, page, per_page, total, [row[0] for row in rows], newest, *extra
+    )
+
+
+def conditional(
+    etag: str,
+    render: Callable[[], Response],
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """
+    Answer a GET with 304 when the client's copy is current, else render it.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since``, which is
+    only honoured when ``last_modified`` is given.
+
+    Args:
+        etag: Current ETag value (see ``make_etag``)
+        render: Builds the full response; not called for a 304
+        last_modified: Naive-UTC time of the last change, when one timestamp
+            covers everything in the body
+
+    Returns:
+        Response carrying the validators
+    """
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = render()
+    else:
+        response = Response(status=304)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
@@ -1,7 +1,9 @@
 """Custom decorators for route protection."""
 
 from functools import wraps
-from flask import request, jsonify
+from flask import g, request, jsonify
+from twitter_api.services.token_revocation import is_token_revoked
+from twitter_api.services.user_loader import load_user
 from twitter_api.utils.jwt import decode_access_token
 
 
@@ -13,7 +15,8 @@ def token_required(f):
         @bp.route('/protected')
         @token_required
         def protected_route(current_user):
-            # current_user contains the decoded token payload
+            # current_user contains the decoded token payload;
+            # load_user(g.user_id) fetches the row at most once per request
             return jsonify({'user_id': current_user['user_id']})
     """
 
@@ -37,6 +40,11 @@ def token_required(f):
         current_user = decode_access_token(token)
         if current_user is None:
             return jsonify({"error": "Invalid or expired token"}), 401
+        # In-memory check; no database round trip
+        if is_token_revoked(current_user):
+            return jsonify({"error": "Token has been revoked"}), 401
+        g.user_id = current_user["user_id"]
+        g.access_token = token
 
         # Pass the current_user to the route function
         return f(current_user, *args, **kwargs)
@@ -73,6 +81,36 @@ def optional_token(f):
                 current_user = decode_access_token(token)
             except (IndexError, AttributeError):
                 pass
+        if current_user is not None and is_token_revoked(current_user):
+            current_user = None
+        if current_user is not None:
+            g.user_id = current_user["user_id"]
+
+        return f(current_user, *args, **kwargs)
+
+    return decorated
+
+
+def admin_required(f):
+    """
+    Decorator to require an authenticated admin user.
+
+    Runs the ``token_required`` checks, then answers 403 unless the user's
+    row has ``is_admin`` set.
+
+    Usage:
+        @bp.route('/admin-only')
+        @admin_required
+        def admin_route(current_user):
+            return jsonify({'ok': True})
+    """
+
+    @wraps(f)
+    @token_required
+    def decorated(current_user, *args, **kwargs):
+        user = load_user(current_user["user_id"])
+        if user is None or not user.is_admin:
+            return jsonify({"error": "Admin access required"}), 403
 
         return f(current_user, *args, **kwargs)
 
@@ -1,10 +1,91 @@
 """JWT token utilities."""
 
+import hashlib
+import secrets
+import threading
+import time
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from flask import current_app
 
+from twitter_api.utils.local_state import get_local
+
+
+class VerifiedTokenCache:
+    """
+    LRU of decoded claims for tokens that already passed verification.
+
+    Keyed by a SHA-256 digest of the token so raw tokens are not kept in
+    memory. Entries are dropped once the token's ``exp`` passes, when evicted,
+    or when invalidated (e.g. on revocation).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Cached claims for ``token``, or None if absent or expired."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, claims: Dict) -> None:
+        """Remember verified ``claims`` until their ``exp``."""
+        if self.max_entries <= 0 or "exp" not in claims:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(claims["exp"]), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """Forget ``token`` so the next request verifies it again."""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def stats(self) -> Dict:
+        """Entry count and hit ratio for the metrics endpoint."""
+        with self._lock:
+            entries = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    """Get this worker's verified-token cache."""
+    return get_local(
+        "token_cache",
+        lambda: VerifiedTokenCache(current_app.config["JWT_CACHE_SIZE"]),
+    )
+
 
 def create_access_token(user_id: int, username: str) -> str:
     """
@@ -22,6 +103,8 @@ def create_access_token(user_id: int, username: str) -> str:
         "username": username,
         "exp": datetime.utcnow() + timedelta(hours=24),
         "iat": datetime.utcnow(),
+        # Token ID, so a single token can be revoked
+        "jti": secrets.token_hex(16),
     }
     token = jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
     return token
@@ -31,18 +114,38 @@ def decode_access_token(token: str) -> Optional[Dict]:
     """
     Decode a JWT access token.
 
+    Tokens verified earlier in this worker are served from the verified-token
+    cache; only valid tokens are cached.
+
     Args:
         token: JWT token string
 
     Returns:
         Decoded payload dict if valid, None if invalid or expired
     """
+    cache = get_token_cache()
+    payload = cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token, current_app.config["SECRET_KEY"], algorithms=["HS256"]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+
+    cache.put(token, payload)
+    return payload
+
+
+def invalidate_cached_token(token: str) -> None:
+    """
+    Drop ``token`` from this worker's verified-token cache.
+
+    Call this whenever a token is revoked so a cached entry cannot outlive
+    the revocation.
+    """
+    get_token_cache().invalidate(token)
@@ -0,0 +1,25 @@
+"""Load shedding: bounded pools and queues refuse work with a 503."""
+
+from flask import Flask, jsonify
+
+BUSY_MESSAGE = "Server is busy, please try again later"
+
+# Seconds clients are asked to wait before retrying
+RETRY_AFTER = "1"
+
+
+class ServerBusy(Exception):
+    """
+    Raised when a bounded pool or queue cannot take more work.
+
+    The request was not carried out, so a retry is safe. Views let it
+    propagate; ``init_load_shedding`` turns it into a 503.
+    """
+
+
+def init_load_shedding(app: Flask) -> None:
+    """Answer ServerBusy from any view with 503 and Retry-After."""
+
+    @app.errorhandler(ServerBusy)
+    def server_busy(error):
+        return jsonify({"error": BUSY_MESSAGE}), 503, {"Retry-After": RETRY_AFTER}
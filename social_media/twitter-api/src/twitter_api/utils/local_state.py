@@ -0,0 +1,57 @@
+"""Per-worker state shared by all requests handled in the same process."""
+
+import threading
+from typing import Any, Callable, Dict
+
+from flask import Flask, current_app
+
+EXTENSION_KEY = "twitter_api.local_state"
+
+_lock = threading.Lock()
+
+
+def get_local(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Get the per-worker object registered under ``name``.
+
+    The object is created with ``factory`` on first use and kept on the
+    current app, so every request in this worker shares it.
+
+    Args:
+        name: Registry key, e.g. "follow_filter"
+        factory: Zero-argument callable building the object
+
+    Returns:
+        The shared object
+    """
+    state = current_app.extensions.setdefault(EXTENSION_KEY, {})
+    try:
+        return state[name]
+    except KeyError:
+        with _lock:
+            if name not in state:
+                state[name] = factory()
+            return state[name]
+
+
+def local_stats(app: Flask) -> Dict[str, Dict]:
+    """Collect ``stats()`` from every registered object that provides it."""
+    state = app.extensions.get(EXTENSION_KEY, {})
+    return {
+        name: obj.stats()
+        for name, obj in sorted(state.items())
+        if callable(getattr(obj, "stats", None))
+    }
+
+
+def reset_local(app: Flask) -> None:
+    """
+    Drop all per-worker state for ``app`` (used by tests between databases).
+
+    Objects providing ``close()`` (e.g. executors) are closed first.
+    """
+    state = app.extensions.pop(EXTENSION_KEY, {})
+    for obj in state.values():
+        close = getattr(obj, "close", None)
+        if callable(close):
+            close()
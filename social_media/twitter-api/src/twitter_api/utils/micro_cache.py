@@ -0,0 +1,107 @@
+"""Per-worker micro-cache of anonymous responses from public read endpoints."""
+
+import functools
+from typing import Callable, Optional, Tuple
+
+from flask import Flask, Response, current_app, request
+
+from twitter_api.utils.cache import LoadingCache
+from twitter_api.utils.local_state import get_local
+
+# Cached endpoints with their TTL (config key). Only anonymous GETs are
+# cached; requests carrying a token always reach the view.
+ROUTE_TTLS = {
+    "feed.get_global_feed": "MICRO_CACHE_TTL_GLOBAL_FEED",
+    "tweets.get_tweets": "MICRO_CACHE_TTL_TWEETS",
+    "tweets.get_tweet": "MICRO_CACHE_TTL_TWEET",
+    "users.get_users": "MICRO_CACHE_TTL_USERS",
+}
+
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# A rendered response: (status, body, headers)
+Snapshot = Tuple[int, bytes, list]
+
+
+def get_response_cache(endpoint: str) -> LoadingCache:
+    """Get this worker's response cache for one endpoint."""
+    config = current_app.config
+    return get_local(
+        f"response_cache:{endpoint}",
+        lambda: LoadingCache(
+            config["MICRO_CACHE_SIZE"],
+            config[ROUTE_TTLS[endpoint]],
+            0,  # entries live about a second; early refresh would only add load
+            config["CACHE_LOAD_TIMEOUT"],
+        ),
+    )
+
+
+def _cache_key() -> Tuple:
+    """Path plus query parameters in a canonical order."""
+    return (request.path, tuple(sorted(request.args.items(multi=True))))
+
+
+def _bypass() -> bool:
+    return (
+        not current_app.config["MICRO_CACHE_ENABLED"]
+        or request.method != "GET"
+        or "Authorization" in request.headers
+    )
+
+
+def _snapshot(response: Response) -> Snapshot:
+    headers = [(k, v) for k, v in response.headers if k != "Content-Length"]
+    return response.status_code, response.get_data(), headers
+
+
+def _cached(endpoint: str, view: Callable) -> Callable:
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if _bypass():
+            return view(*args, **kwargs)
+
+        cache = get_response_cache(endpoint)
+        key = _cache_key()
+        if any(header in request.headers for header in CONDITIONAL_HEADERS):
+            # The view may answer 304, which must not be shared, so only a
+            # cached full response is used here
+            snapshot = cache.get(key)
+            if snapshot is None:
+                return view(*args, **kwargs)
+        else:
+            rendered: Optional[Response] = None
+
+            def render() -> Optional[Snapshot]:
+                nonlocal rendered
+                rendered = current_app.make_response(view(*args, **kwargs))
+                # Server errors are returned but not cached
+                if rendered.status_code >= 500:
+                    return None
+                return _snapshot(rendered)
+
+            snapshot = cache.get_or_load(key, render)
+            if rendered is not None:
+                return rendered
+            if snapshot is None:
+                # Shared a load whose response was not cacheable
+                return view(*args, **kwargs)
+
+        status, body, headers = snapshot
+        response = Response(body, status, headers)
+        if status == 200:
+            response.make_conditional(request)
+        return response
+
+    return wrapper
+
+
+def init_micro_cache(app: Flask) -> None:
+    """
+    Wrap the public read endpoints in ROUTE_TTLS with the micro-cache.
+
+    Call after the blueprints are registered. The wrappers pass through while
+    MICRO_CACHE_ENABLED is false (the testing default).
+    """
+    for endpoint in ROUTE_TTLS:
+        app.view_functions[endpoint] = _cached(endpoint, app.view_functions[endpoint])
@@ -0,0 +1,90 @@
+"""MinHash signatures and LSH banding for approximate set similarity."""
+
+import hashlib
+from typing import Iterable, List
+
+import numpy as np
+
+# Signature length and banding. 32 bands of 2 rows surface pairs with a
+# Jaccard similarity around (1/32) ** (1/2) ~= 0.18 or more. Changing these
+# invalidates stored signatures; rebuild them with scripts/graph_jobs.py.
+NUM_PERM = 64
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Universal hashing h(x) = (a * x + b) mod p with a Mersenne prime that keeps
+# every product inside int64 for 31-bit IDs.
+PRIME = (1 << 31) - 1
+EMPTY = PRIME
+
+# IDs hashed per step; bounds the NUM_PERM x chunk intermediate array
+CHUNK_SIZE = 16384
+
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(1, PRIME, NUM_PERM, dtype=np.int64)
+_B = _rng.integers(0, PRIME, NUM_PERM, dtype=np.int64)
+
+
+def empty_signature() -> np.ndarray:
+    """Signature of the empty set."""
+    return np.full(NUM_PERM, EMPTY, dtype=np.uint32)
+
+
+def signature(ids: Iterable[int]) -> np.ndarray:
+    """Compute the MinHash signature of a set of IDs."""
+    values = np.fromiter(ids, dtype=np.int64)
+    result = empty_signature()
+    for start in range(0, len(values), CHUNK_SIZE):
+        chunk = values[start : start + CHUNK_SIZE]
+        hashed = (_A[:, None] * chunk[None, :] + _B[:, None]) % PRIME
+        result = np.minimum(result, hashed.min(axis=1).astype(np.uint32))
+    return result
+
+
+def add_to_signature(current: np.ndarray, value: int) -> np.ndarray:
+    """Return ``current`` updated with one more member."""
+    hashed = ((_A * value + _B) % PRIME).astype(np.uint32)
+    return np.minimum(current, hashed)
+
+
+def is_empty(sig: np.ndarray) -> bool:
+    """True for the signature of an empty set."""
+    return bool(np.all(sig == EMPTY))
+
+
+def band_buckets(sig: np.ndarray) -> List[int]:
+    """
+    LSH bucket of each band, as signed 64-bit integers.
+
+    Two sets land in the same bucket for a band when all of that band's
+    rows agree.
+    """
+    data = sig.astype("<u4").tobytes()
+    width = ROWS_PER_BAND * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                data[band * width : (band + 1) * width], digest_size=8
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def estimate_jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures."""
+    if is_empty(left) or is_empty(right):
+        return 0.0
+    return float(np.mean(left == right))
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    """Serialize a signature for storage."""
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    """Deserialize a stored signature."""
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
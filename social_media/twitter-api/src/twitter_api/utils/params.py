@@ -0,0 +1,42 @@
+"""Query-string parsing helpers shared by routes."""
+
+from typing import List, Optional, Tuple
+
+# IDs are positive BIGINTs; anything else cannot match a row (and would
+# overflow the database driver)
+MAX_ID = 2**63 - 1
+
+
+def parse_id_list(
+    raw: Optional[str], max_ids: int
+) -> Tuple[Optional[List[int]], Optional[str]]:
+    """
+    Parse a comma-separated ``ids`` query parameter.
+
+    Duplicates are dropped while keeping the first-seen order. IDs outside
+    1..MAX_ID are rejected like non-integers.
+
+    Args:
+        raw: Raw parameter value, e.g. "3,1,2"
+        max_ids: Maximum number of distinct IDs accepted
+
+    Returns:
+        Tuple of (ids, error_message)
+    """
+    if not raw:
+        return None, "ids is required"
+
+    try:
+        ids = [int(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        return None, "ids must be a comma-separated list of integers"
+    if any(not 0 < id_ <= MAX_ID for id_ in ids):
+        return None, "ids must be a comma-separated list of integers"
+
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return None, "ids is required"
+    if len(ids) > max_ids:
+        return None, f"At most {max_ids} ids can be requested at once"
+
+    return ids, None
@@ -1,24 +1,103 @@
 """Password hashing utilities using bcrypt."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, TypeVar
+
 import bcrypt
+from flask import Flask, current_app
+
+from twitter_api.utils.load_shedding import ServerBusy
+from twitter_api.utils.local_state import get_local
+
+T = TypeVar("T")
+
 
+# bcrypt's own default cost, used when nothing else is configured
+DEFAULT_ROUNDS = 12
 
-def hash_password(password: str) -> str:
+# Range searched by calibrate_rounds(); bcrypt accepts 4-31
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+def hash_password(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
     """
     Hash a password using bcrypt.
 
     Args:
         password: Plain text password to hash
+        rounds: bcrypt cost factor (log2 of the work); each step doubles it
 
     Returns:
         Hashed password as a string
     """
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
 
+def hash_rounds(hashed_password: str) -> int:
+    """Cost factor a bcrypt hash was created with ("$2b$<rounds>$...")."""
+    return int(hashed_password.split("$")[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    True when a stored hash was made at a lower cost than the configured one.
+
+    Higher-cost hashes are kept: with ``"auto"`` each worker calibrates on
+    its own and may land a step apart, and rehashing in both directions
+    would rewrite the hash on every login served by the other worker.
+    """
+    return hash_rounds(hashed_password) < current_app.config["BCRYPT_ROUNDS"]
+
+
+def calibrate_rounds(
+    target_ms: float, min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS
+) -> int:
+    """
+    Pick the highest bcrypt cost whose hash time stays under ``target_ms``.
+
+    Times one hash per cost on this machine, stopping at the first cost over
+    the target, so calibration takes at most about twice the target.
+
+    Returns:
+        Chosen cost, never below ``min_rounds``
+    """
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        started = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds))
+        if (time.perf_counter() - started) * 1000 > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def configure_password_hashing(app: Flask) -> None:
+    """
+    Resolve ``BCRYPT_ROUNDS`` to an integer cost at startup.
+
+    ``"auto"`` calibrates against ``BCRYPT_TARGET_MS`` on this hardware;
+    anything else is used as the cost directly.
+    """
+    rounds = str(app.config["BCRYPT_ROUNDS"]).strip().lower()
+    if rounds == "auto":
+        cost = calibrate_rounds(app.config["BCRYPT_TARGET_MS"])
+        app.logger.info(
+            "bcrypt cost calibrated to %d (target %sms)",
+            cost,
+            app.config["BCRYPT_TARGET_MS"],
+        )
+    else:
+        cost = int(rounds)
+    app.config["BCRYPT_ROUNDS"] = cost
+
+
 def verify_password(password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hashed password.
@@ -33,3 +112,133 @@ def verify_password(password: str, hashed_password: str) -> bool:
     password_bytes = password.encode("utf-8")
     hashed_bytes = hashed_password.encode("utf-8")
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+class PasswordHasherBusy(ServerBusy):
+    """Raised when the password hashing pool cannot take more work."""
+
+
+class PasswordHasher:
+    """
+    Size-limited executor for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so a small thread pool runs hashes
+    in parallel without tying up request threads beyond the wait itself.
+    At most ``max_workers + max_queue`` tasks are admitted; further callers
+    are rejected immediately so a login burst cannot stall other traffic.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+
+    def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run ``func(*args)`` on the pool and wait for the result.
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated or the result does
+                not arrive within ``timeout`` seconds
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy()
+
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                self._slots.release()
+                self._record(started - submitted, finished - started)
+
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(task)
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self._completed += 1
+            self._queue_wait_total += queue_wait
+            self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+            self._hash_time_total += hash_time
+            self._hash_time_max = max(self._hash_time_max, hash_time)
+
+    def stats(self) -> Dict:
+        """Queue wait versus hash time for the metrics endpoint."""
+        with self._lock:
+            completed = self._completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "queue_wait_avg_ms": (
+                    round(self._queue_wait_total / completed * 1000, 3)
+                    if completed
+                    else None
+                ),
+                "queue_wait_max_ms": round(self._queue_wait_max * 1000, 3),
+                "hash_time_avg_ms": (
+                    round(self._hash_time_total / completed * 1000, 3)
+                    if completed
+                    else None
+                ),
+                "hash_time_max_ms": round(self._hash_time_max * 1000, 3),
+            }
+
+    def close(self) -> None:
+        """Stop accepting work and let idle threads exit."""
+        self._executor.shutdown(wait=False)
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get this worker's password hashing pool."""
+    config = current_app.config
+    return get_local(
+        "password_hasher",
+        lambda: PasswordHasher(
+            config["PASSWORD_HASH_WORKERS"],
+            config["PASSWORD_HASH_QUEUE_SIZE"],
+            config["PASSWORD_HASH_TIMEOUT"],
+        ),
+    )
+
+
+def hash_password_pooled(password: str) -> str:
+    """
+    Hash a password at the configured cost on this worker's bounded pool
+    (see PasswordHasher).
+    """
+    rounds = current_app.config["BCRYPT_ROUNDS"]
+    return get_password_hasher().run(hash_password, password, rounds)
+
+
+def verify_password_pooled(password: str, hashed_password: str) -> bool:
+    """Verify a password on this worker's bounded pool (see PasswordHasher)."""
+    return get_password_hasher().run(verify_password, password, hashed_password)
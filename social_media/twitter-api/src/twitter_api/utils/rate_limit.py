@@ -0,0 +1,269 @@
+"""Sliding-window rate limiting for API requests."""
+
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, current_app, g, jsonify, request
+
+from twitter_api.utils.jwt import decode_access_token
+from twitter_api.utils.local_state import get_local
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Endpoints with their own policy (config key); everything else shares
+# RATE_LIMIT_DEFAULT. Health checks, metrics and docs are not limited.
+ROUTE_POLICIES = {
+    "auth.login": "RATE_LIMIT_LOGIN",
+    "auth.register": "RATE_LIMIT_REGISTER",
+    "auth.availability": "RATE_LIMIT_AVAILABILITY",
+    "feed.get_feed": "RATE_LIMIT_FEED",
+    "feed.get_global_feed": "RATE_LIMIT_FEED",
+}
+EXEMPT_ENDPOINTS = {"health_check", "metrics", "index", "static"}
+
+# Result of a hit: (allowed, remaining, retry_after_seconds)
+Decision = Tuple[bool, int, int]
+
+
+@lru_cache(maxsize=64)
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse "<count>/<period>", e.g. "10/minute" or "100/hour".
+
+    Returns:
+        Tuple of (limit, window_seconds)
+    """
+    count, _, period = rate.partition("/")
+    period = period.strip().lower().rstrip("s") or "minute"
+    if period not in PERIODS:
+        raise ValueError(f"Unknown rate limit period: {rate!r}")
+    return int(count), float(PERIODS[period])
+
+
+def _decide(
+    previous: int, current: int, elapsed: float, limit: int, window: float
+) -> Decision:
+    """
+    Sliding-window estimate from two fixed-window counters.
+
+    The previous window's count is weighted by how much of it still overlaps
+    the sliding window, which approximates a true sliding log in O(1) space.
+    """
+    weight = 1.0 - elapsed / window
+    if previous * weight + current + 1 <= limit:
+        remaining = int(limit - (previous * weight + current + 1))
+        return True, max(remaining, 0), 0
+
+    if current + 1 > limit or previous == 0:
+        # Blocked until the next window starts
+        wait = window - elapsed
+    else:
+        # Wait until enough of the previous window has slid out
+        wait = window * (1.0 - (limit - current - 1) / previous) - elapsed
+        wait = min(max(wait, 0.0), window - elapsed)
+    return False, 0, max(1, math.ceil(wait))
+
+
+class MemoryRateLimitStore:
+    """
+    In-process counters: two integers and a window start per key.
+
+    Keys idle for two windows are pruned every ``prune_every`` hits, so memory
+    tracks the number of recently active clients.
+    """
+
+    def __init__(self, prune_every: int = 10000):
+        self.prune_every = prune_every
+        self.allowed = 0
+        self.limited = 0
+        # key -> [window_start, previous_count, current_count, window]
+        self._counters: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._hits_since_prune = 0
+
+    def hit(self, key: str, limit: int, window: float) -> Decision:
+        """Count one request against ``key`` and decide whether to allow it."""
+        now = time.time()
+        start = now - now % window
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [start, 0, 0, window]
+            elif counter[0] != start:
+                # Roll forward; a gap of more than one window clears both
+                previous = counter[2] if start - counter[0] == window else 0
+                counter[:3] = [start, previous, 0]
+
+            allowed, remaining, retry_after = _decide(
+                counter[1], counter[2], now - start, limit, window
+            )
+            if allowed:
+                counter[2] += 1
+                self.allowed += 1
+            else:
+                self.limited += 1
+
+            self._hits_since_prune += 1
+            if self._hits_since_prune >= self.prune_every:
+                self._prune(now)
+        return allowed, remaining, retry_after
+
+    def _prune(self, now: float) -> None:
+        self._hits_since_prune = 0
+        stale = [
+            key
+            for key, (start, _, _, window) in self._counters.items()
+            if now - start >= 2 * window
+        ]
+        for key in stale:
+            del self._counters[key]
+
+    def stats(self) -> Dict:
+        """Tracked keys and decisions for the metrics endpoint."""
+        return {
+            "backend": "memory",
+            "keys": len(self._counters),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class RedisRateLimitStore:
+    """
+    Counters shared by every worker through Redis.
+
+    Uses the same two-window estimate as the memory store, with one INCR and
+    one GET per request. Needs the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_STORAGE_URL points at Redis; pip install redis"
+            ) from e
+        self._redis = redis.Redis.from_url(url)
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, key: str, limit: int, window: float) -> Decision:
+        """Count one request against ``key`` and decide whether to allow it."""
+        now = time.time()
+        start = int(now - now % window)
+        current_key = f"ratelimit:{key}:{start}"
+        previous_key = f"ratelimit:{key}:{start - int(window)}"
+
+        pipe = self._redis.pipeline()
+        pipe.incr(current_key)
+        pipe.expire(current_key, int(window * 2))
+        pipe.get(previous_key)
+        current, _, previous = pipe.execute()
+
+        # The INCR already counted this request
+        allowed, remaining, retry_after = _decide(
+            int(previous or 0), current - 1, now - start, limit, window
+        )
+        if allowed:
+            self.allowed += 1
+        else:
+            # Rejected requests do not count against the window
+            self._redis.decr(current_key)
+            self.limited += 1
+        return allowed, remaining, retry_after
+
+    def stats(self) -> Dict:
+        """Decisions made by this worker for the metrics endpoint."""
+        return {"backend": "redis", "allowed": self.allowed, "limited": self.limited}
+
+
+def get_rate_limit_store():
+    """Get this worker's rate limit store (memory or Redis)."""
+    url = current_app.config["RATE_LIMIT_STORAGE_URL"]
+
+    def build():
+        if url.startswith(("redis://", "rediss://")):
+            return RedisRateLimitStore(url)
+        return MemoryRateLimitStore()
+
+    return get_local("rate_limits", build)
+
+
+def _client_identity() -> str:
+    """JWT user ID when a valid token is sent, else the client IP."""
+    auth_header = request.headers.get("Authorization", "")
+    if auth_header.startswith("Bearer "):
+        claims = decode_access_token(auth_header[7:])
+        if claims is not None:
+            return f"user:{claims['user_id']}"
+    return f"ip:{request.remote_addr}"
+
+
+def _policy(endpoint: str) -> Tuple[str, Optional[str]]:
+    """Bucket name and rate for an endpoint."""
+    config_key = ROUTE_POLICIES.get(endpoint)
+    if config_key is None:
+        return "default", current_app.config["RATE_LIMIT_DEFAULT"]
+    return endpoint, current_app.config[config_key]
+
+
+def check_rate_limit():
+    """before_request hook: reject over-limit clients with 429 + Retry-After."""
+    if not current_app.config["RATE_LIMIT_ENABLED"]:
+        return None
+    endpoint = request.endpoint
+    if (
+        endpoint is None
+        or endpoint in EXEMPT_ENDPOINTS
+        or endpoint.startswith("flasgger")
+    ):
+        return None
+
+    bucket, rate = _policy(endpoint)
+    if not rate:
+        return None
+    limit, window = parse_rate(rate)
+
+    # Login is throttled per IP even when a token is sent, so credential
+    # guessing cannot rotate identities
+    identity = (
+        f"ip:{request.remote_addr}" if endpoint == "auth.login" else _client_identity()
+    )
+    allowed, remaining, retry_after = get_rate_limit_store().hit(
+        f"{bucket}:{identity}", limit, window
+    )
+    if not allowed:
+        response = jsonify({"error": "Rate limit exceeded"})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(retry_after)
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = "0"
+        return response
+
+    g.rate_limit = (limit, remaining)
+    return None
+
+
+def add_rate_limit_headers(response):
+    """after_request hook: report the caller's remaining budget."""
+    rate_limit = g.pop("rate_limit", None)
+    if rate_limit is not None:
+        response.headers["X-RateLimit-Limit"] = str(rate_limit[0])
+        response.headers["X-RateLimit-Remaining"] = str(rate_limit[1])
+    return response
+
+
+def init_rate_limiting(app: Flask) -> None:
+    """
+    Install the limiter hooks.
+
+    They are no-ops while RATE_LIMIT_ENABLED is false (the testing default).
+    """
+    for config_key in ["RATE_LIMIT_DEFAULT", *ROUTE_POLICIES.values()]:
+        if app.config[config_key]:
+            parse_rate(app.config[config_key])  # fail fast on typos
+    app.before_request(check_rate_limit)
+    app.after_request(add_rate_limit_headers)
@@ -0,0 +1,212 @@
+"""Time-ordered 64-bit IDs (Snowflake layout) assigned without a database trip."""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app
+
+from twitter_api.utils.local_state import get_local
+
+# Layout, high to low: 41 bits of milliseconds since EPOCH_MS (~69 years),
+# 10 bits of worker ID, 12 bits of per-millisecond sequence. The sign bit
+# stays clear so IDs fit a signed BIGINT.
+EPOCH_MS = 1136073600000  # 2006-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+# Worker ID reserved for IDs of imported historical rows, so they never
+# collide with live IDs (see SnowflakeGenerator.id_at)
+DEFAULT_BACKFILL_WORKER_ID = MAX_WORKER_ID
+
+
+def _to_ms(when: datetime) -> int:
+    """Milliseconds since the Unix epoch for a naive-UTC or aware datetime."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp() * 1000)
+
+
+def id_timestamp(snowflake_id: int) -> datetime:
+    """Naive-UTC time embedded in an ID (millisecond precision)."""
+    ms = (snowflake_id >> TIMESTAMP_SHIFT) + EPOCH_MS
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def min_id_at(when: datetime) -> int:
+    """Smallest ID that can be assigned at ``when``; for time-range filters."""
+    return max(_to_ms(when) - EPOCH_MS, 0) << TIMESTAMP_SHIFT
+
+
+def default_worker_id(reserved: int = DEFAULT_BACKFILL_WORKER_ID) -> int:
+    """
+    Worker ID from the process ID, skipping the ``reserved`` backfill ID.
+
+    Unique among the workers of one host unless their PIDs differ by a
+    multiple of 1023; deployments with several hosts must set
+    ``SNOWFLAKE_WORKER_ID`` per worker instead.
+    """
+    worker_id = os.getpid() % MAX_WORKER_ID
+    return worker_id + (worker_id >= reserved)
+
+
+class SnowflakeGenerator:
+    """
+    Thread-safe generator of increasing IDs for one worker.
+
+    The timestamp never moves backwards: if the clock steps back, or the
+    sequence runs out within a millisecond, IDs continue from the last
+    millisecond used rather than waiting for the clock.
+
+    Past timestamps (imports) use ``backfill_worker_id``, which no live
+    worker may use, with sequences that start after the IDs already stored.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        clock: Callable[[], float] = time.time,
+        backfill_worker_id: int = DEFAULT_BACKFILL_WORKER_ID,
+    ):
+        for value in (worker_id, backfill_worker_id):
+            if not 0 <= value <= MAX_WORKER_ID:
+                raise ValueError(f"Worker ID must be between 0 and {MAX_WORKER_ID}")
+        if worker_id == backfill_worker_id:
+            raise ValueError(f"Worker ID {worker_id} is reserved for backfilled IDs")
+        self.worker_id = worker_id
+        self.backfill_worker_id = backfill_worker_id
+        self.clock = clock
+        self.issued = 0
+        self.backfilled = 0
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _compose(self, ms: int, sequence: int, worker_id: Optional[int] = None) -> int:
+        if worker_id is None:
+            worker_id = self.worker_id
+        return (ms << TIMESTAMP_SHIFT) | (worker_id << SEQUENCE_BITS) | sequence
+
+    def _past_ms(self, when: datetime) -> Optional[int]:
+        """Milliseconds since EPOCH_MS if ``when`` is in the past, else None."""
+        ms = _to_ms(when) - EPOCH_MS
+        if ms < 0:
+            raise ValueError("Timestamp is before the ID epoch")
+        now_ms = int(self.clock() * 1000) - EPOCH_MS
+        with self._lock:
+            return ms if ms < max(now_ms, self._last_ms) else None
+
+    def next_id(self) -> int:
+        """Next ID for a row created now."""
+        with self._lock:
+            ms = int(self.clock() * 1000) - EPOCH_MS
+            if ms > self._last_ms:
+                self._last_ms = ms
+                self._sequence = 0
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_ms += 1
+                self._sequence = 0
+            self.issued += 1
+            return self._compose(self._last_ms, self._sequence)
+
+    def backfill_sequences(
+        self,
+        whens: Iterable[datetime],
+        stored: Callable[[List[Tuple[int, int]]], Iterable[int]],
+    ) -> Dict[int, int]:
+        """
+        Next free backfill sequence for each past millisecond in ``whens``.
+
+        Args:
+            whens: Timestamps about to be passed to ``id_at``
+            stored: Called with inclusive (low, high) ID ranges, one per
+                millisecond; returns the IDs already stored in them
+
+        Returns:
+            Dict to pass to ``id_at`` for those timestamps
+
+        Raises:
+            ValueError: If a timestamp is before the ID epoch
+        """
+        ranges = sorted(
+            {
+                (
+                    self._compose(ms, 0, self.backfill_worker_id),
+                    self._compose(ms, MAX_SEQUENCE, self.backfill_worker_id),
+                )
+                for ms in map(self._past_ms, whens)
+                if ms is not None
+            }
+        )
+        sequences = {low >> TIMESTAMP_SHIFT: 0 for low, _ in ranges}
+        for stored_id in stored(ranges):
+            ms = stored_id >> TIMESTAMP_SHIFT
+            sequence = (stored_id & MAX_SEQUENCE) + 1
+            sequences[ms] = max(sequences.get(ms, 0), sequence)
+        return sequences
+
+    def id_at(self, when: datetime, sequences: Dict[int, int]) -> int:
+        """
+        ID for a row stamped ``when``, e.g. an imported historical tweet.
+
+        Past timestamps take the next sequence in their millisecond from
+        ``sequences`` (see ``backfill_sequences``) under the backfill worker
+        ID, so they cannot collide with live IDs or earlier imports. Current
+        or future ones use ``next_id()``.
+
+        Raises:
+            ValueError: If ``when`` is before the ID epoch, or its millisecond
+                already holds 4096 backfilled IDs
+        """
+        ms = self._past_ms(when)
+        if ms is None:
+            return self.next_id()
+        with self._lock:
+            sequence = sequences.get(ms, 0)
+            if sequence > MAX_SEQUENCE:
+                raise ValueError(
+                    f"More than {MAX_SEQUENCE + 1} rows share the timestamp "
+                    f"{when.isoformat()}"
+                )
+            sequences[ms] = sequence + 1
+            self.backfilled += 1
+            return self._compose(ms, sequence, self.backfill_worker_id)
+
+    def stats(self) -> Dict:
+        """Worker ID and counts for the metrics endpoint."""
+        return {
+            "worker_id": self.worker_id,
+            "backfill_worker_id": self.backfill_worker_id,
+            "issued": self.issued,
+            "backfilled": self.backfilled,
+        }
+
+
+def get_id_generator() -> SnowflakeGenerator:
+    """Get this worker's ID generator."""
+    config = current_app.config
+    configured = config["SNOWFLAKE_WORKER_ID"]
+    backfill_worker_id = config["SNOWFLAKE_BACKFILL_WORKER_ID"]
+    return get_local(
+        "id_generator",
+        lambda: SnowflakeGenerator(
+            (
+                default_worker_id(backfill_worker_id)
+                if configured in (None, "")
+                else int(configured)
+            ),
+            backfill_worker_id=backfill_worker_id,
+        ),
+    )
+
+
+def next_tweet_id() -> int:
+    """Column default for ``Tweet.id``."""
+    return get_id_generator().next_id()
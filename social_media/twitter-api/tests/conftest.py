@@ -2,6 +2,7 @@
 import pytest
 from twitter_api.app import create_app
 from twitter_api.database import db as _db
+from twitter_api.utils.local_state import reset_local
 
 
 @pytest.fixture(scope="session")
@@ -21,6 +22,7 @@ def client(app):
 def db(app):
     """Create database for testing."""
     with app.app_context():
+        reset_local(app)
         _db.create_all()
         yield _db
         _db.session.remove()
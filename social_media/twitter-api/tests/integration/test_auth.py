@@ -1,5 +1,18 @@
 """Integration tests for authentication endpoints."""
+from datetime import datetime
+
+from sqlalchemy import event
+
+from twitter_api.models.revoked_token import RevokedToken
 from twitter_api.models.user import User
+from twitter_api.services.token_revocation import get_revocation_list
+from twitter_api.utils.jwt import decode_access_token
+from twitter_api.utils.password import (
+    PasswordHasherBusy,
+    hash_password,
+    hash_rounds,
+    verify_password,
+)
 
 
 def test_user_registration(client, db):
@@ -92,6 +105,43 @@ def test_user_registration_duplicate_email(client, db):
     assert "Email already exists" in response.get_json()["error"]
 
 
+def test_user_registration_duplicate_caught_by_constraint(client, db):
+    """Test duplicates are rejected by the INSERT, without lookups before it."""
+    db.session.add(User(
+        username="existing", email="existing@example.com", password_hash="x"
+    ))
+    db.session.add(User(
+        username="other", email="other@example.com", password_hash="x"
+    ))
+    db.session.commit()
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        username_taken = client.post('/api/auth/register', json={
+            "username": "existing",
+            "email": "new@example.com",
+            "password": "password123"
+        })
+        email_taken = client.post('/api/auth/register', json={
+            "username": "newuser",
+            "email": "other@example.com",
+            "password": "password123"
+        })
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert username_taken.status_code == 400
+    assert username_taken.get_json()["error"] == "Username already exists"
+    assert email_taken.status_code == 400
+    assert email_taken.get_json()["error"] == "Email already exists"
+    assert [s for s in statements if "FROM users" in s] == []
+    assert len([s for s in statements if s.startswith("INSERT INTO users")]) == 2
+
+
 def test_user_registration_invalid_email(client, db):
     """Test registration with invalid email format."""
     response = client.post('/api/auth/register', json={
@@ -116,6 +166,71 @@ def test_user_registration_short_password(client, db):
     assert "at least 8 characters" in response.get_json()["error"]
 
 
+def test_availability(client, db):
+    """Test availability answers from the filter and confirms probable hits."""
+    client.post('/api/auth/register', json={
+        "username": "taken",
+        "email": "taken@example.com",
+        "password": "password123"
+    })
+
+    response = client.get(
+        '/api/auth/availability?username=taken&email=free@example.com'
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["username"] == {
+        "available": False, "error": "Username already exists"
+    }
+    assert data["email"] == {"available": True}
+
+    response = client.get('/api/auth/availability?username=x!')
+    assert response.get_json()["username"]["available"] is False
+    assert "email" not in response.get_json()
+
+    response = client.get('/api/auth/availability')
+    assert response.status_code == 400
+
+    # Registration relies on the unique constraints, not the filter
+    stats = client.get('/metrics').get_json()["availability_filter"]
+    assert stats["possible_positives"] == 1
+    assert stats["definite_negatives"] == 1
+
+
+def test_availability_sees_new_registrations(client, db):
+    """Test the filter is updated on registration, not only on rebuild."""
+    client.get('/api/auth/availability?username=newuser')
+    client.post('/api/auth/register', json={
+        "username": "newuser",
+        "email": "new@example.com",
+        "password": "password123"
+    })
+
+    response = client.get('/api/auth/availability?username=newuser')
+    assert response.get_json()["username"]["available"] is False
+    stats = client.get('/metrics').get_json()["availability_filter"]
+    assert stats["rebuilds"] == 1
+
+
+def test_availability_confirms_negatives_with_several_workers(
+    app, client, db, monkeypatch
+):
+    """Test names registered by another worker are not reported available."""
+    monkeypatch.setitem(app.config, "SINGLE_WORKER", False)
+    client.get('/api/auth/availability?username=someone')
+    # Committed behind this worker's filter, as another worker would
+    db.session.add(User(
+        username="elsewhere", email="elsewhere@example.com", password_hash="x"
+    ))
+    db.session.commit()
+
+    response = client.get('/api/auth/availability?username=elsewhere')
+    assert response.get_json()["username"]["available"] is False
+    stats = client.get('/metrics').get_json()["availability_filter"]
+    assert stats["definite_negatives"] == 0
+    assert stats["unverified_negatives"] == 2
+
+
 def test_user_login(client, db):
     """Test user login endpoint."""
     # First register a user
@@ -169,6 +284,114 @@ def test_user_login_nonexistent_user(client, db):
     assert "Invalid username or password" in response.get_json()["error"]
 
 
+def test_user_login_rehashes_at_configured_cost(app, client, db, monkeypatch):
+    """Test a hash stored at a lower cost is upgraded on login."""
+    monkeypatch.setitem(app.config, "BCRYPT_ROUNDS", 5)
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+    user = User.query.filter_by(username="testuser").first()
+    user.password_hash = hash_password("password123", rounds=4)
+    db.session.commit()
+
+    response = client.post('/api/auth/login', json={
+        "username": "testuser",
+        "password": "password123"
+    })
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    user = User.query.filter_by(username="testuser").first()
+    assert hash_rounds(user.password_hash) == 5
+    assert verify_password("password123", user.password_hash)
+
+
+def test_user_login_keeps_higher_cost_hash(client, db):
+    """Test a hash stored at a higher cost is not downgraded on login."""
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+    user = User.query.filter_by(username="testuser").first()
+    user.password_hash = hash_password("password123", rounds=5)
+    db.session.commit()
+    stored = user.password_hash
+
+    response = client.post('/api/auth/login', json={
+        "username": "testuser",
+        "password": "password123"
+    })
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert User.query.filter_by(username="testuser").first().password_hash == stored
+
+
+def test_user_login_when_hasher_saturated(client, db, monkeypatch):
+    """Test login is shed with 503 when the password pool is full."""
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+
+    def busy(*args):
+        raise PasswordHasherBusy()
+
+    monkeypatch.setattr(
+        'twitter_api.services.user_service.verify_password_pooled', busy
+    )
+    response = client.post('/api/auth/login', json={
+        "username": "testuser",
+        "password": "password123"
+    })
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_password_pool_metrics(client, db):
+    """Test hashing shows up as queue wait and hash time in /metrics."""
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+
+    stats = client.get('/metrics').get_json()["password_hasher"]
+    assert stats["completed"] == 1
+    assert stats["rejected"] == 0
+    assert stats["hash_time_avg_ms"] > 0
+    assert stats["queue_wait_avg_ms"] is not None
+
+
+def test_login_rate_limited_per_ip(app, client, db, monkeypatch):
+    """Test repeated logins from one client get 429 with Retry-After."""
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATE_LIMIT_LOGIN", "3/minute")
+
+    statuses = []
+    for _ in range(4):
+        response = client.post('/api/auth/login', json={
+            "username": "nobody",
+            "password": "password123"
+        })
+        statuses.append(response.status_code)
+
+    assert statuses == [401, 401, 401, 429]
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["X-RateLimit-Remaining"] == "0"
+
+    # Other routes draw from a separate budget
+    response = client.get('/api/tweets')
+    assert response.status_code == 200
+    assert "X-RateLimit-Remaining" in response.headers
+    assert client.get('/metrics').get_json()["rate_limits"]["limited"] == 1
+
+
 def test_user_logout(client, db):
     """Test user logout endpoint."""
     # Register and login
@@ -194,6 +417,68 @@ def test_user_logout(client, db):
     assert "Successfully logged out" in response.get_json()["message"]
 
 
+def test_logout_revokes_token(client, db):
+    """Test a logged-out token is rejected while other sessions keep working."""
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+    tokens = [
+        client.post('/api/auth/login', json={
+            "username": "testuser",
+            "password": "password123"
+        }).get_json()["access_token"]
+        for _ in range(2)
+    ]
+
+    client.post('/api/auth/logout', headers={
+        "Authorization": f"Bearer {tokens[0]}"
+    })
+
+    response = client.post('/api/tweets', json={"content": "hi"}, headers={
+        "Authorization": f"Bearer {tokens[0]}"
+    })
+    assert response.status_code == 401
+    assert "revoked" in response.get_json()["error"]
+
+    response = client.post('/api/tweets', json={"content": "hi"}, headers={
+        "Authorization": f"Bearer {tokens[1]}"
+    })
+    assert response.status_code == 201
+
+    # Stored for other workers until the token would have expired
+    assert RevokedToken.query.count() == 1
+
+
+def test_revocations_from_other_workers_are_synced(client, db):
+    """Test a revocation written elsewhere is picked up on the next sync."""
+    client.post('/api/auth/register', json={
+        "username": "testuser",
+        "email": "test@example.com",
+        "password": "password123"
+    })
+    token = client.post('/api/auth/login', json={
+        "username": "testuser",
+        "password": "password123"
+    }).get_json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.post(
+        '/api/tweets', json={"content": "hi"}, headers=headers
+    ).status_code == 201
+
+    claims = decode_access_token(token)
+    db.session.add(RevokedToken(
+        jti=claims["jti"],
+        expires_at=datetime.utcfromtimestamp(claims["exp"])
+    ))
+    db.session.commit()
+    get_revocation_list()._next_sync = 0
+
+    response = client.post('/api/tweets', json={"content": "hi"}, headers=headers)
+    assert response.status_code == 401
+
+
 def test_logout_without_token(client, db):
     """Test logout without authentication token."""
     response = client.post('/api/auth/logout')
@@ -0,0 +1,398 @@
+"""Integration tests for follow endpoints."""
+import time
+
+from sqlalchemy import event
+
+from twitter_api.models.follow import Follow
+
+
+def create_test_user(client, username="testuser", email="test@example.com"):
+    """Helper function to create a test user."""
+    response = client.post('/api/auth/register', json={
+        "username": username,
+        "email": email,
+        "password": "password123",
+        "display_name": f"{username} display"
+    })
+    return response.get_json()
+
+
+def login_user(client, username="testuser"):
+    """Helper function to login and get token."""
+    response = client.post('/api/auth/login', json={
+        "username": username,
+        "password": "password123"
+    })
+    return response.get_json()["access_token"]
+
+
+def test_bulk_follow(client, db):
+    """Test following several users in one request."""
+    user = create_test_user(client)
+    others = [
+        create_test_user(client, f"other{i}", f"other{i}@example.com")
+        for i in range(3)
+    ]
+    token = login_user(client)
+
+    # Follow one user up front so the batch sees an existing edge
+    client.post(f'/api/users/{others[0]["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    target_ids = [other["id"] for other in others] + [user["id"], 999]
+    response = client.post('/api/users/follow', json={
+        "user_ids": target_ids
+    }, headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 200
+    statuses = {r["user_id"]: r["status"] for r in response.get_json()["results"]}
+    assert statuses == {
+        others[0]["id"]: "already_following",
+        others[1]["id"]: "followed",
+        others[2]["id"]: "followed",
+        user["id"]: "cannot_follow_self",
+        999: "not_found",
+    }
+    assert Follow.query.filter_by(follower_id=user["id"]).count() == 3
+
+
+def test_bulk_follow_invalid_payload(client, db):
+    """Test bulk follow with malformed or oversized ID lists."""
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post('/api/users/follow', json={
+        "user_ids": "1,2"
+    }, headers=headers)
+    assert response.status_code == 400
+    assert "list of integers" in response.get_json()["error"]
+
+    for user_id in (0, -1, 2 ** 70):
+        for method in (client.post, client.delete):
+            response = method('/api/users/follow', json={
+                "user_ids": [user_id]
+            }, headers=headers)
+            assert response.status_code == 400
+            assert "list of integers" in response.get_json()["error"]
+
+    response = client.post('/api/users/follow', json={
+        "user_ids": []
+    }, headers=headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/users/follow', json={
+        "user_ids": list(range(1, 102))
+    }, headers=headers)
+    assert response.status_code == 400
+    assert "more than 100" in response.get_json()["error"]
+
+
+def test_bulk_unfollow(client, db):
+    """Test unfollowing several users in one request."""
+    create_test_user(client)
+    others = [
+        create_test_user(client, f"other{i}", f"other{i}@example.com")
+        for i in range(2)
+    ]
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.post(f'/api/users/{others[0]["id"]}/follow', headers=headers)
+
+    response = client.delete('/api/users/follow', json={
+        "user_ids": [others[0]["id"], others[1]["id"]]
+    }, headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()["results"] == [
+        {"user_id": others[0]["id"], "status": "unfollowed"},
+        {"user_id": others[1]["id"], "status": "not_following"},
+    ]
+    assert Follow.query.count() == 0
+
+
+def test_relationship_lookup(client, db):
+    """Test batch relationship lookup in both directions."""
+    user = create_test_user(client)
+    others = [
+        create_test_user(client, f"other{i}", f"other{i}@example.com")
+        for i in range(3)
+    ]
+    token = login_user(client)
+    other_token = login_user(client, "other1")
+
+    client.post(f'/api/users/{others[0]["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    client.post(f'/api/users/{others[1]["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    client.post(f'/api/users/{user["id"]}/follow', headers={
+        "Authorization": f"Bearer {other_token}"
+    })
+
+    ids = ",".join(str(other["id"]) for other in others)
+    response = client.get(f'/api/users/relationships?ids={ids}', headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()["relationships"] == [
+        {"user_id": others[0]["id"], "following": True, "followed_by": False},
+        {"user_id": others[1]["id"], "following": True, "followed_by": True},
+        {"user_id": others[2]["id"], "following": False, "followed_by": False},
+    ]
+
+
+def test_relationship_lookup_invalid_ids(client, db):
+    """Test relationship lookup with missing or malformed ids."""
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get('/api/users/relationships', headers=headers)
+    assert response.status_code == 400
+
+    response = client.get('/api/users/relationships?ids=1,abc', headers=headers)
+    assert response.status_code == 400
+    assert "comma-separated" in response.get_json()["error"]
+
+
+def test_followers_embed_relationships(client, db):
+    """Test follower lists embed relationship flags for authenticated viewers."""
+    user = create_test_user(client)
+    other = create_test_user(client, "other", "other@example.com")
+    token = login_user(client)
+    other_token = login_user(client, "other")
+
+    client.post(f'/api/users/{user["id"]}/follow', headers={
+        "Authorization": f"Bearer {other_token}"
+    })
+
+    # Anonymous requests get plain user objects
+    response = client.get(f'/api/users/{user["id"]}/followers')
+    assert "following" not in response.get_json()["users"][0]
+
+    response = client.get(f'/api/users/{user["id"]}/followers', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    follower = response.get_json()["users"][0]
+    assert follower["id"] == other["id"]
+    assert follower["following"] is False
+    assert follower["followed_by"] is True
+
+
+def test_follow_suggestions(client, db):
+    """Test suggestions are served from the precomputed table."""
+    from twitter_api.services.suggestion_service import SuggestionService
+
+    users = [create_test_user(client)] + [
+        create_test_user(client, f"other{i}", f"other{i}@example.com")
+        for i in range(3)
+    ]
+    tokens = [login_user(client, user["username"]) for user in users]
+
+    def follow(source, target):
+        client.post(f'/api/users/{users[target]["id"]}/follow', headers={
+            "Authorization": f"Bearer {tokens[source]}"
+        })
+
+    follow(0, 1)
+    follow(1, 2)
+    follow(1, 3)
+
+    SuggestionService.refresh_suggestions()
+
+    response = client.get('/api/users/suggestions', headers={
+        "Authorization": f"Bearer {tokens[0]}"
+    })
+    assert response.status_code == 200
+    suggested = response.get_json()["users"]
+    assert [u["id"] for u in suggested] == [users[2]["id"], users[3]["id"]]
+    assert suggested[0]["mutual_count"] == 1
+
+    # Accounts followed after the refresh drop out immediately
+    follow(0, 2)
+    response = client.get('/api/users/suggestions', headers={
+        "Authorization": f"Bearer {tokens[0]}"
+    })
+    assert [u["id"] for u in response.get_json()["users"]] == [users[3]["id"]]
+
+
+def test_follow_filter_tracks_follows(client, db):
+    """Test the follow filter answers checks and reports its memory use."""
+    from twitter_api.services.follow_service import FollowService
+
+    user = create_test_user(client)
+    other = create_test_user(client, "other", "other@example.com")
+    token = login_user(client)
+
+    assert FollowService.is_following(user["id"], other["id"]) is False
+
+    client.post(f'/api/users/{other["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    assert FollowService.is_following(user["id"], other["id"]) is True
+
+    # Duplicate follows are still rejected
+    response = client.post(f'/api/users/{other["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    assert response.status_code == 400
+    assert "Already following" in response.get_json()["error"]
+
+    stats = client.get('/metrics').get_json()["follow_filter"]
+    assert stats["count"] == 1
+    assert stats["memory_bytes"] > 0
+    assert stats["definite_negatives"] >= 1
+
+
+def test_follow_filter_confirms_negatives_with_several_workers(
+    app, client, db, monkeypatch
+):
+    """Test follows made by another worker are found when not single-worker."""
+    from twitter_api.services.follow_service import FollowService
+
+    monkeypatch.setitem(app.config, "SINGLE_WORKER", False)
+    user = create_test_user(client)
+    other = create_test_user(client, "other", "other@example.com")
+    assert FollowService.is_following(user["id"], other["id"]) is False
+
+    # Committed behind this worker's filter, as another worker would
+    db.session.add(Follow(follower_id=user["id"], followed_id=other["id"]))
+    db.session.commit()
+
+    assert FollowService.is_following(user["id"], other["id"]) is True
+    stats = client.get('/metrics').get_json()["follow_filter"]
+    assert stats["definite_negatives"] == 0
+    assert stats["unverified_negatives"] == 2
+
+
+def test_follow_filter_learns_other_workers_follows(app, client, db, monkeypatch):
+    """Test follows published on the bus are trusted without the database."""
+    from twitter_api.services.follow_service import FollowService
+    from twitter_api.services.invalidation_bus import (
+        InvalidationBus,
+        LocalTransport,
+    )
+
+    monkeypatch.setitem(app.config, "SINGLE_WORKER", False)
+    monkeypatch.setitem(app.config, "INVALIDATION_BUS_URL", "local://follows-test")
+    user = create_test_user(client)
+    other = create_test_user(client, "other", "other@example.com")
+    token = login_user(client)
+    assert FollowService.is_following(user["id"], other["id"]) is False
+
+    other_worker = InvalidationBus(LocalTransport("follows-test"), background=False)
+    received = []
+    other_worker.subscribe("follow_filter", received.append, lambda: None)
+    client.post(f'/api/users/{other["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    deadline = time.monotonic() + 2
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.01)
+    other_worker.close()
+
+    assert len(received) == 1
+    stats = client.get('/metrics').get_json()["follow_filter"]
+    assert stats["synced"] is True
+    assert stats["definite_negatives"] == 1
+
+
+def test_relationship_intersections(client, db):
+    """Test mutual followers, common following and followers you follow."""
+    names = ["viewer", "profile", "alice", "bob", "carol"]
+    users = {
+        name: create_test_user(client, name, f"{name}@example.com")
+        for name in names
+    }
+    tokens = {name: login_user(client, name) for name in names}
+
+    def follow(source, target):
+        client.post(f'/api/users/{users[target]["id"]}/follow', headers={
+            "Authorization": f"Bearer {tokens[source]}"
+        })
+
+    # Warm the cache before the follows so incremental updates are exercised
+    headers = {"Authorization": f"Bearer {tokens['viewer']}"}
+    profile_id = users["profile"]["id"]
+    client.get(f'/api/users/{profile_id}/mutual-followers', headers=headers)
+
+    follow("alice", "viewer")
+    follow("alice", "profile")
+    follow("bob", "profile")
+    follow("viewer", "bob")
+    follow("viewer", "carol")
+    follow("profile", "carol")
+
+    response = client.get(
+        f'/api/users/{profile_id}/mutual-followers', headers=headers
+    )
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["count"] == 1
+    assert [u["username"] for u in data["users"]] == ["alice"]
+
+    response = client.get(
+        f'/api/users/{profile_id}/common-following', headers=headers
+    )
+    assert [u["username"] for u in response.get_json()["users"]] == ["carol"]
+
+    response = client.get(
+        f'/api/users/{profile_id}/followers-you-follow', headers=headers
+    )
+    assert [u["username"] for u in response.get_json()["users"]] == ["bob"]
+
+    # Unfollows are reflected without waiting for the cache to expire
+    client.delete(f'/api/users/{users["bob"]["id"]}/follow', headers=headers)
+    response = client.get(
+        f'/api/users/{profile_id}/followers-you-follow', headers=headers
+    )
+    assert response.get_json()["count"] == 0
+
+    response = client.get('/api/users/999/mutual-followers', headers=headers)
+    assert response.status_code == 404
+
+
+def test_follow_is_a_single_insert(client, db):
+    """Test a follow writes without looking up users or existing edges."""
+    create_test_user(client)
+    other = create_test_user(client, "other", "other@example.com")
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.post(
+            f'/api/users/{other["id"]}/follow', headers=headers
+        )
+        duplicate = client.post(
+            f'/api/users/{other["id"]}/follow', headers=headers
+        )
+        missing = client.post('/api/users/999/follow', headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 201
+    assert duplicate.status_code == 400
+    assert "Already following" in duplicate.get_json()["error"]
+    assert missing.status_code == 404
+    assert missing.get_json()["error"] == "User not found"
+    # Follower-signature upkeep runs after the INSERT; no lookups before it
+    first_insert = next(
+        i for i, s in enumerate(statements) if s.startswith("INSERT INTO follows")
+    )
+    assert not [
+        s for s in statements[:first_insert]
+        if "FROM users" in s or "FROM follows" in s
+    ]
@@ -1,6 +1,14 @@
 """Integration tests for tweet endpoints."""
+import time
+from datetime import datetime
+
+from sqlalchemy import event
+
 from twitter_api.models.user import User
 from twitter_api.models.tweet import Tweet
+from twitter_api.services.invalidation_bus import InvalidationBus, LocalTransport
+from twitter_api.services.write_overlay import get_write_overlay
+from twitter_api.utils.cache import TTLCache
 
 
 def create_test_user(client, username="testuser", email="test@example.com"):
@@ -219,6 +227,24 @@ def test_get_all_tweets_sort_oldest(client, db):
     assert data["tweets"][1]["content"] == "Second tweet"
 
 
+def test_get_all_tweets_orders_by_snowflake_id(client, db):
+    """Test tweets with the same timestamp keep creation order via their IDs."""
+    user_data = create_test_user(client)
+    stamp = datetime(2024, 1, 1)
+    tweets = [
+        Tweet(content=f"Tweet {i}", user_id=user_data["id"], created_at=stamp)
+        for i in range(3)
+    ]
+    db.session.add_all(tweets)
+    db.session.commit()
+
+    response = client.get('/api/tweets?sort=newest')
+
+    data = response.get_json()
+    assert [t["content"] for t in data["tweets"]] == ["Tweet 2", "Tweet 1", "Tweet 0"]
+    assert data["tweets"][0]["id_str"] == str(tweets[2].id)
+
+
 def test_get_all_tweets_invalid_sort(client, db):
     """Test getting tweets with invalid sort parameter."""
     response = client.get('/api/tweets?sort=invalid')
@@ -460,3 +486,426 @@ def test_delete_nonexistent_tweet(client, db):
 
     assert response.status_code == 404
     assert "Tweet not found" in response.get_json()["error"]
+
+
+def test_get_single_tweet_is_cached(client, db):
+    """Test repeat reads skip the database and writes invalidate the cache."""
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    tweet_id = client.post('/api/tweets', json={
+        "content": "Original"
+    }, headers=headers).get_json()["id"]
+    assert client.get(f'/api/tweets/{tweet_id}').status_code == 200
+    db.session.expunge_all()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f'/api/tweets/{tweet_id}')
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.get_json()["content"] == "Original"
+    assert response.get_json()["username"] == "testuser"
+    assert statements == []
+
+    client.put(f'/api/tweets/{tweet_id}', json={
+        "content": "Edited"
+    }, headers=headers)
+    assert client.get(f'/api/tweets/{tweet_id}').get_json()["content"] == "Edited"
+
+    client.delete(f'/api/tweets/{tweet_id}', headers=headers)
+    assert client.get(f'/api/tweets/{tweet_id}').status_code == 404
+
+    stats = client.get('/metrics').get_json()["entity_cache"]["tweet"]
+    assert stats["local_hits"] >= 1
+    assert stats["not_found"] == 1
+
+
+def test_get_single_tweet_conditional(client, db):
+    """Test a tweet's ETag and Last-Modified produce 304 until it changes."""
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    tweet_id = client.post('/api/tweets', json={
+        "content": "Original"
+    }, headers=headers).get_json()["id"]
+
+    response = client.get(f'/api/tweets/{tweet_id}')
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert not etag.startswith('W/')
+
+    response = client.get(f'/api/tweets/{tweet_id}', headers={
+        "If-None-Match": etag
+    })
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers["ETag"] == etag
+    assert client.get(f'/api/tweets/{tweet_id}', headers={
+        "If-Modified-Since": last_modified
+    }).status_code == 304
+
+    client.put(f'/api/tweets/{tweet_id}', json={
+        "content": "Edited"
+    }, headers=headers)
+    response = client.get(f'/api/tweets/{tweet_id}', headers={
+        "If-None-Match": etag
+    })
+    assert response.status_code == 200
+    assert response.get_json()["content"] == "Edited"
+    assert response.headers["ETag"] != etag
+
+
+def test_get_all_tweets_conditional(client, db):
+    """Test an unchanged page is answered with 304 without loading tweets."""
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post('/api/tweets', json={"content": "First"}, headers=headers)
+    etag = client.get('/api/tweets').headers["ETag"]
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get('/api/tweets', headers={"If-None-Match": etag})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 304
+    # Only the narrow version query and the count; no tweet rows or authors
+    assert len(statements) == 2
+    assert "content" not in statements[0]
+
+    # A new tweet changes the page
+    client.post('/api/tweets', json={"content": "Second"}, headers=headers)
+    response = client.get('/api/tweets', headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.get_json()["tweets"]) == 2
+
+    etag = client.get('/api/feed/global').headers["ETag"]
+    assert client.get('/api/feed/global', headers={
+        "If-None-Match": etag
+    }).status_code == 304
+    assert client.get('/api/feed/global?per_page=1', headers={
+        "If-None-Match": etag
+    }).status_code == 200
+
+
+def test_create_tweets_group_commit(app, client, db, monkeypatch):
+    """Test batch mode writes concurrent tweets in shared commits."""
+    monkeypatch.setitem(app.config, "TWEET_WRITE_MODE", "batch")
+    monkeypatch.setitem(app.config, "TWEET_BATCH_WINDOW_MS", 50)
+    create_test_user(client)
+    token = login_user(client)
+
+    response = client.post('/api/tweets', json={
+        "content": "  Batched tweet  "
+    }, headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["content"] == "Batched tweet"
+    assert data["username"] == "testuser"
+    db.session.expire_all()
+    assert db.session.get(Tweet, data["id"]).content == "Batched tweet"
+
+    stats = client.get('/metrics').get_json()["tweet_batcher"]
+    assert stats["batches"] == 1
+    assert stats["tweets"] == 1
+
+
+def test_create_tweet_async_mode(app, client, db, monkeypatch):
+    """Test async mode answers 202 with the assigned ID."""
+    monkeypatch.setitem(app.config, "TWEET_WRITE_MODE", "async")
+    create_test_user(client)
+    token = login_user(client)
+
+    response = client.post('/api/tweets', json={
+        "content": "Async tweet"
+    }, headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data["id"] is not None
+    assert data["id_str"] == str(data["id"])
+
+    # Invalid content is still rejected up front
+    response = client.post('/api/tweets', json={"content": "   "}, headers={
+        "Authorization": f"Bearer {token}"
+    })
+    assert response.status_code == 400
+
+
+def test_slow_batch_answers_202_and_still_commits(app, client, db, monkeypatch):
+    """Test a batch slower than the timeout is reported as in flight."""
+    monkeypatch.setitem(app.config, "TWEET_WRITE_MODE", "batch")
+    monkeypatch.setitem(app.config, "TWEET_BATCH_WINDOW_MS", 300)
+    monkeypatch.setitem(app.config, "TWEET_BATCH_TIMEOUT", 0.01)
+    create_test_user(client)
+    token = login_user(client)
+
+    response = client.post('/api/tweets', json={
+        "content": "Slow batch"
+    }, headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 202
+    tweet_id = response.get_json()["id"]
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline:
+        db.session.expire_all()
+        if db.session.get(Tweet, tweet_id) is not None:
+            break
+        time.sleep(0.02)
+    assert db.session.get(Tweet, tweet_id).content == "Slow batch"
+    # Recorded for read-your-writes once the batch committed
+    overlay = get_write_overlay()
+    user_id = response.get_json()["user_id"]
+    while tweet_id not in overlay.recent(user_id) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert tweet_id in overlay.recent(user_id)
+
+
+def test_full_write_queue_answers_503(app, client, db, monkeypatch):
+    """Test a tweet that could not be queued is shed with 503."""
+    from twitter_api.services.tweet_batcher import TweetBatcher, TweetBatcherBusy
+
+    monkeypatch.setitem(app.config, "TWEET_WRITE_MODE", "batch")
+    create_test_user(client)
+    token = login_user(client)
+
+    def busy(*args):
+        raise TweetBatcherBusy()
+
+    monkeypatch.setattr(TweetBatcher, "submit", busy)
+    response = client.post('/api/tweets', json={
+        "content": "Shed"
+    }, headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert Tweet.query.count() == 0
+
+
+def test_admin_import_tweets(client, db):
+    """Test an admin can bulk-import tweets from an NDJSON body."""
+    user = create_test_user(client)
+    db.session.get(User, user['id']).is_admin = True
+    db.session.commit()
+    token = login_user(client)
+
+    body = '\n'.join([
+        '{"user_id": %d, "content": "imported one"}' % user['id'],
+        '{"user_id": 9999, "content": "orphan"}',
+        '{"user_id": %d, "content": "imported two"}' % user['id'],
+    ])
+    response = client.post('/api/admin/tweets/import', data=body, headers={
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/x-ndjson"
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['imported'] == 2
+    assert data['errors'] == [{'line': 2, 'error': 'User not found'}]
+    assert Tweet.query.count() == 2
+
+
+def test_admin_import_requires_admin(client, db):
+    """Test non-admin users cannot import tweets."""
+    create_test_user(client)
+    token = login_user(client)
+
+    response = client.post('/api/admin/tweets/import', data='{}', headers={
+        "Authorization": f"Bearer {token}"
+    })
+
+    assert response.status_code == 403
+    assert response.get_json()['error'] == 'Admin access required'
+
+
+def test_get_tweets_by_ids(client, db):
+    """Test multi-get returns tweets in request order with not-found markers."""
+    alice = create_test_user(client)
+    bob = create_test_user(client, "bobby", "bob@example.com")
+    tweets = [
+        Tweet(content="From alice", user_id=alice["id"]),
+        Tweet(content="From bob", user_id=bob["id"]),
+    ]
+    db.session.add_all(tweets)
+    db.session.commit()
+    first, second = tweets[0].id, tweets[1].id
+    db.session.expunge_all()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f'/api/tweets?ids={second},12345,{first}')
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    data = response.get_json()["tweets"]
+    assert [t.get("content") for t in data] == ["From bob", None, "From alice"]
+    assert data[0]["username"] == "bobby"
+    assert data[1] == {"id": 12345, "not_found": True}
+    # One query for the tweets and one for both authors
+    assert len([s for s in statements if s.startswith("SELECT")]) == 2
+
+
+def test_get_tweets_by_ids_invalid(client, db):
+    """Test multi-get rejects malformed or oversized ID lists."""
+    response = client.get('/api/tweets?ids=1,abc')
+    assert response.status_code == 400
+
+    response = client.get('/api/tweets?ids=99999999999999999999999')
+    assert response.status_code == 400
+    assert 'integers' in response.get_json()['error']
+
+    ids = ','.join(str(i) for i in range(1, 102))
+    response = client.get(f'/api/tweets?ids={ids}')
+    assert response.status_code == 400
+    assert 'At most 100' in response.get_json()['error']
+
+
+def test_global_feed_pages_are_cached(app, client, db, monkeypatch):
+    """Test global feed pages are served from the per-worker cache."""
+    monkeypatch.setitem(app.config, "GLOBAL_FEED_CACHE_TTL", 60)
+    user = create_test_user(client)
+    db.session.add(Tweet(content="First", user_id=user["id"]))
+    db.session.commit()
+
+    first = client.get('/api/feed/global').get_json()
+    db.session.add(Tweet(content="Second", user_id=user["id"]))
+    db.session.commit()
+    second = client.get('/api/feed/global').get_json()
+    other_page_size = client.get('/api/feed/global?per_page=5').get_json()
+
+    assert first == second
+    assert len(other_page_size["tweets"]) == 2
+    stats = client.get('/metrics').get_json()["global_feed"]
+    assert stats["hits"] == 1
+    assert stats["loads"] == 2
+
+
+def test_anonymous_responses_are_micro_cached(app, client, db, monkeypatch):
+    """Test anonymous reads share a cached response; token holders bypass it."""
+    monkeypatch.setitem(app.config, "MICRO_CACHE_ENABLED", True)
+    monkeypatch.setitem(app.config, "MICRO_CACHE_TTL_TWEETS", 60)
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post('/api/tweets', json={"content": "First"}, headers=headers)
+
+    first = client.get('/api/tweets?page=1&per_page=5')
+    assert first.status_code == 200
+    client.post('/api/tweets', json={"content": "Second"}, headers=headers)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        # Same query in another order: served from the cache
+        cached = client.get('/api/tweets?per_page=5&page=1')
+        not_modified = client.get('/api/tweets?page=1&per_page=5', headers={
+            "If-None-Match": first.headers["ETag"]
+        })
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert statements == []
+    assert cached.get_json() == first.get_json()
+    assert not_modified.status_code == 304
+
+    fresh = client.get('/api/tweets?page=1&per_page=5', headers=headers)
+    assert len(fresh.get_json()["tweets"]) == 2
+
+    stats = client.get('/metrics').get_json()["response_cache:tweets.get_tweets"]
+    assert stats["hits"] == 2
+    assert stats["loads"] == 1
+
+
+def test_global_feed_shows_authors_own_writes(app, client, db, monkeypatch):
+    """Test a cached feed page includes the caller's writes, for them only."""
+    monkeypatch.setitem(app.config, "GLOBAL_FEED_CACHE_TTL", 60)
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    old_id = client.post('/api/tweets', json={
+        "content": "Old"
+    }, headers=headers).get_json()["id"]
+    client.get('/api/feed/global')
+
+    new_id = client.post('/api/tweets', json={
+        "content": "New"
+    }, headers=headers).get_json()["id"]
+    client.put(f'/api/tweets/{old_id}', json={
+        "content": "Old, edited"
+    }, headers=headers)
+
+    own = client.get('/api/feed/global', headers=headers).get_json()
+    anonymous = client.get('/api/feed/global').get_json()
+    assert [(t["id"], t["content"]) for t in own["tweets"]] == [
+        (new_id, "New"),
+        (old_id, "Old, edited"),
+    ]
+    assert own["pagination"]["total"] == 2
+    assert [t["content"] for t in anonymous["tweets"]] == ["Old"]
+    assert anonymous["pagination"]["total"] == 1
+
+    client.delete(f'/api/tweets/{new_id}', headers=headers)
+    client.delete(f'/api/tweets/{old_id}', headers=headers)
+    own = client.get('/api/feed/global', headers=headers).get_json()
+    assert own["tweets"] == []
+    assert own["pagination"]["total"] == 0
+    assert own["pagination"]["pages"] == 0
+
+
+def test_tweet_edits_reach_other_workers(app, client, db, monkeypatch):
+    """Test an edit drops the tweet from another worker's cache via the bus."""
+    monkeypatch.setitem(app.config, "INVALIDATION_BUS_URL", "local://tweets-test")
+    monkeypatch.setitem(app.config, "INVALIDATION_BUS_WINDOW_MS", 1)
+    other_worker = InvalidationBus(LocalTransport("tweets-test"), background=False)
+    other_cache = TTLCache(100, 60)
+    other_worker.subscribe("entity:tweet", other_cache.delete, other_cache.clear)
+    create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    tweet_id = client.post('/api/tweets', json={
+        "content": "Original"
+    }, headers=headers).get_json()["id"]
+    other_cache.set(tweet_id, "Original")
+
+    client.put(f'/api/tweets/{tweet_id}', json={
+        "content": "Edited"
+    }, headers=headers)
+
+    deadline = time.monotonic() + 2
+    while other_cache.get(tweet_id) is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert other_cache.get(tweet_id) is None
+    other_worker.close()
@@ -1,6 +1,13 @@
 """Integration tests for user endpoints."""
+from sqlalchemy import event
+
 from twitter_api.models.user import User
+from twitter_api.models.signature import FollowerSignature
 from twitter_api.models.tweet import Tweet
+from twitter_api.services.similarity_service import SimilarityService
+from twitter_api.services.user_loader import load_user
+from twitter_api.services.user_service import UserService
+from twitter_api.utils import minhash
 
 
 def create_test_user(client, username="testuser", email="test@example.com"):
@@ -123,6 +130,23 @@ def test_update_user_profile(client, db):
     assert data["bio"] == "This is my bio"
 
 
+def test_update_user_profile_refreshes_cached_user(client, db):
+    """Test a profile edit is not hidden by the per-worker user cache."""
+    user = create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Bulk follows load the acting user into the user cache
+    client.post('/api/users/follow', json={"user_ids": [999]}, headers=headers)
+    assert client.get('/metrics').get_json()["entity_cache"]["user"]["loads"] >= 1
+    client.put(f'/api/users/{user["id"]}', json={
+        "display_name": "Updated Name"
+    }, headers=headers)
+
+    db.session.expunge_all()
+    assert load_user(user["id"]).display_name == "Updated Name"
+
+
 def test_update_user_without_auth(client, db):
     """Test updating user profile without authentication."""
     user = create_test_user(client)
@@ -246,3 +270,281 @@ def test_get_user_tweets_empty(client, db):
     data = response.get_json()
     assert len(data["tweets"]) == 0
     assert data["pagination"]["total_items"] == 0
+
+
+def test_get_all_users_sorted_by_influence(client, db):
+    """Test users can be ordered by their stored influence score."""
+    from twitter_api.services.influence_service import InfluenceService
+
+    users = [
+        create_test_user(client, f"user{i}", f"user{i}@example.com")
+        for i in range(3)
+    ]
+    tokens = [login_user(client, f"user{i}") for i in range(3)]
+
+    # user2 is followed by both others, user1 by one
+    for source, target in [(0, 2), (1, 2), (0, 1)]:
+        client.post(f'/api/users/{users[target]["id"]}/follow', headers={
+            "Authorization": f"Bearer {tokens[source]}"
+        })
+
+    stats = InfluenceService.refresh_influence_scores()
+    assert stats["users"] == 3
+    assert stats["edges"] == 3
+
+    response = client.get('/api/users?sort=influence')
+    assert response.status_code == 200
+    assert [u["username"] for u in response.get_json()["users"]] == [
+        "user2", "user1", "user0"
+    ]
+
+    response = client.get('/api/users?sort=popular')
+    assert response.status_code == 400
+
+
+def test_get_similar_users(client, db):
+    """Test accounts with overlapping followers are returned as similar."""
+    names = ["alpha", "beta", "gamma", "fan0", "fan1", "fan2"]
+    users = {
+        name: create_test_user(client, name, f"{name}@example.com")
+        for name in names
+    }
+    tokens = {name: login_user(client, name) for name in names}
+
+    def follow(source, target):
+        client.post(f'/api/users/{users[target]["id"]}/follow', headers={
+            "Authorization": f"Bearer {tokens[source]}"
+        })
+
+    # alpha and beta share all their followers; gamma shares none
+    for fan in ["fan0", "fan1", "fan2"]:
+        follow(fan, "alpha")
+        follow(fan, "beta")
+    follow("alpha", "gamma")
+
+    # Follows update the signatures in place, without the batch job
+    response = client.get(f'/api/users/{users["alpha"]["id"]}/similar')
+    assert response.status_code == 200
+    similar = response.get_json()["users"]
+    assert [u["username"] for u in similar] == ["beta"]
+    assert similar[0]["similarity"] == 1.0
+    alpha_signature = db.session.get(FollowerSignature, users["alpha"]["id"])
+    assert minhash.from_bytes(alpha_signature.signature).tolist() == (
+        minhash.signature(users[fan]["id"] for fan in ["fan0", "fan1", "fan2"])
+    ).tolist()
+
+    # First signatures are confirmed by the batch job once
+    assert SimilarityService.refresh_stale() == {"refreshed": 3}
+
+    # Unfollows mark the signature stale; reads never recompute it
+    client.delete(f'/api/users/{users["beta"]["id"]}/follow', headers={
+        "Authorization": f"Bearer {tokens['fan0']}"
+    })
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f'/api/users/{users["alpha"]["id"]}/similar')
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert response.get_json()["users"][0]["similarity"] == 1.0
+    assert not any(
+        s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+        for s in statements
+    )
+
+    assert SimilarityService.refresh_stale() == {"refreshed": 1}
+    response = client.get(f'/api/users/{users["alpha"]["id"]}/similar')
+    similar = response.get_json()["users"]
+    assert similar == [] or similar[0]["similarity"] < 1.0
+
+    response = client.get('/api/users/999/similar')
+    assert response.status_code == 404
+
+
+def test_stale_refresh_keeps_follows_made_meanwhile(client, db, monkeypatch):
+    """Test a follow landing mid-recompute is not overwritten by the job."""
+    names = ["star", "fan0", "fan1", "late"]
+    users = {
+        name: create_test_user(client, name, f"{name}@example.com")
+        for name in names
+    }
+    star_id = users["star"]["id"]
+    for fan in ["fan0", "fan1"]:
+        client.post(f'/api/users/{star_id}/follow', headers={
+            "Authorization": f"Bearer {login_user(client, fan)}"
+        })
+    late_token = login_user(client, "late")
+    signature = minhash.signature
+
+    def follow_meanwhile(ids):
+        result = signature(ids)
+        # Make the late follower move at least one minimum
+        monkeypatch.setattr(minhash, "add_to_signature", lambda sig, value: sig - 1)
+        client.post(f'/api/users/{star_id}/follow', headers={
+            "Authorization": f"Bearer {late_token}"
+        })
+        return result
+
+    monkeypatch.setattr(minhash, "signature", follow_meanwhile)
+    assert SimilarityService.refresh_stale() == {"refreshed": 0}
+    monkeypatch.setattr(minhash, "signature", signature)
+
+    db.session.expire_all()
+    assert db.session.get(FollowerSignature, star_id).stale is True
+
+
+def test_get_users_by_ids(client, db):
+    """Test multi-get returns users in request order with not-found markers."""
+    alice = create_test_user(client)
+    bob = create_test_user(client, "bobby", "bob@example.com")
+
+    response = client.get(f'/api/users?ids={bob["id"]},999,{alice["id"]}')
+
+    assert response.status_code == 200
+    data = response.get_json()["users"]
+    assert [u.get("username") for u in data] == ["bobby", None, "testuser"]
+    assert data[1] == {"id": 999, "not_found": True}
+    assert "pagination" not in response.get_json()
+
+    response = client.get('/api/users?ids=')
+    assert response.status_code == 400
+
+    response = client.get(f'/api/users?ids={2 ** 63},0')
+    assert response.status_code == 400
+
+
+def test_profile_counts_are_cached_until_a_local_write(app, client, db, monkeypatch):
+    """Test profile counts come from the cache and follows invalidate them."""
+    monkeypatch.setitem(app.config, "PROFILE_COUNTS_CACHE_TTL", 60)
+    user = create_test_user(client)
+    create_test_user(client, "other", "other@example.com")
+    token = login_user(client, "other")
+
+    response = client.get(f'/api/users/{user["id"]}')
+    assert response.get_json()["tweet_count"] == 0
+
+    # Written behind the service's back: the cached count is still served
+    db.session.add(Tweet(content="Unseen", user_id=user["id"]))
+    db.session.commit()
+    response = client.get(f'/api/users/{user["id"]}')
+    assert response.get_json()["tweet_count"] == 0
+
+    # A follow through the API drops both users' counts
+    client.post(f'/api/users/{user["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    data = client.get(f'/api/users/{user["id"]}').get_json()
+    assert data["tweet_count"] == 1
+    assert data["followers_count"] == 1
+
+    stats = client.get('/metrics').get_json()["profile_counts"]
+    assert stats["hits"] == 1
+    assert stats["loads"] == 2
+
+
+def test_get_user_by_username_is_cached(app, client, db):
+    """Test username lookups are cached, including unknown usernames."""
+    with app.test_request_context():
+        assert UserService.get_user_by_username("newcomer") is None
+
+    user = create_test_user(client, "newcomer", "newcomer@example.com")
+    db.session.expunge_all()
+
+    with app.test_request_context():
+        # Registration drops the cached "not found"
+        assert UserService.get_user_by_username("newcomer").id == user["id"]
+        db.session.expunge_all()
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            assert UserService.get_user_by_username("newcomer").id == user["id"]
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        assert statements == []
+
+
+def test_get_user_conditional(client, db):
+    """Test profile ETags cover the counts as well as the user row."""
+    user = create_test_user(client)
+    create_test_user(client, "follower", "follower@example.com")
+    token = login_user(client, "follower")
+
+    response = client.get(f'/api/users/{user["id"]}')
+    etag = response.headers["ETag"]
+    # Counts change without updated_at, so there is no date validator
+    assert "Last-Modified" not in response.headers
+    assert client.get(f'/api/users/{user["id"]}', headers={
+        "If-None-Match": etag
+    }).status_code == 304
+
+    client.post(f'/api/users/{user["id"]}/follow', headers={
+        "Authorization": f"Bearer {token}"
+    })
+    response = client.get(f'/api/users/{user["id"]}', headers={
+        "If-None-Match": etag
+    })
+    assert response.status_code == 200
+    assert response.get_json()["followers_count"] == 1
+
+
+def test_get_user_lists_conditional(client, db):
+    """Test the user list and a user's timeline answer 304 when unchanged."""
+    user = create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post('/api/tweets', json={"content": "Hello"}, headers=headers)
+
+    etag = client.get('/api/users').headers["ETag"]
+    assert client.get('/api/users', headers={
+        "If-None-Match": etag
+    }).status_code == 304
+
+    url = f'/api/users/{user["id"]}/tweets'
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    # The timeline embeds the profile header, so an edit changes its tag
+    client.put(f'/api/users/{user["id"]}', json={
+        "display_name": "Renamed"
+    }, headers=headers)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["user"]["display_name"] == "Renamed"
+
+
+def test_user_tweets_show_authors_own_writes(client, db):
+    """Test the author's timeline reflects a write on the very next read."""
+    user = create_test_user(client)
+    token = login_user(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f'/api/users/{user["id"]}/tweets'
+
+    tweet_id = client.post('/api/tweets', json={
+        "content": "Hello"
+    }, headers=headers).get_json()["id"]
+    data = client.get(url, headers=headers).get_json()
+    assert [t["content"] for t in data["tweets"]] == ["Hello"]
+    assert data["pagination"]["total_items"] == 1
+
+    client.put(f'/api/tweets/{tweet_id}', json={
+        "content": "Hello, edited"
+    }, headers=headers)
+    data = client.get(url, headers=headers).get_json()
+    assert [t["content"] for t in data["tweets"]] == ["Hello, edited"]
+
+    client.delete(f'/api/tweets/{tweet_id}', headers=headers)
+    data = client.get(url, headers=headers).get_json()
+    assert data["tweets"] == []
+    assert data["pagination"]["total_items"] == 0
+
+    # Other readers get the same totals
+    assert client.get(url).get_json()["pagination"]["total_items"] == 0
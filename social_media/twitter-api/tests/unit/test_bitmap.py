@@ -0,0 +1,63 @@
+"""Unit tests for the compressed ID bitmap."""
+
+from itertools import islice
+from types import GeneratorType
+
+from twitter_api.utils.bitmap import ARRAY_MAX, IdBitmap, _from_bitset
+
+
+def test_bitmap_membership_and_order():
+    """Test IDs across chunks are stored once and iterated in order."""
+    ids = [70000, 5, 3, 5, 1 << 20, 65535]
+    bitmap = IdBitmap.from_ids(ids)
+
+    assert len(bitmap) == 5
+    assert list(bitmap) == sorted(set(ids))
+    assert 70000 in bitmap
+    assert 4 not in bitmap
+
+
+def test_bitmap_intersection_sparse_and_dense():
+    """Test intersections between array and bitset chunks."""
+    dense = IdBitmap.from_ids(range(0, 3 * ARRAY_MAX))
+    sparse = IdBitmap.from_ids([1, 2, 3 * ARRAY_MAX + 1, 70000])
+    evens = IdBitmap.from_ids(range(0, 3 * ARRAY_MAX, 2))
+
+    assert list(dense & sparse) == [1, 2]
+    assert list(sparse & dense) == [1, 2]
+    assert len(dense & evens) == len(evens)
+    assert len(IdBitmap() & dense) == 0
+
+
+def test_bitmap_add_and_discard():
+    """Test incremental updates, including promotion to a bitset chunk."""
+    bitmap = IdBitmap()
+    for value in range(ARRAY_MAX + 10):
+        bitmap.add(value)
+    bitmap.add(5)
+
+    assert len(bitmap) == ARRAY_MAX + 10
+    # Dense chunks use at most 8 KiB regardless of cardinality
+    assert bitmap.memory_bytes <= 8192
+
+    bitmap.discard(5)
+    bitmap.discard(123456)
+    assert 5 not in bitmap
+    assert len(bitmap) == ARRAY_MAX + 9
+
+    for value in range(ARRAY_MAX + 10):
+        bitmap.discard(value)
+    assert len(bitmap) == 0
+    assert list(bitmap) == []
+
+
+def test_bitmap_iterates_dense_chunks_lazily():
+    """Test dense chunks yield IDs lowest first without materialising them."""
+    ids = list(range(70000, 80000, 2)) + [65536 * 3 + 65535]
+    bitmap = IdBitmap.from_ids(reversed(ids))
+    assert len(ids) > ARRAY_MAX
+
+    assert list(bitmap) == ids
+    assert list(islice(bitmap, 3)) == [70000, 70002, 70004]
+    assert isinstance(_from_bitset(0b1010), GeneratorType)
+    assert list(_from_bitset(0b1010 | 1 << 700)) == [1, 3, 700]
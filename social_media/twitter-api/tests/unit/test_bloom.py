@@ -0,0 +1,122 @@
+"""Unit tests for the Bloom filter."""
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from twitter_api.utils.bloom import BloomFilter, RebuildingBloomFilter
+
+
+def test_bloom_has_no_false_negatives():
+    """Test every added key is reported as present."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    keys = [f"key-{i}".encode() for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_bloom_false_positive_rate():
+    """Test the false-positive rate stays near the configured target."""
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for i in range(2000):
+        bloom.add(f"member-{i}".encode())
+
+    false_positives = sum(
+        f"outsider-{i}".encode() in bloom for i in range(10000)
+    )
+    assert false_positives / 10000 < 0.03
+    assert bloom.estimated_error_rate() == pytest.approx(0.01, rel=0.5)
+
+
+def test_bloom_stats():
+    """Test the memory report reflects the sizing."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    stats = bloom.stats()
+
+    # ~9.6 bits per key at 1% error rate
+    assert stats["num_bits"] == 9586
+    assert stats["memory_bytes"] == 1199
+    assert stats["num_hashes"] == 7
+    assert stats["count"] == 0
+
+
+def test_bloom_rejects_invalid_sizing():
+    """Test invalid capacity and error rate values."""
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1.5)
+
+
+def test_rebuilding_filter_builds_in_background():
+    """Test lookups answer "maybe" until the background build swaps in."""
+    release = threading.Event()
+    loaded = []
+
+    def load():
+        release.wait(2)
+        loaded.append(True)
+        return 2, [b"a", b"b"]
+
+    bloom = RebuildingBloomFilter(
+        Flask(__name__), load, 0.01, 300, min_capacity=100, synced=True
+    )
+    assert bloom.might_contain(b"c") is True
+    # Added while the table is scanned: replayed into the new filter
+    bloom.add(b"d")
+    release.set()
+    deadline = time.monotonic() + 2
+    while bloom.rebuilds == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert loaded == [True]
+    assert bloom.might_contain(b"a") is True
+    assert bloom.might_contain(b"d") is True
+    assert bloom.might_contain(b"c") is False
+    assert bloom.stats()["definite_negatives"] == 1
+
+
+def test_rebuilding_filter_distrusts_negatives_unless_synced():
+    """Test negatives fall through when other workers may have written."""
+    bloom = RebuildingBloomFilter(
+        Flask(__name__),
+        lambda: (1, [b"a"]),
+        0.01,
+        300,
+        min_capacity=100,
+        background=False,
+    )
+
+    assert bloom.might_contain(b"c") is True
+    assert bloom.stats()["unverified_negatives"] == 1
+    assert bloom.stats()["definite_negatives"] == 0
+
+
+def test_resync_during_a_rebuild_scans_again():
+    """Test a resync while a scan runs distrusts negatives until a new scan."""
+    release = threading.Event()
+    scans = []
+
+    def load():
+        scans.append(True)
+        release.wait(2)
+        return 1, [b"a"]
+
+    bloom = RebuildingBloomFilter(
+        Flask(__name__), load, 0.01, 300, min_capacity=100, synced=True
+    )
+    bloom.rebuild()
+    bloom.resync()
+    assert bloom.stats()["synced"] is False
+    release.set()
+    deadline = time.monotonic() + 2
+    while bloom.rebuilds < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(scans) == 2
+    assert bloom.stats()["synced"] is True
+    assert bloom.might_contain(b"c") is False
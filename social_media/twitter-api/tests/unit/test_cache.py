@@ -0,0 +1,152 @@
+"""Unit tests for the in-process TTL and loading caches."""
+
+import threading
+import time
+
+import pytest
+
+from twitter_api.utils.cache import MISSING, LoadingCache, TTLCache
+
+
+def test_ttl_cache_get_and_set():
+    """Test values round-trip and hits/misses are counted."""
+    cache = TTLCache(max_entries=10, ttl=60)
+
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_ttl_cache_expires_entries():
+    """Test entries are dropped once their TTL passes."""
+    cache = TTLCache(max_entries=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test the cache stays within its bound."""
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_delete_and_disable():
+    """Test deletes and a zero-size cache that stores nothing."""
+    cache = TTLCache(max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.delete("a")
+    assert cache.get("a") is None
+
+    disabled = TTLCache(max_entries=0, ttl=60)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
+
+
+def test_loading_cache_coalesces_concurrent_misses():
+    """Test concurrent misses for one key run the loader once."""
+    cache = LoadingCache(max_entries=10, ttl=60)
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert cache.get_or_load("k", loader) == "value"
+    assert len(calls) == 1
+
+
+def test_loading_cache_shares_loader_errors_and_skips_none():
+    """Test errors reach the caller and None results are not cached."""
+    cache = LoadingCache(max_entries=10, ttl=60)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", fail)
+    assert cache.get_or_load("k", lambda: None) is None
+    assert cache.get_or_load("k", lambda: 1) == 1
+
+
+def test_loading_cache_refreshes_hot_entries_early():
+    """Test a hit near expiry recomputes the value before it expires."""
+    cache = LoadingCache(max_entries=10, ttl=60, beta=1e9)
+    cache.set("k", "old", cost=1.0)
+
+    assert cache.get_or_load("k", lambda: "new") == "new"
+    assert cache.get("k") == "new"
+    assert cache.stats()["early_refreshes"] == 1
+
+    # A failed early refresh keeps serving the unexpired value
+    cache.set("k", "old", cost=1.0)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    assert cache.get_or_load("k", fail) == "old"
+
+    # Without a recorded cost (or with beta 0) there is no early refresh
+    cache.set("k", "old")
+    assert cache.get_or_load("k", lambda: "new") == "old"
+
+
+def test_loading_cache_caches_missing_for_negative_ttl():
+    """Test a MISSING result is cached, but only for negative_ttl."""
+    cache = LoadingCache(max_entries=10, ttl=60, negative_ttl=0.01)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return MISSING
+
+    assert cache.get_or_load("k", load) is MISSING
+    assert cache.get_or_load("k", load) is MISSING
+    assert len(calls) == 1
+
+    time.sleep(0.02)
+    assert cache.get_or_load("k", load) is MISSING
+    assert len(calls) == 2
+
+
+def test_loading_cache_drops_loads_deleted_meanwhile():
+    """Test a value loaded across a delete() is returned but not cached."""
+    cache = LoadingCache(max_entries=10, ttl=60)
+
+    def load_then_delete():
+        cache.delete("k")
+        return "old"
+
+    assert cache.get_or_load("k", load_then_delete) == "old"
+    assert cache.get_or_load("k", lambda: "new") == "new"
@@ -0,0 +1,145 @@
+"""Unit tests for the two-tier entity cache."""
+
+from datetime import datetime
+
+from twitter_api.services.entity_cache import (
+    TWEET,
+    USER,
+    EntityCache,
+    MemoryEntityStore,
+)
+from twitter_api.utils.cache import LoadingCache
+
+
+def make_cache(store=None, negative_ttl=60):
+    """Build an entity cache with fresh per-worker layers."""
+    return EntityCache(
+        {
+            USER: LoadingCache(10, 60, negative_ttl=negative_ttl),
+            TWEET: LoadingCache(10, 60, negative_ttl=negative_ttl),
+        },
+        store,
+        shared_ttl=60,
+        negative_ttl=negative_ttl,
+    )
+
+
+class Loader:
+    """Loader that records the keys it was asked for."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def one(self, key):
+        return lambda: self.calls.append([key]) or self.rows.get(key)
+
+    def many(self, keys):
+        self.calls.append(list(keys))
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+
+def test_get_loads_once_and_caches_missing():
+    """Test hits and "not found" results skip the loader."""
+    loader = Loader({1: {"id": 1}})
+    cache = make_cache()
+
+    assert cache.get(USER, 1, loader.one(1)) == {"id": 1}
+    assert cache.get(USER, 1, loader.one(1)) == {"id": 1}
+    assert cache.get(USER, 2, loader.one(2)) is None
+    assert cache.get(USER, 2, loader.one(2)) is None
+    assert loader.calls == [[1], [2]]
+
+    stats = cache.stats()[USER]
+    assert stats["loads"] == 2
+    assert stats["not_found"] == 2
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_shared_store_serves_other_workers():
+    """Test a row loaded by one worker is a shared hit for another."""
+    store = MemoryEntityStore()
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678000)
+    row = {"id": 7, "user_id": 1, "content": "hi", "created_at": created_at}
+    loader = Loader({7: row})
+
+    assert make_cache(store).get(TWEET, 7, loader.one(7)) == row
+    other = make_cache(store)
+    # Datetime columns survive the shared store's JSON encoding
+    assert other.get(TWEET, 7, loader.one(7)) == row
+    assert other.get(TWEET, 8, loader.one(8)) is None
+    assert make_cache(store).get(TWEET, 8, loader.one(8)) is None
+
+    assert loader.calls == [[7], [8]]
+    assert other.stats()[TWEET]["shared_hits"] == 1
+
+
+def test_get_many_loads_only_uncached_keys():
+    """Test multi-get loads what neither tier has with one call."""
+    store = MemoryEntityStore()
+    loader = Loader({1: {"id": 1}, 2: {"id": 2}})
+    make_cache(store).get(USER, 1, loader.one(1))
+
+    cache = make_cache(store)
+    cache.get(USER, 2, loader.one(2))
+    assert cache.get_many(USER, [1, 2, 3], loader.many) == {
+        1: {"id": 1},
+        2: {"id": 2},
+        3: None,
+    }
+    assert cache.get_many(USER, [3], loader.many) == {3: None}
+    assert loader.calls == [[1], [2], [3]]
+
+
+def test_invalidate_clears_both_tiers():
+    """Test a write's invalidation reaches the shared store."""
+    store = MemoryEntityStore()
+    loader = Loader({1: {"id": 1, "bio": "old"}})
+    cache = make_cache(store)
+    cache.get(USER, 1, loader.one(1))
+
+    loader.rows[1] = {"id": 1, "bio": "new"}
+    cache.invalidate(USER, [1])
+
+    assert cache.get(USER, 1, loader.one(1)) == {"id": 1, "bio": "new"}
+    assert make_cache(store).get(USER, 1, loader.one(1)) == {"id": 1, "bio": "new"}
+    assert loader.calls == [[1], [1]]
+
+
+def test_load_racing_a_write_is_not_stored():
+    """Test a row read before a write commits is dropped by its invalidation."""
+    store = MemoryEntityStore()
+    rows = {1: {"id": 1, "bio": "old"}}
+    reader = make_cache(store)
+    writer = make_cache(store)
+
+    def load_then_write():
+        snapshot = dict(rows[1])
+        # Another request commits and invalidates while this load runs
+        rows[1] = {"id": 1, "bio": "new"}
+        writer.invalidate(USER, [1])
+        return snapshot
+
+    assert reader.get(USER, 1, load_then_write) == {"id": 1, "bio": "old"}
+
+    # The stale snapshot never reached the shared tier
+    assert make_cache(store).get(USER, 1, lambda: rows[1]) == {"id": 1, "bio": "new"}
+
+
+def test_get_many_racing_a_write_is_not_stored():
+    """Test multi-get loads are refused by a write landing meanwhile."""
+    store = MemoryEntityStore()
+    rows = {1: {"id": 1, "bio": "old"}, 2: {"id": 2, "bio": "old"}}
+    cache = make_cache(store)
+
+    def load_then_write(keys):
+        snapshot = {key: dict(rows[key]) for key in keys}
+        rows[1] = {"id": 1, "bio": "new"}
+        make_cache(store).invalidate(USER, [1])
+        return snapshot
+
+    cache.get_many(USER, [1, 2], load_then_write)
+
+    other = make_cache(store)
+    assert other.get(USER, 1, lambda: rows[1]) == {"id": 1, "bio": "new"}
+    assert other.get(USER, 2, lambda: None) == {"id": 2, "bio": "old"}
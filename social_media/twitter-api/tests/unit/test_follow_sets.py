@@ -0,0 +1,43 @@
+"""Unit tests for the follow set cache."""
+from twitter_api.models import Follow, User
+from twitter_api.services import follow_sets
+from twitter_api.services.follow_sets import FollowSetCache
+from twitter_api.utils.bitmap import IdBitmap
+
+
+def add_users(db, count):
+    """Insert ``count`` users and return their IDs."""
+    users = [
+        User(username=f"user{i}", email=f"user{i}@example.com", password_hash="x")
+        for i in range(count)
+    ]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.id for user in users]
+
+
+def test_follow_during_load_is_not_lost(db, monkeypatch):
+    """Test a set loaded while a follow committed is not cached without it."""
+    alice, bob, carol = add_users(db, 3)
+    db.session.add(Follow(follower_id=bob, followed_id=alice))
+    db.session.commit()
+    cache = FollowSetCache(max_entries=10, ttl=60)
+    from_ids = IdBitmap.from_ids
+
+    def load_then_follow(ids):
+        # The rows are read; carol's follow commits before the set is stored
+        bitmap = from_ids(ids)
+        db.session.add(Follow(follower_id=carol, followed_id=alice))
+        db.session.commit()
+        cache.record_follow(carol, alice)
+        return bitmap
+
+    monkeypatch.setattr(follow_sets.IdBitmap, "from_ids", load_then_follow)
+    assert list(cache.followers(alice)) == [bob]
+    monkeypatch.setattr(follow_sets.IdBitmap, "from_ids", from_ids)
+
+    assert sorted(cache.followers(alice)) == sorted([bob, carol])
+    assert sorted(cache.followers(alice)) == sorted([bob, carol])
+    stats = cache.stats()
+    assert stats["discarded_loads"] == 1
+    assert (stats["misses"], stats["hits"]) == (2, 1)
@@ -0,0 +1,64 @@
+"""Unit tests for follow-graph computations."""
+import numpy as np
+import pytest
+
+from twitter_api.utils.graph import FollowGraph, friends_of_friends, pagerank
+
+
+def build_graph(edges, user_ids=(1, 2, 3, 4, 5)):
+    """Build a FollowGraph from (follower, followed) pairs."""
+    followers = [follower for follower, _ in edges]
+    followed = [target for _, target in edges]
+    return FollowGraph.from_edges(np.array(user_ids), followers, followed)
+
+
+def test_from_edges_collapses_duplicates():
+    """Test duplicate edges are stored once."""
+    graph = build_graph([(1, 2), (1, 2), (2, 3)])
+    assert graph.num_edges == 2
+    assert graph.matrix[graph.index[1], graph.index[2]] == 1
+
+
+def test_friends_of_friends_ranking():
+    """Test candidates are ranked by mutual follows, excluding existing edges."""
+    # 1 follows 2 and 3; both follow 4, only 3 follows 5; 2 follows 1 back
+    graph = build_graph([(1, 2), (1, 3), (2, 4), (3, 4), (3, 5), (2, 1)])
+
+    suggestions = dict(friends_of_friends(graph, limit=10, block_size=2))
+
+    assert suggestions[1] == [(4, 2), (5, 1)]
+    # 2 reaches 3 through 1 but must not be suggested to itself
+    assert suggestions[2] == [(3, 1)]
+    assert 4 not in suggestions
+
+
+def test_friends_of_friends_limit():
+    """Test only the top candidates are kept per user."""
+    graph = build_graph([(1, 2), (1, 3), (2, 4), (3, 4), (3, 5)])
+
+    suggestions = dict(friends_of_friends(graph, limit=1))
+
+    assert suggestions[1] == [(4, 2)]
+
+
+def test_pagerank_ranks_followed_accounts_higher():
+    """Test scores sum to one and the most-followed user ranks first."""
+    graph = build_graph([(1, 3), (2, 3), (4, 3), (5, 3), (3, 1), (2, 1)])
+
+    scores, iterations = pagerank(graph)
+
+    assert scores.sum() == pytest.approx(1.0)
+    assert graph.user_ids[scores.argmax()] == 3
+    assert scores[graph.index[1]] > scores[graph.index[2]]
+    assert 1 < iterations < 100
+
+
+def test_pagerank_warm_start_converges_faster():
+    """Test a previous result warm-starts in fewer iterations."""
+    graph = build_graph([(1, 2), (2, 3), (3, 1), (4, 1), (5, 4)])
+
+    scores, cold_iterations = pagerank(graph, tol=1e-8)
+    warm_scores, warm_iterations = pagerank(graph, tol=1e-8, initial=scores)
+
+    assert warm_iterations < cold_iterations
+    assert warm_scores == pytest.approx(scores, abs=1e-6)
@@ -0,0 +1,163 @@
+"""Unit tests for the cross-worker invalidation bus."""
+
+import json
+import time
+
+from flask import Flask
+
+from twitter_api.services.invalidation_bus import (
+    PROTOCOL_VERSION,
+    InvalidationBus,
+    LocalTransport,
+    UnixSocketTransport,
+)
+from twitter_api.utils.bloom import RebuildingBloomFilter
+from twitter_api.utils.cache import TTLCache
+
+
+def worker(transport, namespace="ns"):
+    """A bus with one subscribed cache, flushed by hand."""
+    bus = InvalidationBus(transport, background=False)
+    cache = TTLCache(100, 60)
+    bus.subscribe(namespace, cache.delete, cache.clear)
+    return bus, cache
+
+
+def message(origin, seq, events, version=PROTOCOL_VERSION):
+    """Encoded bus message."""
+    return json.dumps(
+        {"v": version, "origin": origin, "seq": seq, "events": events}
+    ).encode()
+
+
+def test_published_keys_are_dropped_by_other_workers():
+    """Test a key published by one worker leaves the other's cache only."""
+    sender, sender_cache = worker(LocalTransport("drop"))
+    receiver, receiver_cache = worker(LocalTransport("drop"))
+    for cache in (sender_cache, receiver_cache):
+        cache.set(1, "a")
+        cache.set(2, "b")
+
+    sender.publish("ns", [1])
+    sender.flush()
+
+    assert receiver_cache.get(1) is None
+    assert receiver_cache.get(2) == "b"
+    assert sender_cache.get(1) == "a"
+    assert receiver.stats()["keys_applied"] == 1
+    sender.close()
+    receiver.close()
+
+
+def test_publishes_in_a_window_share_one_message():
+    """Test keys queued before a flush are sent together."""
+    sender, _ = worker(LocalTransport("batch"))
+    receiver, cache = worker(LocalTransport("batch"))
+    for key in range(5):
+        cache.set(key, key)
+        sender.publish("ns", [key])
+
+    sender.flush()
+
+    assert sender.stats()["messages_sent"] == 1
+    assert sender.stats()["published"] == 5
+    assert len(cache) == 0
+    sender.close()
+    receiver.close()
+
+
+def test_sequence_gap_flushes_the_namespace():
+    """Test a lost message makes the receiver drop the whole namespace."""
+    bus, cache = worker(None)
+    other = TTLCache(100, 60)
+    bus.subscribe("other", other.delete, other.clear)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    other.set(1, "c")
+
+    bus._receive(message("w1", {"ns": 1}, {"ns": [1]}))
+    assert cache.get(1) is None
+    assert cache.get(2) == "b"
+
+    # Message 2 never arrived
+    bus._receive(message("w1", {"ns": 3, "other": 1}, {"ns": [3], "other": [9]}))
+
+    assert len(cache) == 0
+    assert other.get(1) == "c"
+    assert bus.stats()["gap_flushes"] == 1
+
+
+def test_heartbeat_reveals_a_lost_last_message():
+    """Test a heartbeat with a higher sequence number triggers a flush."""
+    bus, cache = worker(None)
+    bus._receive(message("w1", {"ns": 1}, {"ns": [1]}))
+    cache.set(2, "b")
+
+    bus._receive(message("w1", {"ns": 2}, {}))
+
+    assert len(cache) == 0
+    assert bus.stats()["gap_flushes"] == 1
+
+
+def test_unknown_protocol_version_flushes_everything():
+    """Test a message this worker cannot read flushes all namespaces."""
+    bus, cache = worker(None)
+    cache.set(1, "a")
+
+    bus._receive(message("w1", {"ns": 1}, {"ns": [2]}, version=99))
+
+    assert len(cache) == 0
+    assert bus.stats()["version_flushes"] == 1
+
+
+def test_publish_without_transport_does_nothing():
+    """Test a bus without a transport queues nothing."""
+    bus = InvalidationBus()
+    bus.publish("ns", [1])
+    bus.flush()
+
+    assert bus.stats()["published"] == 0
+    assert bus.stats()["transport"] is None
+
+
+def test_unix_socket_transport_round_trip(tmp_path):
+    """Test workers on one host reach each other through the socket directory."""
+    sender = InvalidationBus(UnixSocketTransport(str(tmp_path)), window_ms=1)
+    receiver = InvalidationBus(UnixSocketTransport(str(tmp_path)), window_ms=1)
+    cache = TTLCache(100, 60)
+    receiver.subscribe("ns", cache.delete, cache.clear)
+    cache.set(7, "a")
+
+    sender.publish("ns", [7])
+    deadline = time.monotonic() + 2
+    while cache.get(7) is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert cache.get(7) is None
+    sender.close()
+    receiver.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bloom_filters_add_published_keys_and_resync_on_gaps():
+    """Test filters add other workers' keys and rescan after a lost message."""
+    scans = []
+
+    def load():
+        scans.append(True)
+        return 1, [b"a"]
+
+    bus = InvalidationBus(None, background=False)
+    bloom = RebuildingBloomFilter(
+        Flask(__name__), load, 0.01, 300, 100, synced=True, background=False
+    )
+    bloom.subscribe(bus, "filter")
+    assert bloom.might_contain(b"b") is False
+
+    bus._receive(message("w1", {"filter": 1}, {"filter": [b"b".hex()]}))
+    assert bloom.might_contain(b"b") is True
+    assert len(scans) == 1
+
+    bus._receive(message("w1", {"filter": 3}, {"filter": [b"c".hex()]}))
+    assert len(scans) == 2
+    assert bloom.stats()["synced"] is True
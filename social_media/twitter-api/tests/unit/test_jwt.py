@@ -0,0 +1,76 @@
+"""Unit tests for JWT utilities and the verified-token cache."""
+import time
+
+from twitter_api.utils.jwt import (
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token,
+    get_token_cache,
+    invalidate_cached_token,
+)
+
+
+def test_decode_caches_verified_claims(db):
+    """Test a token is verified once and then served from the cache."""
+    token = create_access_token(1, "alice")
+
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+
+    assert first == second
+    assert first["user_id"] == 1
+    assert len(first["jti"]) == 32
+    stats = get_token_cache().stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1
+
+
+def test_decode_does_not_cache_invalid_tokens(db):
+    """Test rejected tokens never enter the cache."""
+    assert decode_access_token("not-a-token") is None
+    assert decode_access_token("not-a-token") is None
+    assert get_token_cache().stats()["entries"] == 0
+
+
+def test_invalidate_cached_token(db):
+    """Test invalidation forces the next request to verify again."""
+    token = create_access_token(1, "alice")
+    decode_access_token(token)
+
+    invalidate_cached_token(token)
+
+    assert get_token_cache().stats()["entries"] == 0
+    assert decode_access_token(token)["username"] == "alice"
+
+
+def test_cache_drops_expired_entries():
+    """Test claims are not served past their exp."""
+    cache = VerifiedTokenCache(max_entries=10)
+    cache.put("token", {"user_id": 1, "exp": time.time() - 1})
+
+    assert cache.get("token") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache stays within its bound."""
+    cache = VerifiedTokenCache(max_entries=2)
+    exp = time.time() + 60
+    cache.put("a", {"user_id": 1, "exp": exp})
+    cache.put("b", {"user_id": 2, "exp": exp})
+    cache.get("a")
+    cache.put("c", {"user_id": 3, "exp": exp})
+
+    assert cache.get("b") is None
+    assert cache.get("a")["user_id"] == 1
+    assert cache.get("c")["user_id"] == 3
+
+
+def test_cached_claims_are_copies():
+    """Test callers cannot mutate the cached claims."""
+    cache = VerifiedTokenCache(max_entries=2)
+    cache.put("a", {"user_id": 1, "exp": time.time() + 60})
+
+    cache.get("a")["user_id"] = 99
+
+    assert cache.get("a")["user_id"] == 1
@@ -0,0 +1,40 @@
+"""Unit tests for MinHash signatures."""
+import pytest
+
+from twitter_api.utils import minhash
+
+
+def test_signature_of_identical_sets():
+    """Test identical sets get identical signatures and buckets."""
+    left = minhash.signature([1, 2, 3, 4])
+    right = minhash.signature([4, 3, 2, 1])
+
+    assert minhash.estimate_jaccard(left, right) == 1.0
+    assert minhash.band_buckets(left) == minhash.band_buckets(right)
+    assert len(minhash.band_buckets(left)) == minhash.BANDS
+
+
+def test_signature_estimates_jaccard():
+    """Test the estimate tracks the true Jaccard similarity."""
+    left = minhash.signature(range(0, 1000))
+    right = minhash.signature(range(500, 1500))
+
+    # True Jaccard: 500 / 1500
+    assert minhash.estimate_jaccard(left, right) == pytest.approx(1 / 3, abs=0.15)
+
+
+def test_incremental_add_matches_full_signature():
+    """Test folding in one member equals hashing the whole set."""
+    sig = minhash.signature([10, 20, 30])
+    updated = minhash.add_to_signature(sig, 40)
+
+    assert list(updated) == list(minhash.signature([10, 20, 30, 40]))
+
+
+def test_empty_signature():
+    """Test empty sets are never similar and round-trip through bytes."""
+    empty = minhash.signature([])
+
+    assert minhash.is_empty(empty)
+    assert minhash.estimate_jaccard(empty, empty) == 0.0
+    assert list(minhash.from_bytes(minhash.to_bytes(empty))) == list(empty)
@@ -0,0 +1,115 @@
+"""Unit tests for password hashing."""
+import threading
+
+import pytest
+from flask import Flask
+
+from twitter_api.utils.password import (
+    MIN_ROUNDS,
+    PasswordHasher,
+    PasswordHasherBusy,
+    calibrate_rounds,
+    configure_password_hashing,
+    hash_password,
+    hash_rounds,
+    verify_password,
+)
+
+
+def test_hash_and_verify_password():
+    """Test a hash verifies only against its own password."""
+    hashed = hash_password("password123")
+
+    assert hashed != "password123"
+    assert verify_password("password123", hashed)
+    assert not verify_password("wrongpassword", hashed)
+
+
+def test_hash_password_cost():
+    """Test the cost factor is recorded in the hash."""
+    assert hash_rounds(hash_password("password123", rounds=5)) == 5
+
+
+def test_calibrate_rounds():
+    """Test calibration respects the target and the minimum cost."""
+    # Nothing hashes in 0ms, so the floor is used
+    assert calibrate_rounds(0) == MIN_ROUNDS
+    # A generous target on a capped search picks the cap
+    assert calibrate_rounds(10000, max_rounds=6) == 6
+
+
+def test_configure_password_hashing():
+    """Test BCRYPT_ROUNDS is resolved to an integer cost."""
+    app = Flask(__name__)
+    app.config.update(BCRYPT_ROUNDS="auto", BCRYPT_TARGET_MS=0)
+    configure_password_hashing(app)
+    assert app.config["BCRYPT_ROUNDS"] == MIN_ROUNDS
+
+    app.config["BCRYPT_ROUNDS"] = "10"
+    configure_password_hashing(app)
+    assert app.config["BCRYPT_ROUNDS"] == 10
+
+
+def test_hasher_runs_on_pool():
+    """Test work runs on the pool and is timed."""
+    hasher = PasswordHasher(max_workers=2, max_queue=2, timeout=5)
+    try:
+        hashed = hasher.run(hash_password, "password123")
+        assert hasher.run(verify_password, "password123", hashed)
+
+        stats = hasher.stats()
+        assert stats["completed"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["hash_time_max_ms"] > 0
+    finally:
+        hasher.close()
+
+
+def test_hasher_rejects_when_saturated():
+    """Test callers beyond workers + queue are rejected immediately."""
+    hasher = PasswordHasher(max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait()
+        return "done"
+
+    results = []
+    callers = [
+        threading.Thread(target=lambda: results.append(hasher.run(blocking)))
+        for _ in range(2)
+    ]
+    try:
+        for caller in callers:
+            caller.start()
+        started.wait()
+        # One task running, one queued: the pool is full
+        while hasher.stats()["in_flight"] < 2:
+            pass
+
+        with pytest.raises(PasswordHasherBusy):
+            hasher.run(blocking)
+        assert hasher.stats()["rejected"] == 1
+    finally:
+        release.set()
+        for caller in callers:
+            caller.join()
+        hasher.close()
+
+    assert results == ["done", "done"]
+    # Slots are released once work finishes
+    assert hasher.stats()["completed"] == 2
+
+
+def test_hasher_timeout_reports_busy():
+    """Test a result that does not arrive in time is reported as busy."""
+    hasher = PasswordHasher(max_workers=1, max_queue=0, timeout=0.05)
+    release = threading.Event()
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.run(release.wait)
+    finally:
+        release.set()
+        hasher.close()
@@ -0,0 +1,54 @@
+"""Unit tests for the sliding-window rate limiter."""
+import pytest
+
+from twitter_api.utils.rate_limit import MemoryRateLimitStore, _decide, parse_rate
+
+
+def test_parse_rate():
+    """Test rate strings are parsed into a limit and window."""
+    assert parse_rate("10/minute") == (10, 60.0)
+    assert parse_rate("5/seconds") == (5, 1.0)
+    assert parse_rate("100/hour") == (100, 3600.0)
+    with pytest.raises(ValueError):
+        parse_rate("10/fortnight")
+
+
+def test_decide_weights_previous_window():
+    """Test the previous window counts less as it slides out."""
+    # Half way through: 10 * 0.5 + 4 = 9 so one more fits under 10
+    assert _decide(10, 4, 30, limit=10, window=60) == (True, 0, 0)
+    # Just after the window started the previous count still dominates
+    allowed, remaining, retry_after = _decide(10, 0, 1, limit=10, window=60)
+    assert not allowed
+    assert 1 <= retry_after <= 59
+
+
+def test_decide_full_current_window_waits_for_next():
+    """Test a full current window blocks until the next one starts."""
+    assert _decide(0, 10, 45, limit=10, window=60) == (False, 0, 15)
+
+
+def test_memory_store_limits_per_key():
+    """Test each key gets its own budget and decisions are counted."""
+    store = MemoryRateLimitStore()
+    results = [store.hit("a", limit=3, window=60)[0] for _ in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert store.hit("b", limit=3, window=60)[0]
+    assert store.stats() == {
+        "backend": "memory",
+        "keys": 2,
+        "allowed": 4,
+        "limited": 2,
+    }
+
+
+def test_memory_store_prunes_idle_keys():
+    """Test keys idle for two windows are dropped."""
+    store = MemoryRateLimitStore(prune_every=1)
+    store.hit("idle", limit=3, window=1)
+    store._counters["idle"][0] -= 5
+
+    store.hit("active", limit=3, window=1)
+
+    assert list(store._counters) == ["active"]
@@ -0,0 +1,114 @@
+"""Unit tests for Snowflake tweet IDs."""
+from datetime import datetime
+
+import pytest
+
+from twitter_api.utils.snowflake import (
+    MAX_SEQUENCE,
+    MAX_WORKER_ID,
+    SnowflakeGenerator,
+    default_worker_id,
+    id_timestamp,
+    min_id_at,
+)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_ids_increase_and_embed_time():
+    """Test IDs are increasing and decode to the clock time."""
+    clock = FakeClock(1700000000.5)
+    generator = SnowflakeGenerator(5, clock)
+
+    first, second = generator.next_id(), generator.next_id()
+    clock.now += 0.25
+    third = generator.next_id()
+
+    assert first < second < third
+    assert id_timestamp(first) == datetime(2023, 11, 14, 22, 13, 20, 500000)
+    assert (first >> 12) & 0x3FF == 5
+    assert min_id_at(id_timestamp(first)) <= first < min_id_at(id_timestamp(third))
+
+
+def test_ids_keep_increasing_when_clock_steps_back_or_sequence_runs_out():
+    """Test the generator borrows from the last millisecond instead of repeating."""
+    clock = FakeClock(1700000000.0)
+    generator = SnowflakeGenerator(1, clock)
+
+    ids = [generator.next_id() for _ in range(MAX_SEQUENCE + 2)]
+    clock.now -= 5
+    ids.append(generator.next_id())
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_id_at_backfills_past_timestamps():
+    """Test historical timestamps get unique IDs that sort by that time."""
+    generator = SnowflakeGenerator(2, FakeClock(1700000000.0))
+    live = generator.next_id()
+    when = datetime(2015, 6, 1, 12, 0, 0)
+
+    sequences = generator.backfill_sequences([when], lambda ranges: [])
+    backfilled = [generator.id_at(when, sequences) for _ in range(3)]
+
+    assert len(set(backfilled)) == 3
+    assert all(id_timestamp(value) == when for value in backfilled)
+    assert all((value >> 12) & 0x3FF == MAX_WORKER_ID for value in backfilled)
+    assert max(backfilled) < live
+    with pytest.raises(ValueError):
+        generator.id_at(datetime(2000, 1, 1), sequences)
+
+
+def test_backfill_never_repeats_ids_within_a_millisecond():
+    """Test a full millisecond raises instead of wrapping its sequence."""
+    generator = SnowflakeGenerator(2, FakeClock(1700000000.0))
+    when = datetime(2015, 6, 1, 12, 0, 0)
+    sequences = generator.backfill_sequences([when], lambda ranges: [])
+
+    ids = {generator.id_at(when, sequences) for _ in range(MAX_SEQUENCE + 1)}
+
+    assert len(ids) == MAX_SEQUENCE + 1
+    with pytest.raises(ValueError):
+        generator.id_at(when, sequences)
+
+
+def test_backfill_continues_after_stored_ids():
+    """Test a later run (fresh generator) skips IDs an earlier run stored."""
+    when = datetime(2015, 6, 1, 12, 0, 0)
+    first_run = SnowflakeGenerator(2, FakeClock(1700000000.0))
+    sequences = first_run.backfill_sequences([when], lambda ranges: [])
+    stored = [first_run.id_at(when, sequences) for _ in range(3)]
+
+    second_run = SnowflakeGenerator(2, FakeClock(1700000000.0))
+    requested = []
+
+    def lookup(ranges):
+        requested.extend(ranges)
+        return [i for i in stored if any(lo <= i <= hi for lo, hi in ranges)]
+
+    sequences = second_run.backfill_sequences([when, when], lookup)
+    new_id = second_run.id_at(when, sequences)
+
+    assert len(requested) == 1
+    assert new_id == max(stored) + 1
+
+
+def test_rejects_out_of_range_worker_id():
+    """Test worker IDs must fit in 10 bits."""
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(1024)
+
+
+def test_live_worker_ids_skip_the_backfill_worker_id():
+    """Test the reserved backfill worker ID is never used for live IDs."""
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(MAX_WORKER_ID)
+    assert default_worker_id(MAX_WORKER_ID) != MAX_WORKER_ID
+    assert default_worker_id(0) != 0
@@ -0,0 +1,60 @@
+"""Unit tests for the in-memory revocation list."""
+
+import time
+
+from twitter_api.models import RevokedToken
+from twitter_api.services.token_revocation import (
+    MIN_CAPACITY,
+    DatabaseRevocationBackend,
+    MemoryRevocationBackend,
+    RevocationList,
+)
+
+
+def test_revocation_list_lookup():
+    """Test revoked IDs are found and others miss the Bloom filter."""
+    revocations = RevocationList(MemoryRevocationBackend(), sync_seconds=60)
+    revocations.revoke("revoked", time.time() + 60)
+
+    assert revocations.is_revoked("revoked")
+    assert not revocations.is_revoked("active")
+    stats = revocations.stats()
+    assert stats["revoked"] == 1
+    assert stats["checks"] == 2
+    assert stats["bloom_negatives"] >= 1
+
+
+def test_revocation_list_drops_expired_tokens():
+    """Test entries disappear once their token would have expired."""
+    revocations = RevocationList(MemoryRevocationBackend(), sync_seconds=0)
+    revocations.revoke("short", time.time() + 0.01)
+    revocations.revoke("long", time.time() + 60)
+    time.sleep(0.02)
+
+    assert not revocations.is_revoked("short")
+    assert revocations.is_revoked("long")
+    assert revocations.stats()["revoked"] == 1
+
+
+def test_revocation_list_grows_bloom_filter():
+    """Test the filter is resized instead of overfilling."""
+    revocations = RevocationList(MemoryRevocationBackend(), sync_seconds=60)
+    expires_at = time.time() + 60
+    for i in range(MIN_CAPACITY + 1):
+        revocations.revoke(f"jti-{i}", expires_at)
+
+    assert all(revocations.is_revoked(f"jti-{i}") for i in range(MIN_CAPACITY + 1))
+    assert revocations._bloom.capacity == MIN_CAPACITY * 2
+
+
+def test_revocation_list_survives_missing_table(db):
+    """Test a failed sync is counted and retried instead of failing requests."""
+    RevokedToken.__table__.drop(db.engine)
+    revocations = RevocationList(DatabaseRevocationBackend(), sync_seconds=0)
+
+    assert not revocations.is_revoked("anything")
+    assert revocations.stats()["sync_errors"] == 1
+
+    RevokedToken.__table__.create(db.engine)
+    assert not revocations.is_revoked("anything")
+    assert revocations.stats()["syncs"] == 1
@@ -0,0 +1,87 @@
+"""Unit tests for the tweet group-commit batcher."""
+from twitter_api.models.tweet import Tweet
+from twitter_api.models.user import User
+from twitter_api.services import tweet_batcher
+from twitter_api.services.tweet_batcher import TweetBatcher
+
+
+def test_batcher_groups_concurrent_tweets(app, db):
+    """Test tweets submitted together share one INSERT and commit."""
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+
+    batcher = TweetBatcher(app, window_ms=200, max_batch=100, max_queue=100)
+    try:
+        pending = [
+            batcher.submit(user_id, "author", f"tweet {i}") for i in range(5)
+        ]
+        results = [p.committed.result(timeout=5) for p in pending]
+    finally:
+        batcher.close()
+
+    assert [error for _, error in results] == [None] * 5
+    assert len({tweet["id"] for tweet, _ in results}) == 5
+    assert batcher.stats()["batches"] == 1
+    assert batcher.stats()["avg_batch_size"] == 5
+    db.session.expire_all()
+    assert Tweet.query.count() == 5
+
+
+def test_batcher_isolates_failing_rows(app, db):
+    """Test an unknown user only fails its own tweet, not the batch."""
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    user_id = user.id
+
+    batcher = TweetBatcher(app, window_ms=200, max_batch=100, max_queue=100)
+    try:
+        good = batcher.submit(user_id, "author", "kept")
+        bad = batcher.submit(999, "ghost", "dropped")
+        good_result = good.committed.result(timeout=5)
+        bad_result = bad.committed.result(timeout=5)
+    finally:
+        batcher.close()
+
+    assert good_result[1] is None
+    assert bad_result == (None, "User not found")
+    db.session.expire_all()
+    assert [tweet.content for tweet in Tweet.query.all()] == ["kept"]
+
+
+def test_batcher_close_writes_queued_tweets(app, db):
+    """Test tweets accepted before close() are still written."""
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    batcher = TweetBatcher(app, window_ms=1000, max_batch=100, max_queue=100)
+    pending = batcher.submit(user.id, "author", "last")
+    batcher.close()
+
+    assert pending.committed.result(timeout=5)[1] is None
+
+
+def test_batcher_reports_committed_tweets_when_invalidation_fails(app, db, monkeypatch):
+    """Test a cache failure after the commit does not fail stored tweets."""
+    user = User(username="author", email="author@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+
+    def broken(user_ids):
+        raise RuntimeError("cache down")
+
+    monkeypatch.setattr(tweet_batcher, "invalidate_profile_counts", broken)
+    batcher = TweetBatcher(app, window_ms=50, max_batch=100, max_queue=100)
+    try:
+        tweet, error = batcher.submit(user.id, "author", "stored").committed.result(
+            timeout=5
+        )
+    finally:
+        batcher.close()
+
+    assert error is None
+    db.session.expire_all()
+    assert db.session.get(Tweet, tweet["id"]).content == "stored"
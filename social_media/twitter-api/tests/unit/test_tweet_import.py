@@ -0,0 +1,133 @@
+"""Unit tests for bulk NDJSON tweet import."""
+
+import json
+
+from twitter_api.models.tweet import Tweet
+from twitter_api.models.user import User
+from twitter_api.services.tweet_import import TweetImportService, validate_batch
+from twitter_api.utils.snowflake import id_timestamp
+
+
+def make_user(db, username="author"):
+    user = User(username=username, email=f"{username}@example.com", password_hash="x")
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def test_validate_batch_matches_single_tweet_rules(db):
+    """Test batch validation flags empty, too long and unknown-author rows."""
+    user_id = make_user(db)
+    records = [
+        {"user_id": user_id, "content": "fine"},
+        {"user_id": user_id, "content": "   "},
+        {"user_id": user_id, "content": "x" * 281},
+        {"user_id": user_id, "content": " " * 300 + "text"},
+        {"user_id": 9999, "content": "orphan"},
+        {"user_id": user_id, "content": "y" * 280},
+    ]
+
+    valid, errors = validate_batch(records)
+
+    assert valid.tolist() == [True, False, False, False, False, True]
+    assert errors == [
+        None,
+        "Tweet content cannot be empty",
+        "Tweet content must be at most 280 characters",
+        "Tweet content must be at most 280 characters",
+        "User not found",
+        None,
+    ]
+
+
+def test_import_ndjson_reports_bad_rows_and_imports_the_rest(db):
+    """Test invalid lines are reported by line number and skipped."""
+    user_id = make_user(db)
+    lines = [
+        json.dumps(
+            {
+                "user_id": user_id,
+                "content": " first ",
+                "created_at": "2020-01-02T03:04:05Z",
+            }
+        ),
+        "not json",
+        "",
+        json.dumps({"user_id": "1", "content": "bad id"}),
+        json.dumps({"user_id": user_id, "content": ""}),
+        json.dumps({"user_id": user_id, "content": "second"}),
+        json.dumps({"user_id": user_id, "content": "late", "created_at": "yesterday"}),
+    ]
+    batches = []
+
+    report = TweetImportService.import_ndjson(
+        lines, batch_size=2, on_batch=lambda r: batches.append(r["processed"])
+    )
+
+    assert report["processed"] == 6
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert [error["line"] for error in report["errors"]] == [2, 4, 5, 7]
+    assert report["errors"][0]["error"] == "Invalid JSON"
+    assert batches == [2, 4, 6]
+
+    tweets = Tweet.query.order_by(Tweet.id).all()
+    assert [tweet.content for tweet in tweets] == ["first", "second"]
+    assert tweets[0].created_at.isoformat() == "2020-01-02T03:04:05"
+    # The historical tweet's ID carries its timestamp, so it sorts first
+    assert id_timestamp(tweets[0].id) == tweets[0].created_at
+
+
+def test_import_ndjson_reports_out_of_range_user_ids(db):
+    """Test user IDs that cannot be a BIGINT are a line error, not a crash."""
+    user_id = make_user(db)
+    lines = [
+        json.dumps({"user_id": 2**70, "content": "huge"}),
+        json.dumps({"user_id": -(2**70), "content": "tiny"}),
+        json.dumps({"user_id": user_id, "content": "fine"}),
+    ]
+
+    report = TweetImportService.import_ndjson(lines)
+
+    assert report["imported"] == 1
+    assert report["errors"] == [
+        {"line": 1, "error": "User not found"},
+        {"line": 2, "error": "User not found"},
+    ]
+
+
+def test_import_ndjson_caps_listed_errors(db):
+    """Test only max_errors row errors are listed; the rest are counted."""
+    lines = ["{}"] * 5
+
+    report = TweetImportService.import_ndjson(lines, max_errors=2)
+
+    assert report["failed"] == 5
+    assert len(report["errors"]) == 2
+    assert report["errors_truncated"] is True
+
+
+def test_reimporting_shared_timestamps_gets_new_ids(app, db):
+    """Test a second run over the same timestamps does not repeat IDs."""
+    from twitter_api.utils.local_state import reset_local
+
+    user_id = make_user(db)
+    lines = [
+        json.dumps(
+            {
+                "user_id": user_id,
+                "content": f"tweet {i}",
+                "created_at": "2019-05-01T10:00:00Z",
+            }
+        )
+        for i in range(5)
+    ]
+
+    first = TweetImportService.import_ndjson(lines, batch_size=3)
+    # A fresh process, e.g. the next import script run
+    reset_local(app)
+    second = TweetImportService.import_ndjson(lines, batch_size=3)
+
+    assert first["imported"] == second["imported"] == 5
+    ids = [row[0] for row in db.session.query(Tweet.id)]
+    assert len(set(ids)) == 10
@@ -28,3 +28,11 @@ def test_validate_content():
     # Exactly 280 characters (should be valid)
     valid, error = TweetService.validate_content("x" * 280)
     assert valid is True
+
+
+def test_create_tweet_unknown_user(db):
+    """Test the foreign key turns an unknown author into "User not found"."""
+    tweet, error = TweetService.create_tweet(999, "Hello")
+
+    assert tweet is None
+    assert error == "User not found"
@@ -0,0 +1,95 @@
+"""Unit tests for the read-your-writes overlay."""
+
+import time
+
+from twitter_api.services.entity_cache import MemoryEntityStore
+from twitter_api.services.write_overlay import (
+    CREATED,
+    DELETED,
+    UPDATED,
+    WriteOverlay,
+)
+
+
+def tweet(tweet_id, content="hello"):
+    """Minimal tweet dict."""
+    return {"id": tweet_id, "content": content}
+
+
+def test_merge_applies_only_the_authors_writes():
+    """Test creates, edits and deletes patch the author's page only."""
+    overlay = WriteOverlay(max_users=10, ttl=60)
+    cached = [tweet(5), tweet(4), tweet(3)]
+    overlay.record(1, CREATED, tweet(6, "new"))
+    overlay.record(1, UPDATED, tweet(4, "edited"))
+    overlay.record(1, DELETED, tweet(3))
+
+    merged = overlay.merge(1, cached, page=1, per_page=3)
+
+    assert [t["id"] for t in merged] == [6, 5, 4]
+    assert merged[2]["content"] == "edited"
+    assert overlay.merge(2, cached, page=1, per_page=3) is cached
+    assert overlay.merge(None, cached, page=1, per_page=3) is cached
+    # The shared page is untouched
+    assert [t["content"] for t in cached] == ["hello"] * 3
+
+
+def test_merge_adds_new_tweets_to_the_first_page_only():
+    """Test later pages get edits and deletes but not new tweets."""
+    overlay = WriteOverlay(max_users=10, ttl=60)
+    overlay.record(1, CREATED, tweet(9))
+    overlay.record(1, DELETED, tweet(2))
+
+    assert overlay.merge(1, [tweet(2), tweet(1)], page=2, per_page=2) == [tweet(1)]
+    # Already in the page (the cache caught up): not duplicated
+    assert overlay.merge(1, [tweet(9), tweet(8)], page=1, per_page=2) == [
+        tweet(9),
+        tweet(8),
+    ]
+
+
+def test_writes_expire():
+    """Test writes older than the TTL are no longer merged."""
+    overlay = WriteOverlay(max_users=10, ttl=0.01)
+    overlay.record(1, CREATED, tweet(9))
+    time.sleep(0.02)
+
+    assert overlay.merge(1, [tweet(1)], page=1, per_page=2) == [tweet(1)]
+    assert overlay.stats()["recorded"] == 1
+
+
+def test_shared_store_reaches_other_workers():
+    """Test a write recorded by one worker is merged by another."""
+    store = MemoryEntityStore()
+    writer = WriteOverlay(max_users=10, ttl=60, store=store)
+    reader = WriteOverlay(max_users=10, ttl=60, store=store)
+    writer.record(1, CREATED, tweet(9, "new"))
+    writer.record(1, UPDATED, tweet(4, "edited"))
+
+    merged = reader.merge(1, [tweet(4)], page=1, per_page=2)
+
+    assert [(t["id"], t["content"]) for t in merged] == [(9, "new"), (4, "edited")]
+    assert reader.stats()["shared_store"] == "MemoryEntityStore"
+
+
+def test_merge_page_corrects_totals():
+    """Test totals count creates and deletes the page was loaded without."""
+    overlay = WriteOverlay(max_users=10, ttl=60)
+    overlay.record(1, DELETED, dict(tweet(3), created_at="2020-01-01T00:00:00"))
+    loaded_at = time.time()
+    page = {
+        "tweets": [tweet(3)],
+        "pagination": {"page": 1, "per_page": 2, "total": 3, "pages": 2},
+    }
+    overlay.record(1, CREATED, tweet(9))
+    overlay.record(1, UPDATED, tweet(9, "edited"))
+    overlay.record(1, DELETED, dict(tweet(2), created_at="2020-01-01T00:00:00"))
+
+    merged = overlay.merge_page(1, page, loaded_at, page=1, per_page=2)
+
+    assert [(t["id"], t["content"]) for t in merged["tweets"]] == [(9, "edited")]
+    # +1 for tweet 9; -1 for tweet 2; tweet 3's delete predates the load
+    assert merged["pagination"] == {"page": 1, "per_page": 2, "total": 3, "pages": 2}
+    assert page["tweets"] == [tweet(3)]
+    assert overlay.merge_page(2, page, loaded_at, page=1, per_page=2) is page
+    assert overlay.count_change(1, time.time()) == 0